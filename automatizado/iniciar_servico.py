@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# Permite executar o script direto da pasta, sem instalar o pacote
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from planilhas.servico import iniciar_servico
+
+if __name__ == "__main__":
+    try:
+        iniciar_servico()
+    except Exception as e:
+        print(f"\n❌ Erro durante a execução: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,87 @@
+"""
+Deduplicação paralela × `drop_duplicates` do pandas.
+
+Gera uma tabela consolidada com linhas repetidas (como a junção de várias
+exportações que se sobrepõem) e compara o `duplicated` do pandas, num único
+núcleo, com `analisar_duplicatas_particionado` (linhas particionadas pela
+impressão digital) em 1, 2, 4... processos até o número de núcleos, e com
+um orçamento de memória que força blocos e partições pequenos. A escala é o
+tempo com 1 processo dividido pelo tempo com N. As linhas marcadas precisam
+ser idênticas.
+
+Uso:
+    python benchmarks/bench_deduplicacao.py [--linhas N] [--processos N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from planilhas.deduplicacao import analisar_duplicatas_particionado, herda_memoria
+
+
+def gerar(linhas):
+    rng = np.random.default_rng(0)
+    numeros = rng.integers(0, linhas // 2, linhas)
+    df = pd.DataFrame({
+        "numero_processo": pd.Series([f"{n:07d}-14.2016.8.09.0051" for n in numeros], dtype=object),
+        "cpf": pd.Series([f"{n:011d}" for n in numeros % 50_000], dtype=object),
+        "nome": pd.Series([f"Parte {n}" for n in numeros % 30_000], dtype=object),
+        "valor": (numeros % 700).astype("float64"),
+        "data": pd.Timestamp("2020-01-01") + pd.to_timedelta(numeros % 365, unit="D"),
+    })
+    df.loc[rng.random(linhas) < 0.05, "nome"] = np.nan
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    df = gerar(args.linhas)
+
+    print("=" * 70)
+    print(f"⚡ DEDUPLICAÇÃO PARALELA ({args.linhas:,} linhas, {os.cpu_count()} núcleo(s), "
+          f"{'fork' if herda_memoria() else 'spawn'})")
+    print("=" * 70)
+
+    inicio = time.perf_counter()
+    esperado = df.duplicated().to_numpy()
+    t_pandas = time.perf_counter() - inicio
+    print(f"\n   duplicated (pandas):         {t_pandas:7.3f} s   {int(esperado.sum()):,} duplicada(s)")
+
+    processos = 1
+    t_um = None
+    while processos <= args.processos:
+        inicio = time.perf_counter()
+        duplicada, _ = analisar_duplicatas_particionado(df, processos)
+        tempo = time.perf_counter() - inicio
+        t_um = t_um or tempo
+        iguais = np.array_equal(esperado, duplicada)
+        print(f"   particionado, {processos:>2} proc.: {tempo:7.3f} s   ({t_pandas / tempo:4.1f}x pandas, "
+              f"escala {t_um / tempo:4.1f}x)   {'✅' if iguais else '❌'} mesmas linhas")
+        processos *= 2
+
+    limite = 64 * 1024 ** 2
+    inicio = time.perf_counter()
+    duplicada, _ = analisar_duplicatas_particionado(df, 1, limite)
+    tempo = time.perf_counter() - inicio
+    iguais = np.array_equal(esperado, duplicada)
+    print(f"   orçamento de 64 MB, 1 proc.: {tempo:7.3f} s   ({t_pandas / tempo:4.1f}x pandas)   "
+          f"{'✅' if iguais else '❌'} mesmas linhas")
+    if (os.cpu_count() or 1) == 1:
+        print("\n   ℹ️  Máquina com 1 núcleo: rode com --processos N numa máquina com mais núcleos para ver a escala")
+    print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Normalização vetorizada de CPF × operações de texto do pandas.
+
+Gera uma coluna de CPFs como chegam das exportações (com máscara, só dígitos
+e números que perderam os zeros à esquerda) e compara
+`str.replace(r"\\D", "").str.zfill(11)` (que só limpa, sem validar) com
+`normalizar_documento`, que além de limpar confere os dois dígitos
+verificadores, com e sem máscara.
+
+Uso:
+    python benchmarks/bench_documentos.py [--linhas N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from planilhas.esquema import PAPEL_CPF
+from planilhas.normalizacao import normalizar_documento
+
+
+def gerar(linhas):
+    rng = np.random.default_rng(0)
+    numeros = rng.integers(0, 10 ** 11, linhas)
+    formato = rng.integers(0, 3, linhas)
+    valores = []
+    for n, f in zip(numeros.tolist(), formato.tolist()):
+        texto = f"{n:011d}"
+        if f == 0:
+            valores.append(f"{texto[:3]}.{texto[3:6]}.{texto[6:9]}-{texto[9:]}")
+        elif f == 1:
+            valores.append(texto)
+        else:
+            valores.append(str(n))
+    return pd.Series(valores, dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    serie = gerar(args.linhas)
+
+    print("=" * 70)
+    print(f"🪪 NORMALIZAÇÃO DE CPF ({args.linhas:,} linhas)")
+    print("=" * 70)
+
+    inicio = time.perf_counter()
+    esperado = serie.str.replace(r"\D", "", regex=True).str.zfill(11)
+    t_pandas = time.perf_counter() - inicio
+    print(f"\n   str.replace + zfill (pandas):     {t_pandas:7.3f} s")
+
+    for mascarar in (False, True):
+        inicio = time.perf_counter()
+        resultado, normalizados, invalidos = normalizar_documento(serie, PAPEL_CPF, mascarar)
+        tempo = time.perf_counter() - inicio
+        nome = "normalizar_documento" + (" (máscara)" if mascarar else "")
+        print(f"   {nome + ':':<33} {tempo:7.3f} s   ({t_pandas / tempo:4.1f}x)   "
+              f"{invalidos:,} inválido(s)")
+        if not mascarar:
+            iguais = resultado.equals(esperado)
+            print(f"   {'':<33} {'✅' if iguais else '❌'} mesmos dígitos")
+    print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
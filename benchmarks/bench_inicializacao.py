@@ -0,0 +1,86 @@
+"""
+Mede o tempo de inicialização do comando `planilhas`.
+
+Executa `planilhas --help` e uma execução sem arquivos de entrada várias vezes
+em subprocessos novos e compara a mediana com o orçamento definido abaixo.
+Também confere que o pandas não foi importado nesses caminhos.
+
+Uso:
+    python benchmarks/bench_inicializacao.py [--repeticoes N] [--orcamento-ms MS]
+
+Sai com código 1 se algum cenário estourar o orçamento.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Orçamento de inicialização (mediana), em milissegundos
+ORCAMENTO_MS = 150
+
+VERIFICA_PANDAS = (
+    "import sys\n"
+    "from planilhas.cli import main\n"
+    "main({argv!r})\n"
+    "sys.exit(3 if 'pandas' in sys.modules else 0)\n"
+)
+
+
+def medir(comando, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=15)
+    parser.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_MS)
+    args = parser.parse_args()
+
+    pasta_vazia = tempfile.mkdtemp()
+    cenarios = {
+        "python (referência)": [sys.executable, "-c", "pass"],
+        "planilhas --help": [sys.executable, "-m", "planilhas", "--help"],
+        "planilhas juntar (sem arquivos)": [sys.executable, "-m", "planilhas", "juntar",
+                                            "--entrada", pasta_vazia, "--saida", pasta_vazia],
+    }
+
+    estourou = False
+    print("=" * 70)
+    print(f"⏱️  INICIALIZAÇÃO (mediana de {args.repeticoes} execuções, orçamento {args.orcamento_ms:.0f} ms)")
+    print("=" * 70)
+    for nome, comando in cenarios.items():
+        mediana = medir(comando, args.repeticoes)
+        if nome.startswith("python"):
+            print(f"   {nome:<35} {mediana:8.1f} ms")
+            continue
+        ok = mediana <= args.orcamento_ms
+        estourou |= not ok
+        print(f"   {nome:<35} {mediana:8.1f} ms  {'✅' if ok else '❌'}")
+
+    # Confere que o caminho sem dados não importou o pandas
+    argv = ["juntar", "--entrada", pasta_vazia, "--saida", pasta_vazia]
+    resultado = subprocess.run([sys.executable, "-c", VERIFICA_PANDAS.format(argv=argv)],
+                               cwd=RAIZ, stdout=subprocess.DEVNULL)
+    if resultado.returncode == 3:
+        print("   ❌ pandas foi importado em uma execução sem arquivos")
+        estourou = True
+    else:
+        print("   ✅ pandas não foi importado em uma execução sem arquivos")
+
+    print("=" * 70)
+    return 1 if estourou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Tempo de leitura da mesma planilha em Excel e em CSV.
+
+Gera uma tabela com processo, CPF, nome, valor e data, grava em .xlsx, em
+.csv (UTF-8, vírgula) e em .csv.gz (Windows-1252, ponto e vírgula, como as
+exportações dos sistemas) e mede `ler_planilha` em cada formato. Os valores
+das colunas de identificação precisam sair idênticos (zeros à esquerda
+preservados).
+
+Uso:
+    python benchmarks/bench_leitura.py [--linhas N]
+"""
+
+import argparse
+import gzip
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from planilhas.leitura import ler_planilha
+
+
+def gerar(linhas):
+    rng = np.random.default_rng(0)
+    numeros = rng.integers(0, linhas, linhas)
+    return pd.DataFrame({
+        "Número Processo": [f"{n:07d}-14.2016.8.09.0051" for n in numeros],
+        "CPF": [f"{n:011d}" for n in numeros % 5000],
+        "Nome": [f"Parte {n} Conceição" for n in numeros % 3000],
+        "Valor": (numeros % 700).astype("float64"),
+        "Data": pd.Timestamp("2020-01-01") + pd.to_timedelta(numeros % 365, unit="D"),
+    })
+
+
+def medir(arquivo):
+    inicio = time.perf_counter()
+    df, _ = ler_planilha(arquivo)
+    return df, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = gerar(args.linhas)
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+        xlsx = pasta / "dados.xlsx"
+        csv = pasta / "dados.csv"
+        csv_gz = pasta / "dados.csv.gz"
+        df.to_excel(xlsx, index=False)
+        df.to_csv(csv, index=False)
+        with gzip.open(csv_gz, "wt", encoding="cp1252", newline="") as saida:
+            df.to_csv(saida, index=False, sep=";")
+
+        print("=" * 70)
+        print(f"📖 LEITURA EXCEL × CSV ({args.linhas:,} linhas)")
+        print("=" * 70)
+
+        referencia, t_xlsx = medir(xlsx)
+        print(f"\n   .xlsx:                    {t_xlsx:7.3f} s")
+        for arquivo, descricao in ((csv, ".csv (UTF-8, ',')"), (csv_gz, ".csv.gz (cp1252, ';')")):
+            lido, tempo = medir(arquivo)
+            iguais = all(referencia[col].equals(lido[col]) for col in ("Número Processo", "CPF", "Nome"))
+            print(f"   {descricao:<25} {tempo:7.3f} s   ({t_xlsx / tempo:5.1f}x)   "
+                  f"{'✅' if iguais else '❌'} mesmos valores")
+        print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Pico de memória e tempo da comparação com a base e da deduplicação.
+
+Caminho antigo da comparação: cópias das colunas comuns dos dois lados, todas
+as colunas convertidas para texto e um `_id` com a linha inteira concatenada.
+Caminho novo: chaves de 64 bits por linha (`planilhas.memoria`), com a base
+reduzida às suas chaves. A deduplicação compara `drop_duplicates` com
+`analisar_duplicatas` sem orçamento e com um orçamento que força os blocos.
+Os resultados dos dois caminhos precisam ser idênticos.
+
+Uso:
+    python benchmarks/bench_memoria.py [--linhas N]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from planilhas.memoria import analisar_duplicatas, formatar_tamanho, remover_existentes, tipos_colunas
+from planilhas.normalizacao import chave_processo
+
+COLUNA_PROCESSO = "numero_processo"
+
+
+def gerar(linhas, semente):
+    rng = np.random.default_rng(semente)
+    numeros = rng.integers(0, linhas, linhas)
+    df = pd.DataFrame({
+        COLUNA_PROCESSO: pd.Series([f"{n:07d}-14.2016.8.09.0051" for n in numeros], dtype=object),
+        "cpf": pd.Series([f"{n:011d}" for n in numeros % 5000], dtype=object),
+        "nome": pd.Series([f"Parte {n}" for n in numeros % 3000], dtype=object),
+        "valor": (numeros % 700).astype("float64"),
+        "data": pd.Timestamp("2020-01-01") + pd.to_timedelta(numeros % 365, unit="D"),
+    })
+    df.loc[rng.random(linhas) < 0.05, "nome"] = np.nan
+    return df
+
+
+def comparar_antigo(df_novos, df_base):
+    colunas = list(df_novos.columns)
+    novos = df_novos[colunas].copy()
+    base = df_base[colunas].copy()
+    novos[COLUNA_PROCESSO] = chave_processo(novos[COLUNA_PROCESSO])
+    base[COLUNA_PROCESSO] = chave_processo(base[COLUNA_PROCESSO])
+    for col in colunas:
+        novos[col] = novos[col].astype(str)
+        base[col] = base[col].astype(str)
+    novos["_id"] = novos.apply(lambda x: "|".join(x.astype(str)), axis=1)
+    base["_id"] = base.apply(lambda x: "|".join(x.astype(str)), axis=1)
+    return df_novos[~novos["_id"].isin(set(base["_id"]))].copy()
+
+
+def comparar_novo(df_novos, df_base):
+    colunas = list(df_novos.columns)
+    tipos = tipos_colunas(df_novos, colunas)
+    return remover_existentes(df_novos, iter([df_base]), colunas, COLUNA_PROCESSO, tipos)[0]
+
+
+def medir(funcao):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, tempo, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df_novos = gerar(args.linhas, 0)
+    df_base = gerar(args.linhas, 1)
+
+    print("=" * 70)
+    print(f"🧠 MEMÓRIA NA COMPARAÇÃO E NA DEDUPLICAÇÃO ({args.linhas:,} linhas)")
+    print("=" * 70)
+
+    antigo, t_antigo, p_antigo = medir(lambda: comparar_antigo(df_novos, df_base))
+    novo, t_novo, p_novo = medir(lambda: comparar_novo(df_novos, df_base))
+    iguais = antigo.index.equals(novo.index)
+    print("\n   Comparação com a base")
+    print(f"     _id em texto:  {t_antigo:7.3f} s   pico {formatar_tamanho(p_antigo):>10}")
+    print(f"     chaves:        {t_novo:7.3f} s   pico {formatar_tamanho(p_novo):>10}   "
+          f"({t_antigo / t_novo:4.1f}x, {p_antigo / p_novo:4.1f}x menos memória)")
+    print(f"     {'✅' if iguais else '❌'} mesmas linhas mantidas ({len(novo):,})")
+
+    df = pd.concat([df_novos, df_novos.sample(frac=0.2, random_state=0)], ignore_index=True)
+    esperado, t_pandas, p_pandas = medir(lambda: df.duplicated())
+    (dup, _), t_exato, p_exato = medir(lambda: analisar_duplicatas(df))
+    (dup_blocos, _), t_blocos, p_blocos = medir(lambda: analisar_duplicatas(df, limite=1))
+    iguais = np.array_equal(esperado.to_numpy(), dup) and np.array_equal(esperado.to_numpy(), dup_blocos)
+    print(f"\n   Deduplicação ({len(df):,} linhas)")
+    print(f"     duplicated:           {t_pandas:7.3f} s   pico {formatar_tamanho(p_pandas):>10}")
+    print(f"     analisar_duplicatas:  {t_exato:7.3f} s   pico {formatar_tamanho(p_exato):>10}")
+    print(f"     em blocos (orçamento): {t_blocos:6.3f} s   pico {formatar_tamanho(p_blocos):>10}")
+    print(f"     {'✅' if iguais else '❌'} mesmas linhas marcadas ({int(dup.sum()):,})")
+    print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compara o kernel de normalização do número do processo com o caminho antigo.
+
+Caminho antigo: `astype(str).str.replace(r'[-.\\s]', '', regex=True)` para a
+chave e `apply(aplicar_mascara_processo)` para a máscara. Caminho novo:
+`chave_processo` e `mascara_processo`, com um caminho vetorizado por tipo.
+
+Uso:
+    python benchmarks/bench_normalizacao.py [--linhas N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from planilhas.mascara import aplicar_mascara_processo
+from planilhas.normalizacao import chave_processo, mascara_processo
+
+
+def gerar(linhas):
+    rng = np.random.default_rng(0)
+    numeros = rng.integers(0, 10 ** 7, linhas)
+    texto = pd.Series([f"{n:07d}-14.2016.8.09.0051" for n in numeros], dtype=object)
+    texto[rng.random(linhas) < 0.05] = np.nan
+    # Floats só guardam números de processo exatos até 2^53 (15 dígitos)
+    numerico = pd.Series(numeros * 10 ** 8 + 14201680, dtype=np.float64)
+    numerico[rng.random(linhas) < 0.05] = np.nan
+    return {"texto com máscara": texto, "float (Excel numérico)": numerico}
+
+
+def cronometrar(funcao, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=500_000)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"🔑 NORMALIZAÇÃO DO NÚMERO DO PROCESSO ({args.linhas:,} linhas)")
+    print("=" * 70)
+    for nome, serie in gerar(args.linhas).items():
+        antigo = cronometrar(lambda: serie.astype(str).str.replace(r'[-.\s]', '', regex=True))
+        novo = cronometrar(lambda: chave_processo(serie))
+        mascara_antiga = cronometrar(lambda: serie.apply(aplicar_mascara_processo), repeticoes=1)
+        mascara_nova = cronometrar(lambda: mascara_processo(serie))
+        print(f"\n   {nome}")
+        print(f"     chave   astype+regex: {antigo:7.3f} s   kernel: {novo:7.3f} s   ({antigo / novo:5.1f}x)")
+        print(f"     máscara apply:        {mascara_antiga:7.3f} s   kernel: {mascara_nova:7.3f} s   ({mascara_antiga / mascara_nova:5.1f}x)")
+    print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
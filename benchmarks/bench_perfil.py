@@ -0,0 +1,91 @@
+"""
+Mede o custo do perfil de qualidade sobre o pipeline.
+
+Gera um DataFrame sintético parecido com as exportações dos tribunais e roda a
+mesma sanitização do pipeline (`sanitizar_texto`) seguida da exportação para
+.xlsx, com e sem `PerfilQualidade.observar_coluna` (que reaproveita os códigos
+do factorize da sanitização). Mostra o acréscimo percentual de tempo
+sobre a execução completa e sobre a sanitização isolada.
+
+Uso:
+    python benchmarks/bench_perfil.py [--linhas N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from planilhas.perfil import PerfilQualidade
+from planilhas.sanitizacao import sanitizar_texto
+
+
+def gerar(linhas):
+    rng = np.random.default_rng(0)
+    numeros = rng.integers(0, 10 ** 7, linhas)
+    return pd.DataFrame({
+        "numero_processo": [f"{n:07d}-14.2016.8.09.0051" for n in numeros],
+        "cpf": [f"{n:011d}" for n in rng.integers(0, 10 ** 11, linhas)],
+        "nome": rng.choice(["  Ana\nMaria ", "José  Silva", "Maria", None], linhas),
+        "comarca": rng.choice(["Goiânia", "Anápolis", "Rio Verde"], linhas),
+        "valor": rng.random(linhas) * 1000,
+        "quantidade": rng.integers(0, 100, linhas),
+    })
+
+
+def sanitizar(df, perfil=None):
+    for coluna in df.columns:
+        fatores = None
+        if df[coluna].dtype == 'object':
+            df[coluna], fatores = sanitizar_texto(df[coluna])
+        if perfil is not None:
+            perfil.observar_coluna(coluna, df[coluna], fatores=fatores)
+
+
+def medir(df, com_perfil, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        sanitizar(copia, PerfilQualidade() if com_perfil else None)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def medir_exportacao(df):
+    copia = df.copy()
+    sanitizar(copia)
+    with tempfile.TemporaryDirectory() as pasta:
+        inicio = time.perf_counter()
+        copia.to_excel(f"{pasta}/saida.xlsx", index=False)
+        return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = gerar(args.linhas)
+    sem = medir(df, False)
+    com = medir(df, True)
+    exportacao = medir_exportacao(df)
+    print("=" * 70)
+    print(f"📋 PERFIL DE QUALIDADE ({args.linhas:,} linhas, {len(df.columns)} colunas)")
+    print("=" * 70)
+    print(f"   Sanitização sem perfil:      {sem:8.3f} s")
+    print(f"   Sanitização com perfil:      {com:8.3f} s")
+    print(f"   Exportação .xlsx:            {exportacao:8.3f} s")
+    print(f"   Acréscimo sobre sanitização: {(com / sem - 1) * 100:7.1f} %")
+    print(f"   Acréscimo sobre o total:     {(com - sem) / (sem + exportacao) * 100:7.1f} %")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
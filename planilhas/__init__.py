@@ -0,0 +1,8 @@
+"""
+Ferramentas para juntar, limpar, comparar e formatar planilhas jurídicas.
+
+O pacote não importa pandas ao ser carregado: cada ferramenta só importa as
+bibliotecas pesadas quando realmente tem dados para processar.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,8 @@
+import sys
+
+from planilhas.cli import main
+
+# A proteção é necessária para os processos da deduplicação paralela
+# (no Windows cada processo importa este módulo de novo)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Alinhamento das colunas de planilhas com layouts diferentes antes de juntá-las.
+
+Tribunais diferentes exportam o mesmo campo como `04 - NrProcesso (short
+text)`, `numero_processo` ou `Nr_Processo`, e `CPF do Réu` ou `cpf`. Sem
+alinhamento, o `pd.concat` cria uma coluna para cada grafia, cheia de vazios:
+a memória dobra, linhas iguais deixam de ser duplicatas e a comparação com a
+base cai para as poucas "colunas em comum".
+
+Cada coluna recebe uma chave de alinhamento (`chave_coluna`): sem acentos,
+maiúsculas, separadores, prefixo de numeração (`04 - `) e anotação de tipo
+entre parênteses no final. Colunas com a mesma chave, ou listadas como
+sinônimas no mapa (`SINONIMOS_PADRAO` e `~/.planilhas/sinonimos.json`), são
+renomeadas para um único nome antes de juntar os arquivos, e as que ficaram
+com tipos diferentes (texto num arquivo, número no outro) são convertidas
+para o mesmo tipo.
+
+O arquivo de sinônimos mapeia o nome de saída para os nomes equivalentes:
+
+    {"numero_processo": ["Nr Processo", "Processo Judicial"],
+     "Nome do Réu": ["reu", "parte re"]}
+"""
+
+import json
+import re
+from pathlib import Path
+
+from planilhas.esquema import PAPEIS_TEXTO_FIXO, identificar_papel, normalizar_nome
+
+CAMINHO_SINONIMOS = Path.home() / ".planilhas" / "sinonimos.json"
+
+# Grupos de nomes equivalentes já conhecidos. O nome de saída de cada grupo é
+# o primeiro que aparecer nos arquivos (a grafia do usuário é mantida).
+SINONIMOS_PADRAO = {
+    "processo": ["processo", "nr processo", "numero processo", "num processo", "n processo",
+                 "no processo", "numero do processo", "nr do processo"],
+    "cpf": ["cpf", "nr cpf", "numero cpf", "numero do cpf", "cpf do reu", "cpf reu",
+            "cpf da parte", "cpf parte"],
+    "cnpj": ["cnpj", "nr cnpj", "numero cnpj", "numero do cnpj", "cnpj do reu", "cnpj reu",
+             "cnpj da parte", "cnpj parte"],
+    "protocolo": ["protocolo", "nr protocolo", "numero protocolo", "numero do protocolo",
+                  "nr do protocolo"],
+}
+
+_RE_ANOTACAO = re.compile(r"\s*\([^()]*\)\s*$")
+_RE_NUMERACAO = re.compile(r"^\d+_(?=[a-z])")
+
+
+def chave_coluna(coluna):
+    """
+    Chave de alinhamento de um nome de coluna.
+    Exemplo: '04 - NrProcesso (short text)' e 'Nr_Processo' → 'nrprocesso'
+    """
+    nome = _RE_ANOTACAO.sub("", str(coluna)) or str(coluna)
+    nome = _RE_NUMERACAO.sub("", normalizar_nome(nome))
+    return nome.replace("_", "")
+
+
+class AlinhadorColunas:
+    """
+    Renomeia as colunas de cada arquivo para nomes únicos por campo e guarda
+    o que foi feito para o relatório. O primeiro arquivo alinhado define os
+    nomes de saída dos grupos sem nome fixado no arquivo de sinônimos.
+    """
+
+    def __init__(self, caminho_sinonimos=None):
+        self.caminho = Path(caminho_sinonimos) if caminho_sinonimos else CAMINHO_SINONIMOS
+        # chave de alinhamento → (grupo, nome de saída fixado ou None)
+        self._sinonimos = {}
+        for grupo, nomes in SINONIMOS_PADRAO.items():
+            for nome in nomes:
+                self._sinonimos[chave_coluna(nome)] = (grupo, None)
+        if self.caminho.exists():
+            try:
+                dados = json.loads(self.caminho.read_text(encoding="utf-8"))
+                for saida, nomes in dados.items():
+                    for nome in [saida, *nomes]:
+                        self._sinonimos[chave_coluna(nome)] = ("=" + saida, saida)
+            except (ValueError, AttributeError, TypeError) as e:
+                print(f"   ⚠️  Arquivo de sinônimos inválido em '{self.caminho}', ignorando: {e}")
+        self._nomes = {}
+        self.renomeadas = []
+        self.conflitos = []
+        self.convertidas = {}
+        self.nao_alinhadas = {}
+
+    def configuracao(self):
+        """
+        Mapa de sinônimos em uso, para compor a chave dos checkpoints.
+        """
+        return sorted((chave, grupo) for chave, (grupo, _) in self._sinonimos.items())
+
+    def mapear(self, colunas, origem=None):
+        """
+        Nome de saída de cada coluna de um arquivo. Se duas colunas do mesmo
+        arquivo caem no mesmo grupo, só uma é renomeada (a que já tem o nome
+        de saída, ou a primeira); a outra fica como está e é relatada.
+        Retorna {coluna: novo nome} só das colunas renomeadas.
+        """
+        grupos = {}
+        for col in colunas:
+            chave = chave_coluna(col)
+            grupo, saida = self._sinonimos.get(chave, (chave, None))
+            grupos.setdefault(grupo, (saida, []))[1].append(col)
+
+        mapa = {}
+        usados = set(colunas)
+        for grupo, (saida, membros) in grupos.items():
+            nome = self._nomes.setdefault(grupo, saida or membros[0])
+            escolhida = nome if nome in membros else membros[0]
+            self.conflitos.extend((origem, col, nome) for col in membros if col != escolhida)
+            if escolhida != nome and nome not in usados:
+                mapa[escolhida] = nome
+                usados.add(nome)
+                if origem is not None:
+                    self.renomeadas.append((origem, escolhida, nome))
+        return mapa
+
+    def alinhar(self, df, origem=None):
+        """
+        Renomeia as colunas de `df` no próprio DataFrame (sem copiar os dados).
+        """
+        mapa = self.mapear(df.columns, origem)
+        if mapa:
+            df.columns = [mapa.get(col, col) for col in df.columns]
+        return df
+
+    def alinhar_tabelas(self, dataframes, origens):
+        """
+        Alinha os DataFrames que vão ser juntados: renomeia as colunas,
+        converte para um tipo comum as que ficaram com tipos diferentes e
+        anota as colunas que não aparecem em todos os arquivos. O relatório
+        passa a ser o deste grupo de tabelas.
+        """
+        self.renomeadas = []
+        self.conflitos = []
+        for df, origem in zip(dataframes, origens):
+            self.alinhar(df, origem)
+        self.convertidas = _coagir(dataframes)
+
+        presentes = {}
+        for df in dataframes:
+            for col in df.columns:
+                presentes[col] = presentes.get(col, 0) + 1
+        self.nao_alinhadas = {col: n for col, n in presentes.items() if n < len(dataframes)}
+        return dataframes
+
+    def imprimir_relatorio(self, total_arquivos, recuo="   "):
+        """
+        Colunas renomeadas, convertidas e as que continuaram sem par.
+        """
+        if not (self.renomeadas or self.conflitos or self.convertidas or self.nao_alinhadas):
+            print(f"{recuo}✓ Todas as colunas já estavam alinhadas")
+            return
+        for origem, antiga, nova in self.renomeadas:
+            print(f"{recuo}🔗 {origem}: '{antiga}' → '{nova}'")
+        for col, tipo in self.convertidas.items():
+            print(f"{recuo}🔄 '{col}' convertida para {tipo} (tipos diferentes entre os arquivos)")
+        for origem, col, nome in self.conflitos:
+            print(f"{recuo}⚠️  {origem}: '{col}' não foi renomeada ('{nome}' já existe no arquivo)")
+        if self.nao_alinhadas:
+            print(f"{recuo}⚠️  {len(self.nao_alinhadas)} coluna(s) não mapeada(s) (ausentes em algum arquivo):")
+            for col, n in self.nao_alinhadas.items():
+                print(f"{recuo}   - '{col}' ({n} de {total_arquivos} arquivo(s))")
+            print(f"{recuo}💡 Sinônimos podem ser cadastrados em '{self.caminho}'")
+
+
+def _como_texto(serie):
+    """
+    Converte para texto mantendo os vazios; floats inteiros perdem o '.0'.
+    """
+    import pandas as pd
+
+    valores = serie
+    if pd.api.types.is_float_dtype(serie):
+        preenchidos = serie.dropna()
+        if (preenchidos == preenchidos.round()).all():
+            valores = serie.astype("Int64")
+    return valores.astype(str).where(serie.notna())
+
+
+def _coagir(dataframes):
+    """
+    Deixa cada coluna com um único tipo em todos os DataFrames. Colunas de
+    identificação e colunas que são texto em algum arquivo viram texto; datas
+    gravadas como texto num arquivo viram data se todas puderem ser lidas.
+    Retorna {coluna: tipo} das colunas convertidas.
+    """
+    import pandas as pd
+
+    from planilhas.memoria import TIPO_DATA, TIPO_TEXTO, tipos_colunas
+
+    tipos = {}
+    for df in dataframes:
+        for col, tipo in tipos_colunas(df, df.columns).items():
+            tipos.setdefault(col, set()).add(tipo)
+
+    convertidas = {}
+    for col, encontrados in tipos.items():
+        if len(encontrados) < 2:
+            continue
+        if TIPO_TEXTO not in encontrados and identificar_papel(col) not in PAPEIS_TEXTO_FIXO:
+            # Números inteiros e decimais o próprio concat une
+            continue
+        destino = TIPO_TEXTO
+        datas = {}
+        if encontrados == {TIPO_DATA, TIPO_TEXTO}:
+            for i, df in enumerate(dataframes):
+                if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                    datas[i] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
+                    if (datas[i].isna() & df[col].notna()).any():
+                        break
+            else:
+                destino = TIPO_DATA
+        for i, df in enumerate(dataframes):
+            if col not in df.columns:
+                continue
+            if destino == TIPO_DATA:
+                if i in datas:
+                    df[col] = datas[i]
+            elif tipos_colunas(df, [col])[col] != TIPO_TEXTO:
+                df[col] = _como_texto(df[col])
+        convertidas[col] = destino
+    return convertidas
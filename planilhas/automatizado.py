@@ -0,0 +1,629 @@
+import time
+from pathlib import Path
+from datetime import datetime
+
+from planilhas.esquema import (PAPEL_CNPJ, PAPEL_CPF, PAPEL_PROCESSO, RegistroEsquemas, coluna_do_papel,
+                               identificar_papel)
+from planilhas.leitura import listar_planilhas, ler_cabecalho, ler_planilha
+
+# Etapas com checkpoint em 2_processamento, na ordem em que são executadas
+ETAPAS = ("leitura", "base", "sanitizacao", "mascara")
+
+
+def processar_planilhas_automatizado(pasta_base_existente="0_base_existente",
+                                     pasta_entrada="1_planilhas_brutas",
+                                     pasta_processamento="2_processamento",
+                                     pasta_saida="3_resultado_final",
+                                     caminho_esquemas=None,
+                                     remover_quebras=True,
+                                     normalizar_espacos=True,
+                                     aplicar_mascara=True,
+                                     normalizar_documentos=True,
+                                     mascarar_documentos=False,
+                                     reprocessar=False,
+                                     max_memoria=None,
+                                     processos=None,
+                                     caminho_sinonimos=None):
+    """
+    Pipeline completo de processamento de planilhas:
+    0. Compara com base existente (opcional)
+    1. Junta todas as planilhas da pasta 1_planilhas_brutas
+    2. Normaliza CPF/CNPJ e remove duplicatas internas
+    3. Remove duplicatas com base existente
+    4. Sanitiza dados (remove quebras de linha, espaços extras)
+    5. Aplica máscara no número do processo
+    6. Protege colunas como texto (CPF, CNPJ, Processo)
+    7. Salva resultado final na pasta 3_resultado_final, junto com o
+       relatório de qualidade (JSON e HTML)
+
+    Todas as pastas podem ser trocadas pelos parâmetros da função. Todos os
+    arquivos são lidos com os dtypes do registro de esquemas.
+
+    O resultado de cada etapa fica salvo em 2_processamento. Numa nova
+    execução, as etapas cujas entradas e parâmetros não mudaram são
+    carregadas do checkpoint: trocar só as opções de sanitização ou de
+    máscara não refaz a leitura nem a deduplicação. Use `reprocessar=True`
+    para apagar os checkpoints e processar do zero.
+
+    `max_memoria` (bytes ou texto como '2GB') limita a memória usada na
+    deduplicação e na comparação com a base; acima do limite, as chaves das
+    linhas são calculadas em blocos.
+
+    `processos` é o número de processos da deduplicação de tabelas grandes
+    (padrão: todos os núcleos).
+
+    Antes de juntar, as colunas do mesmo campo com nomes diferentes são
+    alinhadas pelo mapa de sinônimos (`caminho_sinonimos`, padrão
+    ~/.planilhas/sinonimos.json); a base existente usa os mesmos nomes.
+
+    Com `normalizar_documentos`, as colunas de CPF e CNPJ ficam só com os 11
+    ou 14 dígitos (ou com a máscara, se `mascarar_documentos`) antes da
+    deduplicação, e os dígitos verificadores inválidos são contados.
+    """
+
+    # Define os diretórios
+    pasta_base_existente = Path(pasta_base_existente)
+    pasta_entrada = Path(pasta_entrada)
+    pasta_processamento = Path(pasta_processamento)
+    pasta_saida = Path(pasta_saida)
+
+    # Cria as pastas se não existirem
+    pasta_processamento.mkdir(exist_ok=True)
+    pasta_saida.mkdir(exist_ok=True)
+
+    print("=" * 80)
+    print("🤖 PROCESSADOR AUTOMATIZADO DE PLANILHAS")
+    print("=" * 80)
+    print("Pipeline completo:")
+    print("  0️⃣  Verificar base existente (opcional)")
+    print("  1️⃣  Juntar planilhas")
+    print("  2️⃣  Normalizar CPF/CNPJ e remover duplicatas internas")
+    print("  3️⃣  Comparar com base existente")
+    print("  4️⃣  Sanitizar dados")
+    print("  5️⃣  Aplicar máscara no número do processo")
+    print("  6️⃣  Proteger colunas sensíveis")
+    print("  7️⃣  Exportar resultado final")
+    print("=" * 80)
+
+    arquivos_excel = listar_planilhas(pasta_entrada)
+
+    if not arquivos_excel:
+        print(f"\n❌ Nenhuma planilha encontrada na pasta '{pasta_entrada}'")
+        print(f"💡 Coloque suas planilhas (Excel ou CSV) na pasta '{pasta_entrada}' e execute novamente")
+        return
+
+    # pandas só é importado quando há planilhas para processar
+    from planilhas.alinhamento import AlinhadorColunas
+    from planilhas.checkpoint import Checkpoints, chave_etapa
+    from planilhas.memoria import formatar_tamanho, interpretar_tamanho
+    from planilhas.perfil import PerfilQualidade
+    from planilhas.repetidos import imprimir_repetidos, separar_repetidos
+
+    registro = RegistroEsquemas(caminho_esquemas)
+    alinhador = AlinhadorColunas(caminho_sinonimos)
+    checkpoints = Checkpoints(pasta_processamento)
+    limite = interpretar_tamanho(max_memoria) if isinstance(max_memoria, str) else max_memoria
+    if limite:
+        print(f"\n🧠 Orçamento de memória: {formatar_tamanho(limite)}")
+
+    print("\n💾 CHECKPOINTS")
+    print("-" * 80)
+
+    if reprocessar:
+        checkpoints.limpar()
+        print("✓ Checkpoints apagados - processando do zero")
+
+    # Arquivos repetidos (a mesma exportação salva duas vezes) não são lidos
+    # nem entram na chave da leitura; os hashes são os mesmos dos checkpoints
+    hashes = [digest for _, digest in checkpoints.hashes_arquivos(arquivos_excel)]
+    arquivos_excel, repetidos = separar_repetidos(arquivos_excel, dict(zip(arquivos_excel, hashes)))
+    imprimir_repetidos(repetidos, recuo="")
+    arquivos_base = listar_planilhas(pasta_base_existente)
+    hashes = [digest for _, digest in checkpoints.hashes_arquivos(arquivos_base)]
+    arquivos_base, repetidos_base = separar_repetidos(arquivos_base, dict(zip(arquivos_base, hashes)))
+    imprimir_repetidos(repetidos_base, recuo="")
+
+    # Chave de cada etapa: conteúdo dos arquivos + parâmetros, encadeados
+    chaves = {}
+    chaves["leitura"] = chave_etapa(None, "leitura", {
+        "arquivos": checkpoints.hashes_arquivos(arquivos_excel),
+        "sinonimos": alinhador.configuracao(),
+        "normalizar_documentos": normalizar_documentos,
+        "mascarar_documentos": mascarar_documentos,
+    })
+    chaves["base"] = chave_etapa(chaves["leitura"], "base", checkpoints.hashes_arquivos(arquivos_base))
+    chaves["sanitizacao"] = chave_etapa(chaves["base"], "sanitizacao", {
+        "remover_quebras": remover_quebras,
+        "normalizar_espacos": normalizar_espacos,
+    })
+    chaves["mascara"] = chave_etapa(chaves["sanitizacao"], "mascara", {"aplicar_mascara": aplicar_mascara})
+    chaves["exportacao"] = chave_etapa(chaves["mascara"], "exportacao", {})
+
+    # Etapas ainda válidas, na ordem; o resumo é montado com os números de cada uma
+    resumo = {}
+    validas = []
+    for etapa in ETAPAS + ("exportacao",):
+        extras = checkpoints.obter_registro(etapa, chaves[etapa])
+        if extras is None:
+            break
+        validas.append(etapa)
+        resumo.update(extras)
+    resumo["arquivos_repetidos"] = len(repetidos) + len(repetidos_base)
+
+    # Nada mudou desde a última execução: o resultado final já existe
+    if "exportacao" in validas and Path(resumo["arquivo_saida"]).exists():
+        print("✓ Entradas e parâmetros iguais aos da última execução")
+        print(f"✓ Resultado já atualizado: {Path(resumo['arquivo_saida']).name}")
+        _imprimir_resumo(resumo)
+        return
+
+    # Carrega o checkpoint mais avançado que ainda pode ser lido
+    validas = [etapa for etapa in validas if etapa in ETAPAS]
+    df_consolidado = None
+    while validas and df_consolidado is None:
+        carregado = checkpoints.carregar(validas[-1], chaves[validas[-1]])
+        if carregado is None:
+            validas.pop()
+        else:
+            df_consolidado = carregado[0]
+    inicio = len(validas)
+
+    if validas:
+        print(f"✓ Retomando do checkpoint '{validas[-1]}' ({len(df_consolidado):,} linhas)")
+        print(f"  Etapas reaproveitadas: {', '.join(validas)}")
+    else:
+        print("ℹ️  Nenhum checkpoint válido - todas as etapas serão executadas")
+
+    # ETAPAS 1 a 3: leitura, junção e duplicatas internas
+    if inicio <= ETAPAS.index("leitura"):
+        df_consolidado, extras = _etapa_leitura(arquivos_excel, registro, alinhador, limite, repetidos, processos,
+                                                normalizar_documentos, mascarar_documentos)
+        if df_consolidado is None:
+            return
+        checkpoints.gravar("leitura", chaves["leitura"], df_consolidado, extras)
+        resumo.update(extras)
+    else:
+        print("\n📂 ETAPAS 1-3: LEITURA, JUNÇÃO E DUPLICATAS INTERNAS")
+        print("-" * 80)
+        print(f"♻️  Reaproveitadas do checkpoint ({resumo['arquivos_processados']} arquivo(s), "
+              f"{resumo['total_linhas_lidas']:,} linhas lidas)")
+
+    # ETAPA 3.5: Comparar com base existente
+    if inicio <= ETAPAS.index("base"):
+        df_consolidado, extras = _etapa_base(df_consolidado, arquivos_base, pasta_base_existente,
+                                             registro, alinhador, limite)
+        checkpoints.gravar("base", chaves["base"], df_consolidado, extras)
+        resumo.update(extras)
+    else:
+        print("\n🔍 ETAPA 3.5: COMPARANDO COM BASE EXISTENTE")
+        print("-" * 80)
+        print(f"♻️  Reaproveitada do checkpoint ({resumo['linhas_removidas_base']:,} linha(s) removidas)")
+
+    registro.salvar()
+
+    # O perfil de qualidade é coletado na passada da sanitização; a coluna de
+    # processo só é observada depois da máscara (ETAPA 5). Etapas carregadas
+    # do checkpoint são observadas direto do DataFrame carregado.
+    perfil = PerfilQualidade()
+    coluna_processo = coluna_do_papel(df_consolidado.columns, PAPEL_PROCESSO)
+
+    # ETAPA 4: Sanitizar dados
+    if inicio <= ETAPAS.index("sanitizacao"):
+        df_consolidado, extras = _etapa_sanitizacao(df_consolidado, perfil, coluna_processo,
+                                                    remover_quebras, normalizar_espacos)
+        checkpoints.gravar("sanitizacao", chaves["sanitizacao"], df_consolidado, extras)
+        resumo.update(extras)
+    else:
+        print("\n🧹 ETAPA 4: SANITIZANDO DADOS")
+        print("-" * 80)
+        print(f"♻️  Reaproveitada do checkpoint ({resumo['colunas_sanitizadas']} coluna(s) sanitizada(s))")
+        for coluna in df_consolidado.columns:
+            if coluna != coluna_processo:
+                perfil.observar_coluna(coluna, df_consolidado[coluna])
+
+    # ETAPA 5: Aplicar máscara no número do processo
+    if inicio <= ETAPAS.index("mascara"):
+        df_consolidado, extras = _etapa_mascara(df_consolidado, perfil, coluna_processo, aplicar_mascara)
+        checkpoints.gravar("mascara", chaves["mascara"], df_consolidado, extras)
+        resumo.update(extras)
+    else:
+        print("\n🎭 ETAPA 5: APLICANDO MÁSCARA NO NÚMERO DO PROCESSO")
+        print("-" * 80)
+        print(f"♻️  Reaproveitada do checkpoint ({resumo['mascaras_aplicadas']:,} máscara(s) aplicada(s))")
+        if coluna_processo:
+            perfil.observar_coluna(coluna_processo, df_consolidado[coluna_processo])
+
+    # ETAPA 6: Salvar resultado
+    print("\n💾 ETAPA 6: EXPORTANDO RESULTADO FINAL")
+    print("-" * 80)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    arquivo_saida = pasta_saida / f"planilha_processada_{timestamp}.xlsx"
+
+    df_consolidado.to_excel(arquivo_saida, index=False)
+
+    print(f"✓ Arquivo salvo: {arquivo_saida.name}")
+
+    relatorio_json, relatorio_html = perfil.salvar(pasta_saida, f"qualidade_{timestamp}")
+    print(f"✓ Relatório de qualidade: {relatorio_json.name} / {relatorio_html.name}")
+
+    extras = {
+        "arquivo_saida": str(arquivo_saida.absolute()),
+        "linhas": len(df_consolidado),
+        "colunas": [str(c) for c in df_consolidado.columns],
+        "total_celulas": perfil.total_celulas,
+        "celulas_vazias": perfil.celulas_vazias,
+        "invalidos": [[str(nome), p.papel, p.invalidos] for nome, p in perfil.colunas.items() if p.invalidos],
+    }
+    checkpoints.registrar("exportacao", chaves["exportacao"], extras)
+    resumo.update(extras)
+
+    _imprimir_resumo(resumo)
+
+
+def _etapa_leitura(arquivos_excel, registro, alinhador, limite=None, repetidos=(), processos=None,
+                   normalizar_documentos=True, mascarar_documentos=False):
+    """
+    ETAPAS 1 a 3: lê as planilhas, alinha as colunas, junta, normaliza as
+    colunas de CPF/CNPJ e remove as duplicatas internas.
+    `repetidos` são os arquivos ignorados por repetirem outro, usados só na
+    estimativa do tempo economizado.
+    Retorna (df, extras), ou (None, None) se nenhuma planilha foi lida.
+    """
+    import numpy as np
+    import pandas as pd
+    from planilhas.memoria import analisar_duplicatas
+    from planilhas.repetidos import estimar_economia
+
+    # ETAPA 1: Ler planilhas
+    print("\n📂 ETAPA 1: LEITURA DAS PLANILHAS")
+    print("-" * 80)
+    print(f"✓ Encontradas {len(arquivos_excel)} planilha(s)")
+
+    dataframes = []
+    nomes = []
+    total_linhas_lidas = 0
+
+    inicio_leitura = time.perf_counter()
+    for arquivo in arquivos_excel:
+        try:
+            # Lê o arquivo com todos os dtypes fixados pelo esquema
+            df, _ = ler_planilha(arquivo, registro)
+
+            print(f"  ✓ {arquivo.name}: {len(df)} linhas")
+            dataframes.append(df)
+            nomes.append(arquivo.name)
+            total_linhas_lidas += len(df)
+
+        except Exception as e:
+            print(f"  ❌ Erro ao ler {arquivo.name}: {e}")
+
+    if not dataframes:
+        print("\n❌ Nenhuma planilha foi carregada com sucesso")
+        return None, None
+
+    print(f"\n✅ Total de linhas lidas: {total_linhas_lidas:,}")
+    if repetidos:
+        economia = estimar_economia(repetidos, arquivos_excel, time.perf_counter() - inicio_leitura)
+        print(f"⏱️  Leitura evitada de {len(repetidos)} arquivo(s) repetido(s): ~{economia:.1f} s")
+
+    # ETAPA 2: Juntar planilhas
+    print("\n🔄 ETAPA 2: JUNTANDO PLANILHAS")
+    print("-" * 80)
+
+    # Colunas do mesmo campo com grafias diferentes viram uma só antes do
+    # concat, para a tabela consolidada não ficar com colunas quase vazias
+    alinhador.alinhar_tabelas(dataframes, nomes)
+    alinhador.imprimir_relatorio(len(dataframes), recuo="")
+
+    df_consolidado = pd.concat(dataframes, ignore_index=True)
+    # As planilhas lidas não são mais usadas depois de juntadas
+    del dataframes, df
+    print(f"✓ Planilhas consolidadas: {len(df_consolidado):,} linhas")
+
+    # ETAPA 2.5: Normalizar CPF e CNPJ (antes da deduplicação, para o mesmo
+    # documento com e sem máscara, ou sem os zeros à esquerda, ser igual)
+    df_consolidado, extras_documentos = _etapa_documentos(df_consolidado, normalizar_documentos,
+                                                          mascarar_documentos)
+
+    # ETAPA 3: Remover duplicatas internas
+    print("\n🗑️  ETAPA 3: REMOVENDO DUPLICATAS INTERNAS")
+    print("-" * 80)
+
+    linhas_antes_dedup = len(df_consolidado)
+    # Uma única análise dá as linhas a remover e o tamanho dos grupos, sem
+    # copiar as linhas duplicadas nem agrupá-las
+    duplicada, em_grupo = analisar_duplicatas(df_consolidado, limite, processos)
+
+    if em_grupo.any():
+        print(f"⚠️  Encontradas {int(em_grupo.sum())} linha(s) duplicada(s) internas")
+        print(f"   Grupos de duplicatas: {int((em_grupo & ~duplicada).sum())}")
+
+    df_consolidado = df_consolidado.take(np.flatnonzero(~duplicada))
+    linhas_removidas_internas = linhas_antes_dedup - len(df_consolidado)
+
+    if linhas_removidas_internas > 0:
+        print(f"✓ Removidas {linhas_removidas_internas:,} linha(s) duplicada(s) internas")
+        print(f"✓ Taxa de duplicação interna: {(linhas_removidas_internas/linhas_antes_dedup*100):.2f}%")
+    else:
+        print("✓ Nenhuma duplicata interna encontrada")
+
+    print(f"✓ Linhas restantes: {len(df_consolidado):,}")
+
+    return df_consolidado, {
+        "arquivos_processados": len(arquivos_excel),
+        "total_linhas_lidas": total_linhas_lidas,
+        "linhas_removidas_internas": linhas_removidas_internas,
+        "colunas_renomeadas": len(alinhador.renomeadas),
+        "colunas_nao_alinhadas": [str(col) for col in alinhador.nao_alinhadas],
+        **extras_documentos,
+    }
+
+
+def _etapa_documentos(df_consolidado, normalizar_documentos=True, mascarar_documentos=False):
+    """
+    ETAPA 2.5: deixa as colunas de CPF e CNPJ só com os 11 ou 14 dígitos (ou
+    com a máscara) e conta os documentos inválidos. Retorna (df, extras).
+    """
+    from planilhas.normalizacao import normalizar_documento
+
+    print("\n🪪 ETAPA 2.5: NORMALIZANDO CPF E CNPJ")
+    print("-" * 80)
+
+    documentos_normalizados = documentos_invalidos = 0
+    colunas_documento = [col for col in df_consolidado.columns if identificar_papel(col) in (PAPEL_CPF, PAPEL_CNPJ)]
+    if not normalizar_documentos:
+        print("ℹ️  Normalização desativada - CPF e CNPJ mantidos como estão")
+        colunas_documento = []
+    elif not colunas_documento:
+        print("ℹ️  Nenhuma coluna de CPF ou CNPJ identificada")
+
+    for col in colunas_documento:
+        papel = identificar_papel(col)
+        df_consolidado[col], normalizados, invalidos = normalizar_documento(df_consolidado[col], papel,
+                                                                           mascarar_documentos)
+        print(f"✓ '{col}' ({papel.upper()}): {normalizados:,} normalizado(s), {invalidos:,} inválido(s)")
+        documentos_normalizados += normalizados
+        documentos_invalidos += invalidos
+
+    return df_consolidado, {
+        "documentos_normalizados": documentos_normalizados,
+        "documentos_invalidos": documentos_invalidos,
+    }
+
+
+def _etapa_base(df_consolidado, arquivos_base, pasta_base_existente, registro, alinhador, limite=None):
+    """
+    ETAPA 3.5: remove os registros que já existem na base existente.
+    As colunas da base são alinhadas aos nomes da tabela consolidada.
+
+    A base é lida uma planilha por vez e dela só ficam na memória as linhas
+    com a chave de alguma linha nova, conferidas valor a valor antes da
+    remoção; os dados novos são filtrados sem cópias.
+    Retorna (df, extras).
+    """
+    from planilhas.memoria import estimar_bytes, remover_existentes, tipos_colunas
+
+    print("\n🔍 ETAPA 3.5: COMPARANDO COM BASE EXISTENTE")
+    print("-" * 80)
+
+    linhas_removidas_base = 0
+
+    if not arquivos_base:
+        print(f"ℹ️  Nenhuma base existente encontrada em '{pasta_base_existente}'")
+        print("   Pulando comparação com base existente")
+        print(f"   💡 Para comparar com dados existentes, coloque planilhas na pasta '{pasta_base_existente}'")
+        return df_consolidado, {"linhas_removidas_base": linhas_removidas_base}
+
+    print(f"✓ Encontradas {len(arquivos_base)} planilha(s) na base existente")
+
+    # Só os cabeçalhos são lidos agora, para decidir as colunas comparadas;
+    # os nomes de saída do alinhamento são os da tabela consolidada
+    alinhador.mapear(df_consolidado.columns)
+    cabecalhos = {}
+    mapas = {}
+    for arquivo in arquivos_base:
+        try:
+            cabecalhos[arquivo] = ler_cabecalho(arquivo)
+        except Exception as e:
+            print(f"  ⚠️  Erro ao ler {arquivo.name}: {e}")
+            continue
+        mapas[arquivo] = alinhador.mapear(cabecalhos[arquivo], arquivo.name)
+        for antiga, nova in mapas[arquivo].items():
+            print(f"  🔗 {arquivo.name}: '{antiga}' → '{nova}'")
+
+    if not cabecalhos:
+        return df_consolidado, {"linhas_removidas_base": linhas_removidas_base}
+
+    # Verifica compatibilidade de colunas
+    colunas_novos = set(df_consolidado.columns)
+    colunas_base = set(mapas[arquivo].get(col, col) for arquivo, colunas in cabecalhos.items() for col in colunas)
+
+    if colunas_novos != colunas_base:
+        colunas_comuns = list(colunas_novos & colunas_base)
+        if not colunas_comuns:
+            print("⚠️  AVISO: Nenhuma coluna em comum - comparação não será realizada")
+            return df_consolidado, {"linhas_removidas_base": linhas_removidas_base}
+        print(f"ℹ️  Usando {len(colunas_comuns)} coluna(s) em comum para comparação")
+    else:
+        colunas_comuns = list(df_consolidado.columns)
+        print(f"✓ Colunas compatíveis ({len(colunas_comuns)} colunas)")
+
+    # O número do processo é comparado pela chave canônica de 20 dígitos
+    # (sem traços, pontos e espaços) dos dois lados
+    col = coluna_do_papel(colunas_comuns, PAPEL_PROCESSO)
+    if col:
+        print(f"  ✓ Comparando '{col}' pela chave normalizada do processo")
+
+    # Cada coluna é comparada no tipo que tem nos dados novos
+    tipos = tipos_colunas(df_consolidado, colunas_comuns)
+    em_uso = estimar_bytes(df_consolidado) if limite else 0
+
+    def ler_base():
+        for arquivo, colunas in cabecalhos.items():
+            try:
+                df_base, _ = ler_planilha(arquivo, registro, colunas)
+            except Exception as e:
+                print(f"  ⚠️  Erro ao ler {arquivo.name}: {e}")
+                continue
+            df_base.columns = [mapas[arquivo].get(col, col) for col in df_base.columns]
+            print(f"  ✓ {arquivo.name}: {len(df_base)} linhas")
+            yield df_base
+            del df_base
+
+    # Compara e remove duplicatas
+    linhas_antes_comparacao = len(df_consolidado)
+    df_restante, total_linhas_base = remover_existentes(df_consolidado, ler_base(), colunas_comuns, col,
+                                                        tipos, limite, em_uso)
+    if not total_linhas_base:
+        return df_consolidado, {"linhas_removidas_base": linhas_removidas_base}
+    print(f"\n✓ Total de linhas na base existente: {total_linhas_base:,}")
+    df_consolidado = df_restante
+    del df_restante
+
+    linhas_removidas_base = linhas_antes_comparacao - len(df_consolidado)
+
+    if linhas_removidas_base > 0:
+        print(f"✓ Removidas {linhas_removidas_base:,} linha(s) que já existem na base")
+        print(f"✓ Taxa de duplicação com base: {(linhas_removidas_base/linhas_antes_comparacao*100):.2f}%")
+    else:
+        print("✓ Nenhum registro duplicado com a base existente")
+
+    print(f"✓ Linhas restantes (apenas novos): {len(df_consolidado):,}")
+
+    return df_consolidado, {"linhas_removidas_base": linhas_removidas_base}
+
+
+def _etapa_sanitizacao(df_consolidado, perfil, coluna_processo, remover_quebras, normalizar_espacos):
+    """
+    ETAPA 4: sanitiza as colunas de texto e alimenta o perfil de qualidade
+    na mesma passada. Retorna (df, extras).
+    """
+    from planilhas.sanitizacao import sanitizar_texto
+
+    print("\n🧹 ETAPA 4: SANITIZANDO DADOS")
+    print("-" * 80)
+
+    colunas_sanitizadas = 0
+    for coluna in df_consolidado.columns:
+        # Códigos do factorize feito na sanitização, reaproveitados pelo perfil
+        fatores = None
+        if df_consolidado[coluna].dtype == 'object':
+            try:
+                df_consolidado[coluna], fatores = sanitizar_texto(df_consolidado[coluna], remover_quebras,
+                                                                  normalizar_espacos)
+                colunas_sanitizadas += 1
+            except:
+                pass
+        if coluna != coluna_processo:
+            perfil.observar_coluna(coluna, df_consolidado[coluna], fatores=fatores)
+
+    print(f"✓ {colunas_sanitizadas} coluna(s) de texto sanitizada(s)")
+    if remover_quebras:
+        print("  • Quebras de linha removidas (\\n, \\r)")
+    if normalizar_espacos:
+        print("  • Espaços nas pontas removidos")
+        print("  • Espaços múltiplos normalizados")
+
+    return df_consolidado, {"colunas_sanitizadas": colunas_sanitizadas}
+
+
+def _etapa_mascara(df_consolidado, perfil, coluna_processo, aplicar_mascara):
+    """
+    ETAPA 5: aplica a máscara CNJ na coluna de processo. Retorna (df, extras).
+    """
+    import pandas as pd
+    from planilhas.normalizacao import mascara_processo
+
+    print("\n🎭 ETAPA 5: APLICANDO MÁSCARA NO NÚMERO DO PROCESSO")
+    print("-" * 80)
+
+    mascaras_aplicadas = 0
+
+    if not aplicar_mascara:
+        print("ℹ️  Máscara desativada - número do processo mantido como está")
+    elif coluna_processo:
+        print(f"✓ Coluna identificada: '{coluna_processo}'")
+
+        # Mostra exemplo antes
+        if len(df_consolidado) > 0 and pd.notna(df_consolidado[coluna_processo].iloc[0]):
+            exemplo_antes = str(df_consolidado[coluna_processo].iloc[0])
+            print(f"  Exemplo ANTES: {exemplo_antes}")
+
+        df_consolidado[coluna_processo], mascaras_aplicadas = mascara_processo(df_consolidado[coluna_processo])
+
+        # Mostra exemplo depois
+        if len(df_consolidado) > 0:
+            exemplo_depois = df_consolidado[coluna_processo].iloc[0]
+            print(f"  Exemplo DEPOIS: {exemplo_depois}")
+
+        print(f"✓ Máscaras aplicadas com sucesso: {mascaras_aplicadas:,}/{len(df_consolidado):,}")
+    else:
+        print("⚠️  Coluna de processo não identificada - pulando aplicação de máscara")
+        print(f"   Colunas disponíveis: {', '.join(df_consolidado.columns[:5].tolist())}...")
+
+    if coluna_processo:
+        perfil.observar_coluna(coluna_processo, df_consolidado[coluna_processo])
+
+    return df_consolidado, {
+        "coluna_processo": coluna_processo,
+        "mascaras_aplicadas": mascaras_aplicadas,
+    }
+
+
+def _imprimir_resumo(resumo):
+    """
+    Imprime o resumo final a partir dos números registrados por cada etapa.
+    """
+    arquivo_saida = Path(resumo["arquivo_saida"])
+    colunas = resumo["colunas"]
+
+    print("\n" + "=" * 80)
+    print("📊 RESUMO DO PROCESSAMENTO")
+    print("=" * 80)
+
+    print(f"\n📥 Entrada:")
+    print(f"  • Arquivos processados: {resumo['arquivos_processados']}")
+    print(f"  • Total de linhas lidas: {resumo['total_linhas_lidas']:,}")
+    if resumo.get("arquivos_repetidos"):
+        print(f"  • Arquivos repetidos ignorados: {resumo['arquivos_repetidos']}")
+
+    print(f"\n🔄 Processamento:")
+    print(f"  • Duplicatas internas removidas: {resumo['linhas_removidas_internas']:,}")
+    print(f"  • Duplicatas com base existente removidas: {resumo['linhas_removidas_base']:,}")
+    print(f"  • Total de duplicatas removidas: {resumo['linhas_removidas_internas'] + resumo['linhas_removidas_base']:,}")
+    if resumo.get("documentos_normalizados"):
+        print(f"  • CPF/CNPJ normalizados: {resumo['documentos_normalizados']:,} "
+              f"({resumo['documentos_invalidos']:,} inválido(s))")
+    if resumo.get("colunas_renomeadas"):
+        print(f"  • Colunas alinhadas (renomeadas): {resumo['colunas_renomeadas']}")
+    if resumo.get("colunas_nao_alinhadas"):
+        print(f"  • Colunas não mapeadas: {', '.join(resumo['colunas_nao_alinhadas'])}")
+    print(f"  • Colunas sanitizadas: {resumo['colunas_sanitizadas']}")
+    if resumo["coluna_processo"]:
+        print(f"  • Máscaras aplicadas: {resumo['mascaras_aplicadas']:,}")
+
+    print(f"\n📊 Estrutura final:")
+    print(f"  • Total de linhas: {resumo['linhas']:,}")
+    print(f"  • Total de colunas: {len(colunas)}")
+    print(f"  • Colunas: {', '.join(colunas[:5])}")
+    if len(colunas) > 5:
+        print(f"    ... e mais {len(colunas) - 5} coluna(s)")
+
+    # Informações sobre células vazias (já coletadas pelo perfil)
+    total_celulas = resumo["total_celulas"]
+    celulas_vazias = resumo["celulas_vazias"]
+    print(f"\n📈 Qualidade dos dados:")
+    print(f"  • Total de células: {total_celulas:,}")
+    print(f"  • Células vazias: {celulas_vazias:,}")
+    print(f"  • Taxa de preenchimento: {((total_celulas - celulas_vazias)/total_celulas*100) if total_celulas > 0 else 0:.2f}%")
+    for nome, papel, invalidos in resumo["invalidos"]:
+        print(f"  • Valores inválidos em '{nome}' ({papel}): {invalidos:,}")
+
+    print(f"\n💾 Arquivo de saída:")
+    print(f"  • Caminho completo: {arquivo_saida}")
+    print(f"  • Tamanho: ~{arquivo_saida.stat().st_size / 1024 / 1024:.2f} MB")
+
+    print("\n" + "=" * 80)
+    print("✅ PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
+    print("=" * 80)
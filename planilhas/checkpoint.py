@@ -0,0 +1,170 @@
+"""
+Checkpoints das etapas do pipeline automatizado, gravados em `2_processamento`.
+
+Cada etapa tem uma chave: o hash da chave da etapa anterior somado aos
+parâmetros da própria etapa (e, na leitura, ao conteúdo dos arquivos de
+entrada). O resultado da etapa é gravado em formato colunar (Parquet, ou
+pickle quando o pyarrow não está instalado ou não aceita a coluna) e o estado
+com as chaves fica em `estado.json`. Numa nova execução, toda etapa cuja chave
+não mudou é carregada do disco em vez de ser recalculada; mudar só um
+parâmetro da sanitização ou da máscara não refaz a leitura nem a deduplicação.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from planilhas import __version__
+
+ARQUIVO_ESTADO = "estado.json"
+PASTA_CHECKPOINTS = "checkpoints"
+
+# Tamanho dos blocos lidos ao calcular o hash de um arquivo
+BLOCO_HASH = 1024 * 1024
+
+
+def hash_arquivo(caminho):
+    """
+    Hash SHA-256 do conteúdo de um arquivo, lido em blocos (sem carregar
+    o arquivo inteiro na memória).
+    """
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(BLOCO_HASH), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def chave_etapa(anterior, etapa, parametros):
+    """
+    Chave de uma etapa: depende da chave anterior, do nome da etapa, dos
+    parâmetros e da versão do pacote (mudanças no código invalidam o cache).
+    """
+    conteudo = json.dumps([__version__, anterior, etapa, parametros], sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:32]
+
+
+class Checkpoints:
+    """
+    Estado persistente das etapas do pipeline numa pasta de processamento.
+    """
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+        self.caminho_estado = self.pasta / ARQUIVO_ESTADO
+        self.estado = {"arquivos": {}, "etapas": {}}
+        if self.caminho_estado.exists():
+            try:
+                dados = json.loads(self.caminho_estado.read_text(encoding="utf-8"))
+                self.estado["arquivos"] = dict(dados.get("arquivos", {}))
+                self.estado["etapas"] = dict(dados.get("etapas", {}))
+            except (ValueError, AttributeError) as e:
+                print(f"   ⚠️  Estado de processamento inválido em '{self.caminho_estado}', recriando: {e}")
+
+    def hashes_arquivos(self, arquivos):
+        """
+        Lista de (nome, hash) dos arquivos. O hash só é recalculado quando o
+        tamanho ou a data de modificação do arquivo mudaram.
+        """
+        resultado = []
+        for arquivo in arquivos:
+            info = os.stat(arquivo)
+            chave = str(Path(arquivo).resolve())
+            anterior = self.estado["arquivos"].get(chave)
+            if anterior and anterior["tamanho"] == info.st_size and anterior["mtime"] == info.st_mtime_ns:
+                digest = anterior["hash"]
+            else:
+                digest = hash_arquivo(arquivo)
+                self.estado["arquivos"][chave] = {
+                    "tamanho": info.st_size,
+                    "mtime": info.st_mtime_ns,
+                    "hash": digest,
+                }
+            resultado.append((Path(arquivo).name, digest))
+        return resultado
+
+    def carregar(self, etapa, chave):
+        """
+        Retorna (df, extras) do checkpoint da etapa se a chave for a mesma
+        da última execução, ou None.
+        """
+        import numpy as np
+        import pandas as pd
+
+        registro = self.estado["etapas"].get(etapa)
+        if not registro or registro.get("chave") != chave:
+            return None
+        caminho = self.pasta / PASTA_CHECKPOINTS / registro["arquivo"]
+        if not caminho.exists():
+            return None
+        try:
+            if caminho.suffix == ".parquet":
+                df = pd.read_parquet(caminho)
+                # O Parquet devolve None nas colunas de texto; o pipeline usa NaN
+                for coluna in df.columns:
+                    if df[coluna].dtype == object and df[coluna].isna().any():
+                        df[coluna] = df[coluna].where(df[coluna].notna(), np.nan)
+            else:
+                df = pd.read_pickle(caminho)
+        except Exception as e:
+            print(f"   ⚠️  Checkpoint '{caminho.name}' ilegível, recalculando: {e}")
+            return None
+        return df, registro.get("extras", {})
+
+    def gravar(self, etapa, chave, df, extras=None):
+        """
+        Grava o resultado da etapa e atualiza o estado (escrita atômica).
+        """
+        pasta = self.pasta / PASTA_CHECKPOINTS
+        pasta.mkdir(parents=True, exist_ok=True)
+        try:
+            temporario = pasta / f"{etapa}.parquet.tmp"
+            df.to_parquet(temporario, index=False)
+            arquivo = f"{etapa}.parquet"
+        except (ImportError, ValueError, TypeError, NotImplementedError):
+            # Sem pyarrow, ou coluna com tipos mistos que o Arrow não aceita
+            temporario.unlink(missing_ok=True)
+            temporario = pasta / f"{etapa}.pkl.tmp"
+            df.to_pickle(temporario)
+            arquivo = f"{etapa}.pkl"
+        temporario.replace(pasta / arquivo)
+
+        anterior = self.estado["etapas"].get(etapa)
+        if anterior and anterior.get("arquivo") not in (None, arquivo):
+            (pasta / anterior["arquivo"]).unlink(missing_ok=True)
+        self.estado["etapas"][etapa] = {"chave": chave, "arquivo": arquivo, "extras": extras or {}}
+        self.salvar()
+
+    def registrar(self, etapa, chave, extras=None):
+        """
+        Registra uma etapa que não gera DataFrame (por exemplo, a exportação).
+        """
+        self.estado["etapas"][etapa] = {"chave": chave, "arquivo": None, "extras": extras or {}}
+        self.salvar()
+
+    def obter_registro(self, etapa, chave):
+        """
+        Extras de uma etapa sem DataFrame, se a chave não mudou; senão None.
+        """
+        registro = self.estado["etapas"].get(etapa)
+        if not registro or registro.get("chave") != chave:
+            return None
+        return registro.get("extras", {})
+
+    def limpar(self):
+        """
+        Apaga todos os checkpoints e o estado (execução do zero).
+        """
+        pasta = self.pasta / PASTA_CHECKPOINTS
+        if pasta.exists():
+            for arquivo in pasta.iterdir():
+                arquivo.unlink()
+        self.estado = {"arquivos": {}, "etapas": {}}
+        self.caminho_estado.unlink(missing_ok=True)
+
+    def salvar(self):
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho_estado.with_suffix(".tmp")
+        temporario.write_text(json.dumps(self.estado, ensure_ascii=False, indent=2), encoding="utf-8")
+        temporario.replace(self.caminho_estado)
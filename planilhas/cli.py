@@ -0,0 +1,211 @@
+"""
+Ponto de entrada único `planilhas`, com um subcomando para cada ferramenta.
+
+Os módulos das ferramentas (e portanto o pandas) só são importados dentro do
+subcomando escolhido, para que `--help` e execuções sem arquivos sejam
+instantâneas.
+"""
+
+import argparse
+import sys
+
+from planilhas import __version__
+from planilhas.memoria import interpretar_tamanho
+
+
+def _tamanho(texto):
+    try:
+        return interpretar_tamanho(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _cmd_remover_tracos(args):
+    from planilhas.remover_tracos import remover_tracos
+    remover_tracos(pasta_entrada=args.entrada, pasta_saida=args.saida,
+                   caminho_esquemas=args.esquemas)
+
+
+def _cmd_mascara(args):
+    from planilhas.mascara import aplicar_mascara_planilhas
+    aplicar_mascara_planilhas(pasta_input=args.entrada, pasta_output=args.saida,
+                              caminho_esquemas=args.esquemas)
+
+
+def _cmd_documentos(args):
+    from planilhas.documentos import normalizar_documentos_planilhas
+    normalizar_documentos_planilhas(pasta_input=args.entrada, pasta_output=args.saida,
+                                    caminho_esquemas=args.esquemas, mascarar=args.mascara)
+
+
+def _cmd_comparar(args):
+    if args.chaves:
+        from planilhas.comparador import comparar_diferencas
+        comparar_diferencas(args.chaves, pasta_novos=args.novos,
+                            pasta_existentes=args.existentes,
+                            pasta_resultado=args.saida,
+                            caminho_esquemas=args.esquemas,
+                            caminho_sinonimos=args.sinonimos)
+        return
+    from planilhas.comparador import comparar_e_remover_duplicatas
+    comparar_e_remover_duplicatas(pasta_novos=args.novos,
+                                  pasta_existentes=args.existentes,
+                                  pasta_resultado=args.saida,
+                                  caminho_esquemas=args.esquemas,
+                                  max_memoria=args.max_memory,
+                                  caminho_sinonimos=args.sinonimos)
+
+
+def _cmd_juntar(args):
+    from planilhas.juntador import juntar_planilhas
+    juntar_planilhas(pasta_planilhas=args.entrada, pasta_resultados=args.saida,
+                     caminho_esquemas=args.esquemas, max_memoria=args.max_memory,
+                     processos=args.processos, caminho_sinonimos=args.sinonimos)
+
+
+def _cmd_automatico(args):
+    from planilhas.automatizado import processar_planilhas_automatizado
+    processar_planilhas_automatizado(pasta_base_existente=args.base,
+                                     pasta_entrada=args.entrada,
+                                     pasta_processamento=args.processamento,
+                                     pasta_saida=args.saida,
+                                     caminho_esquemas=args.esquemas,
+                                     remover_quebras=not args.manter_quebras,
+                                     normalizar_espacos=not args.manter_espacos,
+                                     aplicar_mascara=not args.sem_mascara,
+                                     normalizar_documentos=not args.sem_documentos,
+                                     mascarar_documentos=args.mascara_documentos,
+                                     reprocessar=args.reprocessar,
+                                     max_memoria=args.max_memory,
+                                     processos=args.processos,
+                                     caminho_sinonimos=args.sinonimos)
+
+
+def _cmd_servico(args):
+    from planilhas.servico import iniciar_servico
+    iniciar_servico(pasta_base_existente=args.base, pasta_saida=args.saida,
+                    host=args.host, porta=args.porta, intervalo=args.intervalo,
+                    caminho_esquemas=args.esquemas, caminho_sinonimos=args.sinonimos,
+                    pasta_entrada=args.entrada)
+
+
+def criar_parser():
+    """
+    Monta o parser de argumentos com um subcomando por ferramenta.
+    Os padrões das pastas são os mesmos dos scripts originais.
+    """
+    parser = argparse.ArgumentParser(
+        prog="planilhas",
+        description="Ferramentas para juntar, limpar, comparar e formatar planilhas jurídicas.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="comando", metavar="COMANDO")
+    subparsers.required = True
+
+    # Opções comuns a todas as ferramentas
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--esquemas", default=None,
+                       help="Arquivo do registro de esquemas (padrão: ~/.planilhas/esquemas.json)")
+
+    # Orçamento de memória das ferramentas que comparam ou deduplicam
+    memoria = argparse.ArgumentParser(add_help=False)
+    memoria.add_argument("--max-memory", type=_tamanho, default=None, metavar="TAMANHO",
+                         help="Orçamento de memória (ex.: 512MB, 2GB); acima dele o processamento é feito em blocos")
+
+    # Mapa de sinônimos do alinhamento de colunas das ferramentas que juntam arquivos
+    alinhamento = argparse.ArgumentParser(add_help=False)
+    alinhamento.add_argument("--sinonimos", default=None, metavar="CAMINHO",
+                             help="Arquivo JSON de sinônimos de colunas (padrão: ~/.planilhas/sinonimos.json)")
+
+    # Processos da deduplicação das tabelas consolidadas
+    paralelo = argparse.ArgumentParser(add_help=False)
+    paralelo.add_argument("--processos", type=int, default=None, metavar="N",
+                          help="Processos na deduplicação de tabelas grandes "
+                               "(padrão: todos os núcleos)")
+
+    p = subparsers.add_parser("remover-tracos", parents=[comum], help="Remove traços e pontos do número do processo")
+    p.add_argument("--entrada", default="planilha", help="Pasta com as planilhas (padrão: planilha)")
+    p.add_argument("--saida", default="resultado", help="Pasta de resultado (padrão: resultado)")
+    p.set_defaults(funcao=_cmd_remover_tracos)
+
+    p = subparsers.add_parser("mascara", parents=[comum], help="Aplica a máscara CNJ no número do processo")
+    p.add_argument("--entrada", default="input", help="Pasta com as planilhas (padrão: input)")
+    p.add_argument("--saida", default="output", help="Pasta de resultado (padrão: output)")
+    p.set_defaults(funcao=_cmd_mascara)
+
+    p = subparsers.add_parser("documentos", parents=[comum], help="Normaliza e valida as colunas de CPF e CNPJ")
+    p.add_argument("--entrada", default="input", help="Pasta com as planilhas (padrão: input)")
+    p.add_argument("--saida", default="output", help="Pasta de resultado (padrão: output)")
+    p.add_argument("--mascara", action="store_true",
+                   help="Grava com a máscara (000.000.000-00 e 00.000.000/0000-00) em vez de só os dígitos")
+    p.set_defaults(funcao=_cmd_documentos)
+
+    p = subparsers.add_parser("comparar", parents=[comum, memoria, alinhamento], help="Remove dos dados novos os registros já existentes")
+    p.add_argument("--novos", default="planilha1_novos", help="Pasta com os dados novos (padrão: planilha1_novos)")
+    p.add_argument("--existentes", default="planilha2_existentes",
+                   help="Pasta com os dados existentes (padrão: planilha2_existentes)")
+    p.add_argument("--saida", default="resultado", help="Pasta de resultado (padrão: resultado)")
+    p.add_argument("--chaves", nargs="+", default=None, metavar="COLUNA",
+                   help="Modo diferenças: junta as planilhas por estas colunas (nome ou papel, ex.: processo) "
+                        "e gera as linhas adicionadas, removidas e alteradas")
+    p.set_defaults(funcao=_cmd_comparar)
+
+    p = subparsers.add_parser("juntar", parents=[comum, memoria, paralelo, alinhamento], help="Junta, deduplica e sanitiza várias planilhas")
+    p.add_argument("--entrada", default="Planilhas", help="Pasta com as planilhas (padrão: Planilhas)")
+    p.add_argument("--saida", default="Resultados", help="Pasta de resultado (padrão: Resultados)")
+    p.set_defaults(funcao=_cmd_juntar)
+
+    p = subparsers.add_parser("automatico", parents=[comum, memoria, paralelo, alinhamento], help="Executa o pipeline automatizado completo")
+    p.add_argument("--base", default="0_base_existente",
+                   help="Pasta com a base existente (padrão: 0_base_existente)")
+    p.add_argument("--entrada", default="1_planilhas_brutas",
+                   help="Pasta com as planilhas brutas (padrão: 1_planilhas_brutas)")
+    p.add_argument("--processamento", default="2_processamento",
+                   help="Pasta de trabalho (padrão: 2_processamento)")
+    p.add_argument("--saida", default="3_resultado_final",
+                   help="Pasta do resultado final (padrão: 3_resultado_final)")
+    p.add_argument("--manter-quebras", action="store_true",
+                   help="Não remove as quebras de linha na sanitização")
+    p.add_argument("--manter-espacos", action="store_true",
+                   help="Não remove espaços nas pontas nem espaços múltiplos")
+    p.add_argument("--sem-mascara", action="store_true",
+                   help="Não aplica a máscara CNJ no número do processo")
+    p.add_argument("--sem-documentos", action="store_true",
+                   help="Não normaliza as colunas de CPF e CNPJ antes da deduplicação")
+    p.add_argument("--mascara-documentos", action="store_true",
+                   help="Grava CPF e CNPJ com a máscara em vez de só os dígitos")
+    p.add_argument("--reprocessar", action="store_true",
+                   help="Apaga os checkpoints de 2_processamento e processa do zero")
+    p.set_defaults(funcao=_cmd_automatico)
+
+    p = subparsers.add_parser("servico", parents=[comum, alinhamento],
+                              help="Mantém a base carregada e atende requisições HTTP locais")
+    p.add_argument("--base", default="0_base_existente",
+                   help="Pasta com a base existente (padrão: 0_base_existente)")
+    p.add_argument("--saida", default="3_resultado_final",
+                   help="Pasta dos resultados pedidos por caminho (padrão: 3_resultado_final)")
+    p.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1)")
+    p.add_argument("--porta", type=int, default=8765, help="Porta de escuta (padrão: 8765)")
+    p.add_argument("--intervalo", type=float, default=5,
+                   help="Segundos entre as verificações da pasta da base (padrão: 5)")
+    p.add_argument("--entrada", default=None,
+                   help="Única pasta de onde os pedidos por caminho podem ler planilhas "
+                        "(sem ela, esses pedidos só são aceitos em 127.0.0.1)")
+    p.set_defaults(funcao=_cmd_servico)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Executa o subcomando escolhido e devolve o código de saída do processo.
+    """
+    args = criar_parser().parse_args(argv)
+    try:
+        args.funcao(args)
+    except Exception as e:
+        print(f"\n❌ Erro durante a execução: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    return 0
@@ -0,0 +1,456 @@
+from pathlib import Path
+from datetime import datetime
+
+from planilhas.esquema import PAPEL_PROCESSO, RegistroEsquemas, coluna_do_papel, normalizar_nome
+from planilhas.leitura import listar_planilhas, ler_cabecalho, ler_planilha
+
+def comparar_e_remover_duplicatas(pasta_novos="planilha1_novos",
+                                  pasta_existentes="planilha2_existentes",
+                                  pasta_resultado="resultado",
+                                  caminho_esquemas=None,
+                                  max_memoria=None,
+                                  caminho_sinonimos=None):
+    """
+    Compara Planilha 1 (dados novos) com Planilha 2 (dados existentes).
+    Remove da Planilha 1 todos os registros que já existem na Planilha 2.
+    Salva o resultado (apenas dados novos únicos) na pasta de resultado.
+    As duas planilhas são lidas com os dtypes do registro de esquemas, para
+    que os mesmos valores tenham a mesma representação dos dois lados.
+    
+    A comparação é feita por uma chave de 64 bits por linha: a Planilha 2 é
+    lida um arquivo por vez e dela só ficam as linhas com a chave de alguma
+    linha nova, conferidas valor a valor antes da remoção. `max_memoria`
+    (bytes ou texto como '2GB') faz as chaves serem calculadas em blocos
+    que cabem no orçamento.
+    
+    As colunas do mesmo campo com nomes diferentes (ex.: 'CPF do Réu' e
+    'cpf') são alinhadas pelo mapa de sinônimos antes da comparação.
+    """
+    
+    # Define os diretórios
+    pasta_novos = Path(pasta_novos)
+    pasta_existentes = Path(pasta_existentes)
+    pasta_resultado = Path(pasta_resultado)
+    
+    # Cria a pasta de resultado se não existir
+    pasta_resultado.mkdir(exist_ok=True)
+    
+    print("=" * 70)
+    print("🔍 COMPARADOR DE PLANILHAS - REMOVEDOR DE DUPLICATAS")
+    print("=" * 70)
+    
+    # Lê planilha 1 (dados novos)
+    arquivos_novos = listar_planilhas(pasta_novos)
+    if not arquivos_novos:
+        print(f"\n❌ Nenhuma planilha encontrada em '{pasta_novos}'")
+        return
+    
+    arquivos_existentes = listar_planilhas(pasta_existentes)
+    if not arquivos_existentes:
+        print(f"\n❌ Nenhuma planilha encontrada em '{pasta_existentes}'")
+        return
+    
+    # pandas só é importado quando há planilhas para processar
+    from planilhas.alinhamento import AlinhadorColunas
+    from planilhas.memoria import (estimar_bytes, formatar_tamanho, interpretar_tamanho,
+                                   remover_existentes, tipos_colunas)
+    from planilhas.repetidos import imprimir_repetidos, separar_repetidos
+    
+    registro = RegistroEsquemas(caminho_esquemas)
+    alinhador = AlinhadorColunas(caminho_sinonimos)
+    # Arquivos repetidos (a mesma exportação salva duas vezes) não são lidos
+    arquivos_novos, repetidos_novos = separar_repetidos(arquivos_novos)
+    arquivos_existentes, repetidos_existentes = separar_repetidos(arquivos_existentes)
+    limite = interpretar_tamanho(max_memoria) if isinstance(max_memoria, str) else max_memoria
+    if limite:
+        print(f"\n🧠 Orçamento de memória: {formatar_tamanho(limite)}")
+    
+    print(f"\n📂 Planilha 1 (Dados Novos): {len(arquivos_novos)} arquivo(s)")
+    imprimir_repetidos(repetidos_novos)
+    
+    # Junta todos os arquivos da planilha 1
+    df_novos = _ler_pasta(arquivos_novos, registro, alinhador)
+    print(f"   ✓ Total: {len(df_novos)} linhas na Planilha 1")
+    
+    # Planilha 2 (dados existentes): por enquanto só os cabeçalhos; as linhas
+    # são lidas um arquivo por vez durante a comparação
+    print(f"\n📂 Planilha 2 (Dados Existentes): {len(arquivos_existentes)} arquivo(s)")
+    imprimir_repetidos(repetidos_existentes)
+    cabecalhos = {arquivo: ler_cabecalho(arquivo) for arquivo in arquivos_existentes}
+    
+    # As colunas da Planilha 2 recebem os mesmos nomes das da Planilha 1
+    mapas = {arquivo: alinhador.mapear(colunas, arquivo.name) for arquivo, colunas in cabecalhos.items()}
+    for arquivo, mapa in mapas.items():
+        for antiga, nova in mapa.items():
+            print(f"   🔗 {arquivo.name}: '{antiga}' → '{nova}'")
+    
+    # Verifica se as colunas são compatíveis
+    print(f"\n🔍 Verificando compatibilidade...")
+    colunas_novos = set(df_novos.columns)
+    colunas_existentes = set(mapas[arquivo].get(col, col) for arquivo, colunas in cabecalhos.items()
+                             for col in colunas)
+    
+    if colunas_novos != colunas_existentes:
+        print(f"   ⚠️  AVISO: As colunas não são idênticas")
+        print(f"   Colunas apenas em Planilha 1: {colunas_novos - colunas_existentes}")
+        print(f"   Colunas apenas em Planilha 2: {colunas_existentes - colunas_novos}")
+        
+        # Usa apenas as colunas em comum para comparação
+        colunas_comuns = list(colunas_novos & colunas_existentes)
+        if not colunas_comuns:
+            print(f"   ❌ Nenhuma coluna em comum encontrada!")
+            return
+        print(f"   ✓ Usando {len(colunas_comuns)} coluna(s) em comum para comparação")
+    else:
+        colunas_comuns = list(df_novos.columns)
+        print(f"   ✓ Colunas compatíveis ({len(colunas_comuns)} colunas)")
+    
+    # O número do processo é comparado pela chave canônica de 20 dígitos,
+    # então '0082162-14.2016.8.09.0051' e '00821621420168090051' são iguais;
+    # valores que não são números de processo são comparados como estão
+    coluna_processo = coluna_do_papel(colunas_comuns, PAPEL_PROCESSO)
+    if coluna_processo:
+        print(f"   🔑 Comparando '{coluna_processo}' pela chave normalizada do processo")
+    
+    # Cada coluna é comparada no tipo que tem na Planilha 1
+    tipos = tipos_colunas(df_novos, colunas_comuns)
+    em_uso = estimar_bytes(df_novos) if limite else 0
+    
+    def ler_existentes():
+        for arquivo, colunas in cabecalhos.items():
+            print(f"   📖 Lendo: {arquivo.name}")
+            df_existente, _ = ler_planilha(arquivo, registro, colunas)
+            df_existente.columns = [mapas[arquivo].get(col, col) for col in df_existente.columns]
+            print(f"      ✓ {len(df_existente)} linhas")
+            yield df_existente
+            del df_existente
+    
+    # Remove duplicatas da Planilha 1 que existem na Planilha 2: as linhas
+    # com a mesma chave são conferidas valor a valor antes de sair
+    print(f"\n🔄 Comparando e removendo duplicatas...")
+    
+    linhas_antes = len(df_novos)
+    
+    df_resultado, linhas_existentes = remover_existentes(df_novos, ler_existentes(), colunas_comuns,
+                                                         coluna_processo, tipos, limite, em_uso)
+    registro.salvar()
+    print(f"   ✓ Total: {linhas_existentes} linhas na Planilha 2")
+    del df_novos
+    
+    linhas_depois = len(df_resultado)
+    linhas_removidas = linhas_antes - linhas_depois
+    
+    print(f"   ✓ Comparação concluída")
+    print(f"   🗑️  Removidas: {linhas_removidas} linha(s) duplicada(s)")
+    print(f"   ✅ Restantes: {linhas_depois} linha(s) única(s)")
+    
+    if linhas_removidas > 0:
+        print(f"   📊 Taxa de duplicação: {(linhas_removidas/linhas_antes*100):.2f}%")
+    
+    # Salva o resultado
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    arquivo_saida = pasta_resultado / f"dados_unicos_{timestamp}.xlsx"
+    
+    print(f"\n💾 Salvando resultado...")
+    df_resultado.to_excel(arquivo_saida, index=False)
+    
+    # Resumo final
+    print("\n" + "=" * 70)
+    print("📊 RESUMO FINAL")
+    print("=" * 70)
+    print(f"\n📥 Entrada:")
+    print(f"   • Planilha 1 (Novos): {linhas_antes:,} linhas")
+    print(f"   • Planilha 2 (Existentes): {linhas_existentes:,} linhas")
+    
+    print(f"\n🔄 Processamento:")
+    print(f"   • Linhas removidas (duplicadas): {linhas_removidas:,}")
+    print(f"   • Linhas mantidas (únicas): {linhas_depois:,}")
+    
+    print(f"\n💾 Saída:")
+    print(f"   • Arquivo: {arquivo_saida.name}")
+    print(f"   • Caminho: {arquivo_saida.absolute()}")
+    print(f"   • Colunas: {len(df_resultado.columns)}")
+    
+    print("\n" + "=" * 70)
+    print("✅ Processo concluído com sucesso!")
+    print("=" * 70)
+
+
+def comparar_diferencas(colunas_chave,
+                        pasta_novos="planilha1_novos",
+                        pasta_existentes="planilha2_existentes",
+                        pasta_resultado="resultado",
+                        caminho_esquemas=None,
+                        caminho_sinonimos=None):
+    """
+    Modo diferenças: junta a Planilha 1 (versão nova) com a Planilha 2
+    (versão anterior) pelas colunas de `colunas_chave` e gera um único
+    arquivo `diferencas_*.xlsx` com as abas:
+    
+    - Adicionadas: linhas da Planilha 1 cuja chave não existe na Planilha 2
+    - Removidas: linhas da Planilha 2 cuja chave não existe na Planilha 1
+    - Alteradas: chave nos dois lados, mas algum outro campo diferente; para
+      cada coluna com alguma alteração saem o valor novo, o anterior e uma
+      marcação se mudou naquela linha
+    
+    As colunas de chave podem ser dadas pelo nome exato, pelo nome sem
+    acentos/maiúsculas ou pelo papel (ex.: 'processo', 'cpf'). A junção é um
+    hash join sobre as chaves de 64 bits das colunas de chave (uma passada em
+    cada lado); os pares encontrados pelo hash têm a chave e as colunas
+    conferidas valor a valor, então uma colisão não vira par nem alteração.
+    Linhas com alguma coluna de chave vazia ou que não pôde ser normalizada
+    (processo ou CPF/CNPJ sem dígitos reconhecíveis) ficam fora da junção e
+    vão para a aba 'Chaves inválidas'. Chaves repetidas num mesmo lado são
+    ambíguas: só a primeira ocorrência entra na comparação e as demais vão
+    para a aba 'Chaves repetidas'.
+    
+    As colunas das duas versões são alinhadas pelo mapa de sinônimos, então
+    uma coluna renomeada entre as versões continua sendo comparada.
+    """
+    
+    pasta_novos = Path(pasta_novos)
+    pasta_existentes = Path(pasta_existentes)
+    pasta_resultado = Path(pasta_resultado)
+    pasta_resultado.mkdir(exist_ok=True)
+    
+    print("=" * 70)
+    print("🔍 COMPARADOR DE PLANILHAS - DIFERENÇAS POR CHAVE")
+    print("=" * 70)
+    
+    arquivos_novos = listar_planilhas(pasta_novos)
+    if not arquivos_novos:
+        print(f"\n❌ Nenhuma planilha encontrada em '{pasta_novos}'")
+        return
+    
+    arquivos_existentes = listar_planilhas(pasta_existentes)
+    if not arquivos_existentes:
+        print(f"\n❌ Nenhuma planilha encontrada em '{pasta_existentes}'")
+        return
+    
+    # pandas só é importado quando há planilhas para processar
+    import numpy as np
+    import pandas as pd
+    from planilhas.alinhamento import AlinhadorColunas
+    from planilhas.memoria import chaves_linhas, tipos_colunas, valores_iguais, valores_linhas
+    from planilhas.repetidos import imprimir_repetidos, separar_repetidos
+    
+    registro = RegistroEsquemas(caminho_esquemas)
+    alinhador = AlinhadorColunas(caminho_sinonimos)
+    # Arquivos repetidos (a mesma exportação salva duas vezes) não são lidos
+    arquivos_novos, repetidos_novos = separar_repetidos(arquivos_novos)
+    arquivos_existentes, repetidos_existentes = separar_repetidos(arquivos_existentes)
+    
+    print(f"\n📂 Planilha 1 (Versão Nova): {len(arquivos_novos)} arquivo(s)")
+    imprimir_repetidos(repetidos_novos)
+    df_novos = _ler_pasta(arquivos_novos, registro, alinhador)
+    print(f"   ✓ Total: {len(df_novos)} linhas na Planilha 1")
+    
+    print(f"\n📂 Planilha 2 (Versão Anterior): {len(arquivos_existentes)} arquivo(s)")
+    imprimir_repetidos(repetidos_existentes)
+    df_existentes = _ler_pasta(arquivos_existentes, registro, alinhador)
+    print(f"   ✓ Total: {len(df_existentes)} linhas na Planilha 2")
+    registro.salvar()
+    
+    # Resolve as colunas de chave nos dois lados
+    print(f"\n🔑 Colunas de chave:")
+    chave = []
+    for nome in colunas_chave:
+        col = _resolver_coluna(nome, df_novos.columns)
+        if col is None or col not in df_existentes.columns:
+            raise ValueError(f"coluna de chave '{nome}' não encontrada nas duas planilhas")
+        print(f"   • {col}")
+        chave.append(col)
+    
+    colunas_comuns = [col for col in df_novos.columns if col in set(df_existentes.columns)]
+    comparadas = [col for col in colunas_comuns if col not in chave]
+    apenas_novos = [col for col in df_novos.columns if col not in set(colunas_comuns)]
+    apenas_existentes = [col for col in df_existentes.columns if col not in set(colunas_comuns)]
+    if apenas_novos or apenas_existentes:
+        print(f"   ⚠️  AVISO: As colunas não são idênticas (só as {len(comparadas)} em comum são comparadas)")
+        print(f"   Colunas apenas em Planilha 1: {apenas_novos}")
+        print(f"   Colunas apenas em Planilha 2: {apenas_existentes}")
+    
+    # Os dois lados são comparados nos tipos da Planilha 1, e o número do
+    # processo pela chave canônica de 20 dígitos
+    coluna_processo = coluna_do_papel(colunas_comuns, PAPEL_PROCESSO)
+    tipos = tipos_colunas(df_novos, colunas_comuns)
+    
+    print(f"\n🔄 Juntando as planilhas pela chave...")
+    chaves_novos, validas_novos = chaves_linhas(df_novos, chave, coluna_processo, tipos)
+    chaves_existentes, validas_existentes = chaves_linhas(df_existentes, chave, coluna_processo, tipos)
+    
+    # Chaves vazias ou que não puderam ser normalizadas ficam fora da junção:
+    # não casam com nada e não contam como repetidas
+    validas_novos &= _chave_normalizada(df_novos, chave, coluna_processo)
+    validas_existentes &= _chave_normalizada(df_existentes, chave, coluna_processo)
+    
+    # Só a primeira ocorrência de cada chave participa da junção
+    repetida_novos = np.zeros(len(df_novos), dtype=bool)
+    repetida_novos[validas_novos] = pd.Series(chaves_novos[validas_novos]).duplicated().to_numpy()
+    repetida_existentes = np.zeros(len(df_existentes), dtype=bool)
+    repetida_existentes[validas_existentes] = pd.Series(chaves_existentes[validas_existentes]).duplicated().to_numpy()
+    usar_novos = np.flatnonzero(validas_novos & ~repetida_novos)
+    usar_existentes = np.flatnonzero(validas_existentes & ~repetida_existentes)
+    
+    # Hash join: índice das chaves de um lado, consultado pelo outro
+    indice_existentes = pd.Index(chaves_existentes[usar_existentes])
+    posicoes = indice_existentes.get_indexer(chaves_novos[usar_novos])
+    casadas = posicoes >= 0
+    pares_novos = usar_novos[casadas]
+    pares_existentes = usar_existentes[posicoes[casadas]]
+    
+    # Os pares são conferidos pelos valores da chave (o hash pode colidir)
+    lado_novo = df_novos.take(pares_novos)
+    lado_anterior = df_existentes.take(pares_existentes)
+    mesma_chave = np.ones(len(pares_novos), dtype=bool)
+    for col in chave:
+        valores_novo, _ = valores_linhas(lado_novo, [col], coluna_processo, tipos)
+        valores_anterior, _ = valores_linhas(lado_anterior, [col], coluna_processo, tipos)
+        mesma_chave &= valores_iguais(valores_novo[col], valores_anterior[col])
+    if not mesma_chave.all():
+        pares_novos = pares_novos[mesma_chave]
+        pares_existentes = pares_existentes[mesma_chave]
+        lado_novo = lado_novo.take(np.flatnonzero(mesma_chave))
+        lado_anterior = lado_anterior.take(np.flatnonzero(mesma_chave))
+    
+    pareada_novos = np.zeros(len(df_novos), dtype=bool)
+    pareada_novos[pares_novos] = True
+    pareada_existentes = np.zeros(len(df_existentes), dtype=bool)
+    pareada_existentes[pares_existentes] = True
+    
+    df_adicionadas = df_novos.take(usar_novos[~pareada_novos[usar_novos]])
+    df_removidas = df_existentes.take(usar_existentes[~pareada_existentes[usar_existentes]])
+    print(f"   ✓ {len(pares_novos):,} chave(s) nos dois lados")
+    
+    # Marca, coluna a coluna, o que mudou entre os pares, comparando os
+    # próprios valores (no tipo da Planilha 1) e não só o hash deles
+    marcas = {}
+    for col in comparadas:
+        valores_novo, valido_novo = valores_linhas(lado_novo, [col], coluna_processo, tipos)
+        valores_anterior, valido_anterior = valores_linhas(lado_anterior, [col], coluna_processo, tipos)
+        mudou = ~valores_iguais(valores_novo[col], valores_anterior[col]) | ~valido_novo | ~valido_anterior
+        if mudou.any():
+            marcas[col] = mudou
+    
+    alterada = np.zeros(len(pares_novos), dtype=bool)
+    for mudou in marcas.values():
+        alterada |= mudou
+    linhas_alteradas = np.flatnonzero(alterada)
+    
+    df_alteradas = lado_novo[chave].take(linhas_alteradas).reset_index(drop=True)
+    for col, mudou in marcas.items():
+        df_alteradas[f"{col} (novo)"] = lado_novo[col].take(linhas_alteradas).to_numpy()
+        df_alteradas[f"{col} (anterior)"] = lado_anterior[col].take(linhas_alteradas).to_numpy()
+        df_alteradas[f"{col} alterada"] = mudou[linhas_alteradas]
+    df_alteradas["colunas alteradas"] = [
+        ", ".join(col for col, mudou in marcas.items() if mudou[i]) for i in linhas_alteradas
+    ]
+    
+    df_repetidas = pd.concat([
+        df_novos.take(np.flatnonzero(repetida_novos)).assign(origem="Planilha 1"),
+        df_existentes.take(np.flatnonzero(repetida_existentes)).assign(origem="Planilha 2"),
+    ], ignore_index=True)
+    
+    df_invalidas = pd.concat([
+        df_novos.take(np.flatnonzero(~validas_novos)).assign(origem="Planilha 1"),
+        df_existentes.take(np.flatnonzero(~validas_existentes)).assign(origem="Planilha 2"),
+    ], ignore_index=True)
+    
+    if len(df_invalidas):
+        print(f"   ⚠️  {len(df_invalidas)} linha(s) com chave vazia ou que não pôde ser normalizada "
+              f"(aba 'Chaves inválidas')")
+    if len(df_repetidas):
+        print(f"   ⚠️  {len(df_repetidas)} linha(s) com chave repetida no mesmo lado (aba 'Chaves repetidas')")
+    
+    print(f"   ➕ Adicionadas: {len(df_adicionadas)} linha(s)")
+    print(f"   ➖ Removidas: {len(df_removidas)} linha(s)")
+    print(f"   ✏️  Alteradas: {len(df_alteradas)} linha(s)")
+    for col, mudou in marcas.items():
+        print(f"      • {col}: {int(mudou.sum())}")
+    
+    # Salva o resultado
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    arquivo_saida = pasta_resultado / f"diferencas_{timestamp}.xlsx"
+    
+    print(f"\n💾 Salvando resultado...")
+    with pd.ExcelWriter(arquivo_saida) as escritor:
+        df_adicionadas.to_excel(escritor, sheet_name="Adicionadas", index=False)
+        df_removidas.to_excel(escritor, sheet_name="Removidas", index=False)
+        df_alteradas.to_excel(escritor, sheet_name="Alteradas", index=False)
+        if len(df_repetidas):
+            df_repetidas.to_excel(escritor, sheet_name="Chaves repetidas", index=False)
+        if len(df_invalidas):
+            df_invalidas.to_excel(escritor, sheet_name="Chaves inválidas", index=False)
+    
+    # Resumo final
+    print("\n" + "=" * 70)
+    print("📊 RESUMO FINAL")
+    print("=" * 70)
+    print(f"\n📥 Entrada:")
+    print(f"   • Planilha 1 (Nova): {len(df_novos):,} linhas")
+    print(f"   • Planilha 2 (Anterior): {len(df_existentes):,} linhas")
+    
+    print(f"\n🔄 Diferenças:")
+    print(f"   • Adicionadas: {len(df_adicionadas):,}")
+    print(f"   • Removidas: {len(df_removidas):,}")
+    print(f"   • Alteradas: {len(df_alteradas):,}")
+    print(f"   • Iguais: {len(pares_novos) - len(df_alteradas):,}")
+    if len(df_invalidas):
+        print(f"   • Chaves inválidas: {len(df_invalidas):,}")
+    
+    print(f"\n💾 Saída:")
+    print(f"   • Arquivo: {arquivo_saida.name}")
+    print(f"   • Caminho: {arquivo_saida.absolute()}")
+    
+    print("\n" + "=" * 70)
+    print("✅ Processo concluído com sucesso!")
+    print("=" * 70)
+
+
+def _chave_normalizada(df, chave, coluna_processo):
+    """
+    Marca as linhas com todas as colunas de chave preenchidas e, no número
+    do processo e no CPF/CNPJ, com dígitos reconhecidos pela normalização
+    (as mesmas colunas que `chaves_linhas` normaliza).
+    """
+    from planilhas.esquema import identificar_papel
+    from planilhas.normalizacao import LARGURAS_DOCUMENTO, matriz_documento, matriz_processo
+    
+    normalizada = df[chave].notna().all(axis=1).to_numpy()
+    for col in chave:
+        papel = identificar_papel(col)
+        if col == coluna_processo:
+            normalizada &= matriz_processo(df[col])[1]
+        elif papel in LARGURAS_DOCUMENTO:
+            normalizada &= matriz_documento(df[col], papel)[1]
+    return normalizada
+
+
+def _ler_pasta(arquivos, registro, alinhador):
+    """
+    Lê as planilhas de uma pasta, alinha as colunas e junta.
+    """
+    import pandas as pd
+    
+    dataframes = []
+    for arquivo in arquivos:
+        print(f"   📖 Lendo: {arquivo.name}")
+        df, _ = ler_planilha(arquivo, registro)
+        print(f"      ✓ {len(df)} linhas")
+        dataframes.append(df)
+    alinhador.alinhar_tabelas(dataframes, [arquivo.name for arquivo in arquivos])
+    alinhador.imprimir_relatorio(len(dataframes))
+    return pd.concat(dataframes, ignore_index=True)
+
+
+def _resolver_coluna(nome, colunas):
+    """
+    Encontra a coluna pelo nome exato, pelo nome normalizado ou pelo papel.
+    """
+    if nome in colunas:
+        return nome
+    normalizado = normalizar_nome(nome)
+    for col in colunas:
+        if normalizar_nome(col) == normalizado:
+            return col
+    return coluna_do_papel(colunas, normalizado)
@@ -0,0 +1,302 @@
+"""
+Deduplicação da tabela consolidada em vários processos.
+
+O `duplicated` do pandas roda num único núcleo: fatoriza cada coluna (troca
+cada valor por um código inteiro), combina os códigos num identificador por
+linha e marca os identificadores repetidos. `analisar_duplicatas_particionado`
+divide o mesmo trabalho por linhas, com o mesmo resultado:
+
+1. cada linha recebe uma impressão digital de 64 bits (o hash de cada coluna
+   combinado), calculada em blocos de linhas, um bloco por processo;
+2. só linhas cuja impressão digital se repete podem ser duplicatas
+   (candidatas);
+3. as candidatas são divididas em partições pelo resto da impressão digital:
+   linhas iguais têm a mesma impressão e caem sempre na mesma partição;
+4. cada partição é conferida de forma exata (cada linha contra a primeira
+   linha com a mesma impressão), uma por processo, e as marcações voltam
+   para as posições originais.
+
+Como cada grupo de linhas iguais fica inteiro numa única partição, na ordem
+original, o resultado é idêntico ao de `df.duplicated()` (e portanto ao de
+`drop_duplicates(keep='first')`). Colisões de hash só geram candidatas a
+mais, que a conferência exata descarta. Com um orçamento de memória
+(`--max-memory`), os blocos e as partições são dimensionados para caber nele.
+
+No Linux os processos são criados com fork e herdam o DataFrame sem cópia.
+Nos demais sistemas cada processo recebe uma cópia do seu bloco de linhas ou
+da sua partição.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from planilhas.memoria import (_MULTIPLICADOR, _SEMENTE, BYTES_POR_CELULA_DEDUP, LINHAS_BLOCO_MINIMO, TIPO_TEXTO,
+                               _converter_coluna, estimar_bytes, formatar_tamanho, tipos_colunas)
+
+# Abaixo disso criar os processos custa mais que o `duplicated` do pandas
+LINHAS_PARALELO = 500_000
+
+# Linhas por tarefa no cálculo das impressões digitais
+LINHAS_POR_TAREFA = 250_000
+
+# Partições por processo (mais partições equilibram melhor a carga)
+PARTICOES_POR_PROCESSO = 2
+
+# Textos que `hash_array` usa para vazios numa coluna de texto (None, NaN,
+# pd.NA e NaT); todos recebem o mesmo hash, como no `duplicated`
+_TEXTOS_NULOS = ("None", "nan", "<NA>", "NaT")
+
+# Dados herdados pelos processos criados com fork (ou usados no próprio processo)
+_compartilhado = {}
+
+
+def herda_memoria():
+    """
+    Indica se os processos podem herdar o DataFrame sem cópia (fork).
+    """
+    return sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods()
+
+
+def processos_padrao():
+    """
+    Número de processos usado quando não é informado: os núcleos da máquina.
+    """
+    return os.cpu_count() or 1
+
+
+def _colunas_mistas(df):
+    """
+    Colunas de objeto com valores de tipos diferentes (ex.: 1 e '1'). Para
+    elas a impressão digital usa os códigos do `factorize`, que seguem
+    exatamente a igualdade do `duplicated`. Retorna {coluna: códigos}.
+    """
+    import pandas as pd
+
+    mistas = {}
+    for col in df.columns:
+        serie = df[col]
+        if pd.api.types.is_object_dtype(serie) and pd.api.types.infer_dtype(serie, skipna=True) not in ("string", "empty"):
+            mistas[col] = pd.factorize(serie)[0]
+    return mistas
+
+
+def _hash_texto(valores):
+    """
+    Hash de cada valor de uma coluna de texto, sem fatorizar a coluna; os
+    vazios (None, NaN, pd.NA) ficam com o mesmo hash.
+    """
+    import numpy as np
+    import pandas as pd
+
+    hashes = pd.util.hash_array(valores, categorize=False)
+    nulos = pd.util.hash_array(np.array(_TEXTOS_NULOS, dtype=object), categorize=False)
+    hashes[np.isin(hashes, nulos)] = nulos[0]
+    return hashes
+
+
+def _tarefa_chaves(tarefa):
+    """
+    Impressões digitais de um bloco de linhas. `bloco` é None quando o
+    DataFrame foi herdado.
+    """
+    import numpy as np
+    import pandas as pd
+
+    bloco, mistas, inicio, fim = tarefa
+    if bloco is None:
+        bloco = _compartilhado["df"].iloc[inicio:fim]
+        mistas = {col: codigos[inicio:fim] for col, codigos in _compartilhado["mistas"].items()}
+    # Duplicata é a linha idêntica (como no `duplicated`): CPF/CNPJ e
+    # processo entram como estão, sem normalizar
+    tipos = tipos_colunas(bloco, bloco.columns)
+    chaves = np.full(len(bloco), _SEMENTE, dtype=np.uint64)
+    multiplicador = np.uint64(_MULTIPLICADOR)
+    for col in bloco.columns:
+        serie = bloco[col]
+        if col in mistas:
+            hashes = pd.util.hash_array(mistas[col])
+        elif pd.api.types.is_object_dtype(serie):
+            hashes = _hash_texto(serie.to_numpy())
+        else:
+            valores, _ = _converter_coluna(serie, tipos.get(col, TIPO_TEXTO))
+            hashes = pd.util.hash_array(valores, categorize=True)
+        chaves *= multiplicador
+        chaves ^= hashes
+    return chaves
+
+
+def _valores_iguais(a, b):
+    """
+    Compara duas colunas posição a posição; vazios são iguais entre si
+    (mesmo critério do `duplicated`).
+    """
+    import numpy as np
+
+    iguais = a.array == b.array
+    if not isinstance(iguais, np.ndarray):
+        iguais = iguais.to_numpy(dtype=bool, na_value=False)
+    return iguais | (a.isna().to_numpy() & b.isna().to_numpy())
+
+
+def _iguais_nas_posicoes(serie, a, b):
+    """
+    Compara os valores da coluna nas posições `a` e `b`, par a par. Colunas
+    do numpy são comparadas direto nos vetores; os vazios só são procurados
+    entre os pares diferentes.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not isinstance(serie.dtype, np.dtype):
+        return _valores_iguais(serie.take(a), serie.take(b))
+    valores = serie.to_numpy()
+    x = valores[a]
+    y = valores[b]
+    iguais = np.asarray(x == y, dtype=bool)
+    diferentes = np.flatnonzero(~iguais)
+    if len(diferentes):
+        iguais[diferentes] = pd.isna(x[diferentes]) & pd.isna(y[diferentes])
+    return iguais
+
+
+def _tarefa_particao(tarefa):
+    """
+    Conferência exata de uma partição (linhas na ordem original, grupos de
+    impressão digital completos). Cada linha é comparada com a primeira
+    linha da sua impressão; só os grupos com alguma diferença (colisão)
+    passam pelo `duplicated` do pandas. Retorna (duplicada, em_grupo).
+    """
+    import numpy as np
+    import pandas as pd
+
+    subconjunto, posicoes, chaves = tarefa
+    if subconjunto is None:
+        tabela = _compartilhado["df"]
+    else:
+        tabela, posicoes = subconjunto, np.arange(len(subconjunto))
+
+    # Os códigos do factorize seguem a ordem da primeira ocorrência: a
+    # primeira linha de cada código é a que supera todos os anteriores
+    codigos, _ = pd.factorize(chaves)
+    anteriores = np.maximum.accumulate(np.concatenate(([-1], codigos[:-1])))
+    representante = np.flatnonzero(codigos > anteriores)[codigos]
+    duplicada = np.arange(len(codigos)) != representante
+    outras = np.flatnonzero(duplicada)
+
+    iguais = np.ones(len(outras), dtype=bool)
+    try:
+        for col in range(tabela.shape[1]):
+            iguais &= _iguais_nas_posicoes(tabela.iloc[:, col], posicoes[outras], posicoes[representante[outras]])
+    except (TypeError, ValueError):
+        # Valores que não se comparam com == (ex.: pd.NA em coluna de objeto)
+        iguais[:] = False
+
+    em_grupo = np.ones(len(codigos), dtype=bool)
+    if not iguais.all():
+        afetadas = np.flatnonzero(np.isin(codigos, codigos[outras[~iguais]]))
+        parte = tabela.take(posicoes[afetadas])
+        duplicada[afetadas] = parte.duplicated().to_numpy()
+        em_grupo[afetadas] = parte.duplicated(keep=False).to_numpy()
+    return duplicada, em_grupo
+
+def _executar(executor, funcao, tarefas, processos):
+    """
+    Executa as tarefas no executor (ou no próprio processo, se não há um),
+    no máximo `processos` por vez, para que só essas estejam na memória.
+    Retorna os resultados na ordem das tarefas.
+    """
+    if executor is None:
+        return [funcao(tarefa) for tarefa in tarefas]
+    resultados = []
+    pendentes = []
+    for tarefa in tarefas:
+        pendentes.append(executor.submit(funcao, tarefa))
+        if len(pendentes) >= processos:
+            resultados.append(pendentes.pop(0).result())
+    resultados.extend(futuro.result() for futuro in pendentes)
+    return resultados
+
+
+def _criar_executor(processos, herda):
+    contexto = multiprocessing.get_context("fork" if herda else "spawn")
+    return ProcessPoolExecutor(processos, mp_context=contexto)
+
+
+def analisar_duplicatas_particionado(df, processos=None, limite=None):
+    """
+    Marca as linhas duplicadas com o mesmo resultado de `df.duplicated()`,
+    particionando as linhas pela impressão digital, em `processos` processos
+    (1 = no próprio processo; padrão: os núcleos da máquina). Com `limite`
+    (bytes), os blocos e as partições são dimensionados para que os que
+    estão sendo processados ao mesmo tempo caibam no orçamento.
+
+    Retorna (duplicada, em_grupo), como `memoria.analisar_duplicatas`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    linhas, colunas = df.shape
+    processos = max(1, processos or processos_padrao())
+    herda = processos == 1 or herda_memoria()
+    em_uso = estimar_bytes(df)
+    bytes_por_linha = em_uso / max(linhas, 1) + colunas * BYTES_POR_CELULA_DEDUP
+
+    mistas = _colunas_mistas(df)
+    bloco = LINHAS_POR_TAREFA
+    if limite is not None:
+        livre = max(limite - em_uso - linhas * 8, 0) / processos
+        bloco = max(min(bloco, int(livre // bytes_por_linha)), LINHAS_BLOCO_MINIMO)
+    inicios = range(0, linhas, bloco)
+
+    _compartilhado.update(df=df, mistas=mistas)
+    executor = _criar_executor(processos, herda) if processos > 1 else None
+    try:
+        # 1. Impressões digitais por bloco de linhas
+        if herda:
+            tarefas = ((None, None, inicio, min(inicio + bloco, linhas)) for inicio in inicios)
+        else:
+            tarefas = ((df.iloc[inicio:inicio + bloco], {col: c[inicio:inicio + bloco] for col, c in mistas.items()},
+                        inicio, min(inicio + bloco, linhas)) for inicio in inicios)
+        chaves = np.concatenate(_executar(executor, _tarefa_chaves, tarefas, processos) or
+                                [np.empty(0, dtype=np.uint64)])
+
+        # 2. Candidatas: impressões digitais que se repetem
+        duplicada = np.zeros(linhas, dtype=bool)
+        em_grupo = np.zeros(linhas, dtype=bool)
+        candidatas = np.flatnonzero(pd.Series(chaves).duplicated(keep=False).to_numpy())
+        if len(candidatas) == 0:
+            return duplicada, em_grupo
+
+        # 3. Partições pelo resto da impressão; dentro de cada uma, ordem original
+        particoes = processos * PARTICOES_POR_PROCESSO if processos > 1 else 1
+        if limite is not None:
+            particoes = max(particoes, -(-len(candidatas) // bloco))
+        chaves = chaves[candidatas]
+        if particoes == 1:
+            grupos = [np.arange(len(candidatas))]
+        else:
+            particao = chaves % np.uint64(particoes)
+            ordem = np.argsort(particao, kind="stable")
+            fronteiras = np.searchsorted(particao[ordem], np.arange(particoes + 1, dtype=np.uint64))
+            grupos = [ordem[a:b] for a, b in zip(fronteiras[:-1], fronteiras[1:]) if b > a]
+        if executor is not None:
+            print(f"   ⚡ Deduplicação paralela: {processos} processos, {len(grupos)} partição(ões), "
+                  f"{len(candidatas):,} linha(s) candidata(s)")
+        elif limite is not None:
+            print(f"   🧠 Conferência em {len(grupos)} partição(ões) (orçamento {formatar_tamanho(limite)})")
+
+        # 4. Conferência exata de cada partição
+        if herda:
+            tarefas = ((None, candidatas[grupo], chaves[grupo]) for grupo in grupos)
+        else:
+            tarefas = ((df.take(candidatas[grupo]), None, chaves[grupo]) for grupo in grupos)
+        for grupo, (dup, em) in zip(grupos, _executar(executor, _tarefa_particao, tarefas, processos)):
+            duplicada[candidatas[grupo]] = dup
+            em_grupo[candidatas[grupo]] = em
+        return duplicada, em_grupo
+    finally:
+        _compartilhado.clear()
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,80 @@
+from pathlib import Path
+from datetime import datetime
+
+from planilhas.esquema import PAPEL_CNPJ, PAPEL_CPF, RegistroEsquemas
+from planilhas.leitura import listar_planilhas, ler_planilha, nome_sem_extensao
+
+
+def normalizar_documentos_planilhas(pasta_input="input", pasta_output="output", caminho_esquemas=None,
+                                    mascarar=False):
+    """
+    Normaliza as colunas de CPF e CNPJ das planilhas: só os dígitos, com os
+    zeros à esquerda recompostos (11 e 14 dígitos), ou com a máscara padrão
+    se `mascarar`. Os dígitos verificadores são conferidos e os inválidos
+    contados. Lê da pasta de entrada (padrão 'input') e salva na pasta de
+    saída (padrão 'output'), usando os dtypes do registro de esquemas.
+    """
+
+    pasta_input = Path(pasta_input)
+    pasta_output = Path(pasta_output)
+    pasta_output.mkdir(exist_ok=True)
+
+    print("=" * 70)
+    print("🪪 NORMALIZADOR DE DOCUMENTOS - CPF E CNPJ")
+    print("=" * 70)
+    if mascarar:
+        print("Formato: 000.000.000-00 (CPF) e 00.000.000/0000-00 (CNPJ)")
+    else:
+        print("Formato: 00000000000 (CPF) e 00000000000000 (CNPJ)")
+    print("=" * 70)
+
+    arquivos_excel = listar_planilhas(pasta_input)
+
+    if not arquivos_excel:
+        print(f"\n❌ Nenhuma planilha encontrada na pasta '{pasta_input}'")
+        return
+
+    # pandas só é importado quando há planilhas para processar
+    from planilhas.normalizacao import normalizar_documento
+
+    registro = RegistroEsquemas(caminho_esquemas)
+
+    print(f"\n📂 Encontradas {len(arquivos_excel)} planilha(s) para processar\n")
+
+    for arquivo in arquivos_excel:
+        try:
+            print(f"📖 Processando: {arquivo.name}")
+
+            df, esquema = ler_planilha(arquivo, registro)
+            print(f"   ✓ {len(df)} linhas carregadas")
+
+            colunas = esquema.colunas_do_papel(PAPEL_CPF, PAPEL_CNPJ)
+            if not colunas:
+                print(f"   ⚠️  Nenhuma coluna de CPF ou CNPJ identificada")
+                print(f"   Colunas disponíveis: {', '.join(df.columns.tolist())}")
+                print(f"   💡 Renomeie a coluna para 'cpf' ou 'cnpj' (ou similar)")
+
+            for col in colunas:
+                papel = esquema.papeis[col]
+                df[col], normalizados, invalidos = normalizar_documento(df[col], papel, mascarar)
+                print(f"   🔍 '{col}' ({papel.upper()}): {normalizados:,} normalizado(s), "
+                      f"{invalidos:,} inválido(s)")
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nome_saida = nome_sem_extensao(arquivo) + f"_documentos_{timestamp}.xlsx"
+            arquivo_saida = pasta_output / nome_saida
+
+            print(f"   💾 Salvando: {nome_saida}")
+            df.to_excel(arquivo_saida, index=False)
+
+            print(f"   ✅ Concluído!\n")
+
+        except Exception as e:
+            print(f"   ❌ Erro ao processar {arquivo.name}: {e}\n")
+
+    registro.salvar()
+
+    print("=" * 70)
+    print("✅ Processamento finalizado!")
+    print(f"📊 Arquivo(s) salvo(s) em: {pasta_output.absolute()}")
+    print("=" * 70)
@@ -0,0 +1,226 @@
+"""
+Registro de esquemas de planilhas, indexado pela assinatura do cabeçalho.
+
+Na primeira vez que um layout de colunas aparece, os papéis das colunas
+(processo, CPF, CNPJ, protocolo, data, texto livre) são identificados por uma
+regra única e o mapa completo de dtypes é aprendido. Todo arquivo seguinte com
+o mesmo cabeçalho é lido com os dtypes já fixados, sem inferência do pandas.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+# Papéis de coluna reconhecidos
+PAPEL_PROCESSO = "processo"
+PAPEL_CPF = "cpf"
+PAPEL_CNPJ = "cnpj"
+PAPEL_PROTOCOLO = "protocolo"
+PAPEL_DATA = "data"
+PAPEL_TEXTO = "texto"
+PAPEL_OUTRO = "outro"
+
+# Papéis que sempre são lidos como texto (preserva zeros à esquerda)
+PAPEIS_TEXTO_FIXO = (PAPEL_PROCESSO, PAPEL_CPF, PAPEL_CNPJ, PAPEL_PROTOCOLO)
+
+# dtype gravado no registro para colunas de texto
+DTYPE_TEXTO = "str"
+
+CAMINHO_PADRAO = Path.home() / ".planilhas" / "esquemas.json"
+
+# Colunas com "processo" no nome que descrevem o processo, mas não são o
+# número dele (tipo_de_processo, data_do_processo, qtd_processos...)
+_RE_ATRIBUTO_PROCESSO = re.compile(
+    r"(^|_)(tipo|classe|assunto|fase|situacao|status|natureza|data|dt|valor|vara|orgao|juizo|"
+    r"parte|partes|autor|reu|advogado|qtd|quantidade|total|andamento|movimentacao)"
+    r"_((do|de|da|dos|das)_)?processo"
+)
+_RE_DATA = re.compile(r"(^|_)(data|dt)(_|$)")
+
+
+def normalizar_nome(coluna):
+    """
+    Normaliza o nome de uma coluna para comparação:
+    minúsculas, sem acentos e com separadores trocados por '_'.
+    Exemplo: '04 - NrProcesso (short text)' → '04_nrprocesso_short_text'
+    """
+    nome = unicodedata.normalize("NFKD", str(coluna))
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", "_", nome.lower()).strip("_")
+
+
+def identificar_papel(coluna):
+    """
+    Identifica o papel de uma coluna apenas pelo nome.
+    Esta é a única regra de detecção usada por todas as ferramentas.
+    """
+    nome = normalizar_nome(coluna)
+    if "cpf" in nome:
+        return PAPEL_CPF
+    if "cnpj" in nome:
+        return PAPEL_CNPJ
+    if "processo" in nome and not _RE_ATRIBUTO_PROCESSO.search(nome):
+        return PAPEL_PROCESSO
+    if "protocolo" in nome:
+        return PAPEL_PROTOCOLO
+    if _RE_DATA.search(nome):
+        return PAPEL_DATA
+    return PAPEL_OUTRO
+
+
+def assinatura_cabecalho(colunas):
+    """
+    Gera a assinatura (hash) de um cabeçalho a partir dos nomes das colunas, em ordem.
+    """
+    conteudo = "\x1f".join(str(c) for c in colunas)
+    return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()[:16]
+
+
+class Esquema:
+    """
+    Layout de uma planilha: colunas, papéis e dtypes fixados para leitura.
+    """
+
+    def __init__(self, colunas, papeis, dtypes, datas):
+        self.colunas = list(colunas)
+        self.papeis = dict(papeis)
+        self.dtypes = dict(dtypes)
+        self.datas = list(datas)
+
+    @property
+    def assinatura(self):
+        return assinatura_cabecalho(self.colunas)
+
+    def coluna_do_papel(self, papel):
+        """
+        Retorna a primeira coluna com o papel informado, ou None.
+        """
+        for col in self.colunas:
+            if self.papeis.get(col) == papel:
+                return col
+        return None
+
+    def colunas_do_papel(self, *papeis):
+        return [col for col in self.colunas if self.papeis.get(col) in papeis]
+
+    def dtypes_leitura(self):
+        """
+        Mapa de dtypes no formato aceito por `pd.read_excel(dtype=...)`.
+        """
+        return {col: (str if dtype == DTYPE_TEXTO else dtype) for col, dtype in self.dtypes.items()}
+
+    def para_dict(self):
+        return {
+            "colunas": self.colunas,
+            "papeis": self.papeis,
+            "dtypes": self.dtypes,
+            "datas": self.datas,
+        }
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(dados["colunas"], dados["papeis"], dados["dtypes"], dados["datas"])
+
+    @classmethod
+    def papeis_iniciais(cls, colunas):
+        """
+        Papéis detectados só pelo nome, antes de conhecer os dados.
+        """
+        return {col: identificar_papel(col) for col in colunas}
+
+    @classmethod
+    def aprender(cls, df):
+        """
+        Cria o esquema a partir de uma primeira leitura do arquivo.
+        Colunas de identificação e colunas de objeto viram texto; números
+        inteiros usam o tipo anulável Int64 para aceitar células vazias.
+        """
+        import pandas as pd
+
+        papeis = cls.papeis_iniciais(df.columns)
+        dtypes = {}
+        datas = []
+        for col in df.columns:
+            serie = df[col]
+            papel = papeis[col]
+            if papel in PAPEIS_TEXTO_FIXO:
+                dtypes[col] = DTYPE_TEXTO
+            elif pd.api.types.is_datetime64_any_dtype(serie):
+                papeis[col] = PAPEL_DATA
+                datas.append(col)
+            elif pd.api.types.is_bool_dtype(serie):
+                dtypes[col] = "boolean"
+            elif pd.api.types.is_integer_dtype(serie):
+                dtypes[col] = "Int64"
+            elif pd.api.types.is_float_dtype(serie):
+                dtypes[col] = "float64"
+            else:
+                # Datas sem formatação de data no Excel chegam como texto
+                if papel != PAPEL_DATA:
+                    papeis[col] = PAPEL_TEXTO
+                dtypes[col] = DTYPE_TEXTO
+        return cls(df.columns, papeis, dtypes, datas)
+
+
+class RegistroEsquemas:
+    """
+    Registro persistente (JSON) de esquemas, indexado pela assinatura do cabeçalho.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = Path(caminho) if caminho else CAMINHO_PADRAO
+        self._esquemas = {}
+        self._alterado = False
+        if self.caminho.exists():
+            try:
+                dados = json.loads(self.caminho.read_text(encoding="utf-8"))
+                self._esquemas = {k: Esquema.de_dict(v) for k, v in dados.items()}
+            except (ValueError, KeyError) as e:
+                print(f"   ⚠️  Registro de esquemas inválido em '{self.caminho}', recriando: {e}")
+
+    def __len__(self):
+        return len(self._esquemas)
+
+    def obter(self, colunas):
+        """
+        Esquema registrado para o cabeçalho, ou None. Esquemas aprendidos com
+        uma regra de papéis anterior, em que uma coluna de identificação não
+        foi fixada como texto, são descartados para serem aprendidos de novo.
+        """
+        esquema = self._esquemas.get(assinatura_cabecalho(colunas))
+        if esquema is not None:
+            for col in esquema.colunas:
+                papel = identificar_papel(col)
+                if papel in PAPEIS_TEXTO_FIXO and esquema.papeis.get(col) != papel:
+                    return None
+        return esquema
+
+    def registrar(self, esquema):
+        self._esquemas[esquema.assinatura] = esquema
+        self._alterado = True
+
+    def salvar(self):
+        """
+        Grava o registro se houve alguma alteração (escrita atômica).
+        """
+        if not self._alterado:
+            return
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho.with_suffix(".tmp")
+        dados = {k: v.para_dict() for k, v in self._esquemas.items()}
+        temporario.write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding="utf-8")
+        temporario.replace(self.caminho)
+        self._alterado = False
+
+
+def coluna_do_papel(colunas, papel):
+    """
+    Retorna a primeira coluna cujo nome indica o papel informado, ou None.
+    Útil para DataFrames já consolidados, que não têm um esquema único.
+    """
+    for col in colunas:
+        if identificar_papel(col) == papel:
+            return col
+    return None
@@ -0,0 +1,285 @@
+import os
+import time
+from pathlib import Path
+from datetime import datetime
+
+from planilhas.esquema import PAPEIS_TEXTO_FIXO, RegistroEsquemas, identificar_papel
+from planilhas.leitura import listar_planilhas, ler_planilha
+
+def juntar_planilhas(pasta_planilhas="Planilhas", pasta_resultados="Resultados", caminho_esquemas=None,
+                     max_memoria=None, processos=None, caminho_sinonimos=None):
+    """
+    Junta todas as planilhas Excel da pasta de entrada (padrão 'Planilhas') e
+    exporta o resultado consolidado na pasta de resultados (padrão 'Resultados').
+    
+    Recursos:
+    - Força CPF e Número do Processo como texto (preserva zeros à esquerda)
+    - Lê cada layout com os dtypes fixados pelo registro de esquemas
+    - Alinha as colunas do mesmo campo com nomes diferentes entre os arquivos
+      (ex.: 'Nr_Processo' e 'numero_processo'), com o mapa de sinônimos
+    - Adiciona rastreamento de origem (arquivo fonte) no terminal
+    - Remove duplicatas exatas (em blocos, se passar do orçamento `max_memoria`,
+      e em `processos` processos nas tabelas grandes)
+    - Gera relatório de qualidade (JSON e HTML) junto com o resultado
+    """
+    
+    # Define os diretórios
+    pasta_planilhas = Path(pasta_planilhas)
+    pasta_resultados = Path(pasta_resultados)
+    
+    # Cria a pasta de resultados se não existir
+    pasta_resultados.mkdir(exist_ok=True)
+    
+    # Lista todas as planilhas (Excel e CSV) na pasta Planilhas
+    arquivos_excel = listar_planilhas(pasta_planilhas)
+    
+    if not arquivos_excel:
+        print(f"❌ Nenhuma planilha encontrada na pasta '{pasta_planilhas}'")
+        return
+    
+    # pandas só é importado quando há planilhas para processar
+    import numpy as np
+    import pandas as pd
+    from planilhas.alinhamento import AlinhadorColunas
+    from planilhas.memoria import analisar_duplicatas, formatar_tamanho, interpretar_tamanho
+    from planilhas.perfil import PerfilQualidade
+    from planilhas.repetidos import estimar_economia, imprimir_repetidos, separar_repetidos
+    from planilhas.sanitizacao import sanitizar_texto
+    
+    registro = RegistroEsquemas(caminho_esquemas)
+    limite = interpretar_tamanho(max_memoria) if isinstance(max_memoria, str) else max_memoria
+    if limite:
+        print(f"🧠 Orçamento de memória: {formatar_tamanho(limite)}")
+    
+    print(f"📂 Encontradas {len(arquivos_excel)} planilha(s):")
+    for arquivo in arquivos_excel:
+        print(f"   - {arquivo.name}")
+    
+    # Arquivos repetidos (a mesma exportação salva duas vezes) não são lidos
+    arquivos_excel, repetidos = separar_repetidos(arquivos_excel)
+    imprimir_repetidos(repetidos)
+    
+    # Lista para armazenar os DataFrames
+    dataframes = []
+    
+    # Rastreamento de origem: quantas linhas vieram de cada arquivo
+    rastreamento = []
+    
+    # Lê cada planilha
+    inicio_leitura = time.perf_counter()
+    for arquivo in arquivos_excel:
+        try:
+            print(f"\n📖 Lendo: {arquivo.name}")
+            
+            # Lê o arquivo com todos os dtypes fixados pelo esquema
+            # (CPF, CNPJ, Processo e Protocolo sempre como texto)
+            df, esquema = ler_planilha(arquivo, registro)
+            protegidas = esquema.colunas_do_papel(*PAPEIS_TEXTO_FIXO)
+            if protegidas:
+                print(f"   🔒 Colunas travadas como texto: {protegidas}")
+            
+            print(f"   ✓ {len(df)} linhas carregadas")
+            
+            # Adiciona rastreamento de origem (apenas para log interno)
+            rastreamento.append((arquivo.name, len(df)))
+            
+            dataframes.append(df)
+            
+        except Exception as e:
+            print(f"   ❌ Erro ao ler {arquivo.name}: {e}")
+    
+    registro.salvar()
+    tempo_leitura = time.perf_counter() - inicio_leitura
+    economia = estimar_economia(repetidos, arquivos_excel, tempo_leitura)
+    if repetidos:
+        print(f"\n⏱️  Leitura evitada dos arquivos repetidos: ~{economia:.1f} s")
+    
+    if not dataframes:
+        print("\n❌ Nenhuma planilha foi carregada com sucesso")
+        return
+    
+    # Colunas do mesmo campo com grafias diferentes viram uma só antes de
+    # juntar (senão o concat cria uma coluna quase vazia para cada grafia)
+    print("\n🔗 Alinhando colunas...")
+    alinhador = AlinhadorColunas(caminho_sinonimos)
+    alinhador.alinhar_tabelas(dataframes, [nome for nome, _ in rastreamento])
+    alinhador.imprimir_relatorio(len(dataframes))
+    
+    # Junta todas as planilhas
+    print("\n🔄 Juntando planilhas...")
+    df_consolidado = pd.concat(dataframes, ignore_index=True)
+    # As planilhas lidas não são mais usadas depois de juntadas
+    del dataframes, df
+    
+    # Colunas protegidas como texto, já com os nomes alinhados
+    colunas_texto = [col for col in df_consolidado.columns if identificar_papel(col) in PAPEIS_TEXTO_FIXO]
+    
+    print(f"   ✓ Total antes da remoção de duplicatas: {len(df_consolidado)} linhas")
+    
+    # Remove duplicatas exatas e identifica quais eram
+    linhas_antes = len(df_consolidado)
+    
+    # Identifica duplicatas antes de remover (uma única análise dá as linhas
+    # a remover e as linhas de cada grupo)
+    duplicada, em_grupo = analisar_duplicatas(df_consolidado, limite, processos)
+    duplicadas = df_consolidado.take(np.flatnonzero(em_grupo))
+    
+    if len(duplicadas) > 0:
+        print(f"\n🔍 ANÁLISE DE DUPLICATAS:")
+        print("=" * 70)
+        
+        # Agrupa duplicatas idênticas
+        grupos_duplicados = duplicadas.groupby(list(duplicadas.columns), dropna=False)
+        
+        print(f"   Total de linhas duplicadas: {len(duplicadas)}")
+        print(f"   Grupos de duplicatas encontrados: {len(grupos_duplicados)}")
+        print()
+        
+        # Mostra detalhes dos grupos duplicados
+        for i, (valores, grupo) in enumerate(grupos_duplicados, 1):
+            if i <= 5:  # Mostra apenas os primeiros 5 grupos para não poluir o terminal
+                print(f"   Grupo {i}: {len(grupo)} ocorrências")
+                
+                # Pega a primeira linha do grupo para mostrar como amostra
+                linha_amostra = grupo.iloc[0]
+                
+                # Mostra uma amostra dos dados duplicados (primeiras 3 colunas)
+                colunas_amostra = df_consolidado.columns[:3].tolist()
+                amostra_dict = {}
+                for col in colunas_amostra:
+                    valor = linha_amostra[col]
+                    amostra_dict[col] = '(vazio)' if pd.isna(valor) else str(valor)[:50]  # Limita a 50 caracteres
+                
+                print(f"   Amostra: {amostra_dict}")
+                print()
+        
+        if len(grupos_duplicados) > 5:
+            print(f"   ... e mais {len(grupos_duplicados) - 5} grupo(s) de duplicatas")
+            print()
+        
+        print("=" * 70)
+    
+    # Remove as duplicatas
+    del duplicadas
+    df_consolidado = df_consolidado.take(np.flatnonzero(~duplicada))
+    linhas_depois = len(df_consolidado)
+    duplicatas_removidas = linhas_antes - linhas_depois
+    
+    if duplicatas_removidas > 0:
+        print(f"\n   🗑️  Removidas {duplicatas_removidas} linha(s) duplicada(s)")
+    else:
+        print(f"\n   ✓ Nenhuma duplicata encontrada")
+    
+    print(f"   ✓ Total final: {len(df_consolidado)} linhas no arquivo consolidado")
+    
+    # Sanitização de dados (limpeza de texto)
+    print("\n🧹 Sanitizando dados...")
+    colunas_sanitizadas = 0
+    
+    # O perfil de qualidade é coletado nesta mesma passada pelas colunas
+    perfil = PerfilQualidade()
+    
+    for coluna in df_consolidado.columns:
+        # Códigos do factorize feito na sanitização, reaproveitados pelo perfil
+        fatores = None
+        # Verifica se a coluna contém texto
+        if df_consolidado[coluna].dtype == 'object':
+            try:
+                # Remove quebras de linha (\n, \r), espaços nas pontas e espaços
+                # múltiplos; células que ficam vazias voltam a ser vazias (NA)
+                # para o Excel. A limpeza é feita só nos valores distintos.
+                df_consolidado[coluna], fatores = sanitizar_texto(df_consolidado[coluna])
+                colunas_sanitizadas += 1
+            except Exception as e:
+                print(f"   ⚠️  Aviso: Não foi possível sanitizar a coluna '{coluna}': {e}")
+        
+        perfil.observar_coluna(coluna, df_consolidado[coluna], fatores=fatores)
+    
+    print(f"   ✓ {colunas_sanitizadas} coluna(s) de texto sanitizada(s)")
+    print(f"   ✓ Removidas: quebras de linha, espaços nas pontas e espaços duplos")
+    
+    # Mostra rastreamento detalhado
+    print("\n📍 RASTREAMENTO DE ORIGEM:")
+    print("=" * 70)
+    
+    # Agrupa por arquivo de origem
+    idx_global = 0
+    for arquivo_nome, linhas_deste_arquivo in rastreamento:
+        print(f"\n📄 {arquivo_nome}")
+        print(f"   Linhas no consolidado: {idx_global + 1} até {idx_global + linhas_deste_arquivo}")
+        print(f"   Total: {linhas_deste_arquivo} linhas")
+        idx_global += linhas_deste_arquivo
+    
+    print("\n" + "=" * 70)
+    
+    # Gera nome do arquivo de saída com timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    arquivo_saida = pasta_resultados / f"planilhas_consolidadas_{timestamp}.xlsx"
+    
+    # Exporta o resultado
+    print(f"\n💾 Exportando para: {arquivo_saida}")
+    df_consolidado.to_excel(arquivo_saida, index=False)
+    
+    relatorio_json, relatorio_html = perfil.salvar(pasta_resultados, f"qualidade_{timestamp}")
+    print(f"   📋 Relatório de qualidade: {relatorio_json.name} / {relatorio_html.name}")
+    
+    print(f"\n✅ Processo concluído com sucesso!")
+    
+    # Resumo detalhado final
+    print("\n" + "=" * 70)
+    print("📊 RESUMO DETALHADO DO PROCESSAMENTO")
+    print("=" * 70)
+    
+    print(f"\n📁 Arquivos processados:")
+    print(f"   • Total de arquivos lidos: {len(arquivos_excel)}")
+    if repetidos:
+        print(f"   • Arquivos repetidos ignorados: {len(repetidos)} (~{economia:.1f} s economizados)")
+    
+    print(f"\n📈 Estatísticas de linhas:")
+    print(f"   • Linhas antes da deduplicação: {linhas_antes:,}")
+    print(f"   • Linhas removidas (duplicatas): {duplicatas_removidas:,}")
+    print(f"   • Linhas finais no arquivo: {len(df_consolidado):,}")
+    print(f"   • Taxa de deduplicação: {(duplicatas_removidas/linhas_antes*100) if linhas_antes > 0 else 0:.2f}%")
+    
+    print(f"\n📋 Estrutura dos dados:")
+    print(f"   • Total de colunas: {len(df_consolidado.columns)}")
+    if alinhador.renomeadas:
+        print(f"   • Colunas renomeadas no alinhamento: {len(alinhador.renomeadas)}")
+    if alinhador.nao_alinhadas:
+        print(f"   • Colunas não mapeadas (ausentes em algum arquivo): {len(alinhador.nao_alinhadas)}")
+    print(f"   • Colunas: {', '.join(df_consolidado.columns[:5].tolist())}")
+    if len(df_consolidado.columns) > 5:
+        print(f"     ... e mais {len(df_consolidado.columns) - 5} coluna(s)")
+    
+    print(f"\n🔒 Proteção de dados:")
+    if colunas_texto:
+        print(f"   • Colunas protegidas como texto: {len(colunas_texto)}")
+        for col in colunas_texto:
+            print(f"     - {col}")
+    else:
+        print(f"   • Nenhuma coluna protegida (CPF/CNPJ/Processo não detectados)")
+    
+    print(f"\n🧹 Sanitização aplicada:")
+    print(f"   • Colunas de texto sanitizadas: {colunas_sanitizadas}")
+    print(f"   • Limpezas realizadas:")
+    print(f"     - Quebras de linha removidas (\\n, \\r)")
+    print(f"     - Espaços nas pontas removidos (strip)")
+    print(f"     - Espaços múltiplos normalizados")
+    
+    # Informações sobre células vazias (já coletadas pelo perfil)
+    total_celulas = perfil.total_celulas
+    celulas_vazias = perfil.celulas_vazias
+    print(f"\n📊 Qualidade dos dados:")
+    print(f"   • Total de células: {total_celulas:,}")
+    print(f"   • Células vazias: {celulas_vazias:,}")
+    print(f"   • Taxa de preenchimento: {((total_celulas - celulas_vazias)/total_celulas*100) if total_celulas > 0 else 0:.2f}%")
+    for nome, coluna_perfil in perfil.colunas.items():
+        if coluna_perfil.invalidos:
+            print(f"   • Valores inválidos em '{nome}' ({coluna_perfil.papel}): {coluna_perfil.invalidos:,}")
+    
+    print(f"\n💾 Arquivo de saída:")
+    print(f"   • Nome: {arquivo_saida.name}")
+    print(f"   • Caminho: {arquivo_saida}")
+    print(f"   • Tamanho estimado: ~{os.path.getsize(arquivo_saida) / 1024 / 1024:.2f} MB")
+    
+    print("\n" + "=" * 70)
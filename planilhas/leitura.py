@@ -0,0 +1,282 @@
+"""
+Listagem e leitura de planilhas com dtypes fixados pelo registro de esquemas.
+
+Além de Excel (.xlsx e .xls), as ferramentas aceitam exportações em CSV/TSV,
+inclusive compactadas (.gz, .bz2, .xz, .zip). A codificação (UTF-8 ou
+Windows-1252/Latin-1) e o separador (';', ',', tabulação ou '|') são
+detectados no começo do arquivo, e a leitura usa o leitor de CSV do pyarrow
+(em várias threads e por colunas) quando ele está instalado.
+"""
+
+import bz2
+import codecs
+import csv
+import gzip
+import importlib.util
+import io
+import lzma
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from planilhas.esquema import DTYPE_TEXTO, PAPEIS_TEXTO_FIXO, Esquema
+
+EXTENSOES_EXCEL = (".xlsx", ".xls")
+EXTENSOES_CSV = (".csv", ".tsv")
+EXTENSOES_COMPRESSAO = (".gz", ".bz2", ".xz", ".zip")
+
+# Bytes do começo do arquivo usados para detectar codificação e separador
+BYTES_AMOSTRA = 64 * 1024
+
+SEPARADORES = (";", ",", "\t", "|")
+
+# Linhas da amostra em que o separador é conferido
+LINHAS_SEPARADOR = 50
+
+_ABRIR_COMPRIMIDO = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def listar_planilhas(pasta):
+    """
+    Lista as planilhas de uma pasta: Excel (.xlsx e .xls) e CSV/TSV, também
+    compactados.
+    """
+    pasta = Path(pasta)
+    arquivos = list(pasta.glob("*.xlsx")) + list(pasta.glob("*.xls"))
+    for extensao in EXTENSOES_CSV:
+        arquivos += list(pasta.glob(f"*{extensao}"))
+        for compressao in EXTENSOES_COMPRESSAO:
+            arquivos += list(pasta.glob(f"*{extensao}{compressao}"))
+    return arquivos
+
+
+def eh_csv(arquivo):
+    """
+    Indica se o arquivo é um CSV/TSV (compactado ou não).
+    """
+    sufixos = [s.lower() for s in Path(arquivo).suffixes[-2:]]
+    if sufixos and sufixos[-1] in EXTENSOES_COMPRESSAO:
+        sufixos.pop()
+    return bool(sufixos) and sufixos[-1] in EXTENSOES_CSV
+
+
+def nome_sem_extensao(arquivo):
+    """
+    Nome do arquivo sem a extensão da planilha nem a da compressão.
+    Exemplo: 'processos.csv.gz' → 'processos'
+    """
+    nome = Path(arquivo).name
+    if eh_csv(arquivo):
+        for compressao in EXTENSOES_COMPRESSAO:
+            if nome.lower().endswith(compressao):
+                nome = nome[:-len(compressao)]
+    return Path(nome).stem
+
+
+@contextmanager
+def _abrir_binario(arquivo):
+    """
+    Abre o arquivo já descompactado, em modo binário. De um .zip é lido o
+    primeiro arquivo do pacote.
+    """
+    arquivo = Path(arquivo)
+    compressao = arquivo.suffix.lower()
+    if compressao == ".zip":
+        with zipfile.ZipFile(arquivo) as pacote:
+            membros = [m for m in pacote.namelist() if not m.endswith("/")]
+            if not membros:
+                raise ValueError(f"{arquivo.name} não contém nenhum arquivo")
+            with pacote.open(membros[0]) as entrada:
+                yield entrada
+        return
+    abrir = _ABRIR_COMPRIMIDO.get(compressao, open)
+    with abrir(arquivo, "rb") as entrada:
+        yield entrada
+
+
+def detectar_formato(arquivo):
+    """
+    Detecta a codificação e o separador de um CSV pelo começo do arquivo.
+    Retorna (codificacao, separador).
+    """
+    with _abrir_binario(arquivo) as entrada:
+        amostra = entrada.read(BYTES_AMOSTRA)
+
+    if amostra.startswith(codecs.BOM_UTF8):
+        codificacao = "utf-8-sig"
+    else:
+        try:
+            # final=False: um caractere cortado no fim da amostra não é erro
+            codecs.getincrementaldecoder("utf-8")().decode(amostra, final=False)
+            codificacao = "utf-8"
+        except UnicodeDecodeError:
+            # Exportações de sistemas Windows; cp1252 não define 5 bytes, que
+            # só existem em Latin-1 puro
+            try:
+                amostra.decode("cp1252")
+                codificacao = "cp1252"
+            except UnicodeDecodeError:
+                codificacao = "latin-1"
+
+    texto = amostra.decode(codificacao, errors="replace")
+    # A última linha de uma amostra cortada pode estar incompleta
+    separador = _escolher_separador(texto, completo=len(amostra) < BYTES_AMOSTRA)
+    if separador is None:
+        separador = "\t" if ".tsv" in [s.lower() for s in Path(arquivo).suffixes] else ","
+    return codificacao, separador
+
+
+def _escolher_separador(texto, completo=True):
+    """
+    Escolhe o separador que divide as linhas da amostra no mesmo número de
+    campos do cabeçalho (respeitando as aspas); entre os que empatam, o que
+    dá mais campos. Contar só no cabeçalho erra quando os nomes das colunas
+    têm vírgulas, como em 'Réu (nome, CPF);Valor'.
+    Retorna None se nenhum separador divide o cabeçalho.
+    """
+    pontuacoes = {}
+    for separador in SEPARADORES:
+        try:
+            linhas = [linha for _, linha in zip(range(LINHAS_SEPARADOR + 1),
+                                                csv.reader(io.StringIO(texto), delimiter=separador)) if linha]
+        except csv.Error:
+            continue
+        if not completo and len(linhas) > 1:
+            linhas.pop()
+        if not linhas or len(linhas[0]) < 2:
+            continue
+        campos = len(linhas[0])
+        iguais = sum(len(linha) == campos for linha in linhas) / len(linhas)
+        pontuacoes[separador] = (iguais, campos)
+    if not pontuacoes:
+        return None
+    return max(pontuacoes, key=pontuacoes.get)
+
+
+def ler_cabecalho(arquivo):
+    """
+    Lê só o cabeçalho de uma planilha e retorna a lista de colunas.
+    """
+    if eh_csv(arquivo):
+        codificacao, separador = detectar_formato(arquivo)
+        with _abrir_binario(arquivo) as entrada:
+            linhas = codecs.getreader(codificacao)(entrada, errors="replace")
+            return next(csv.reader(linhas, delimiter=separador), [])
+
+    import pandas as pd
+
+    return pd.read_excel(arquivo, nrows=0).columns.tolist()
+
+
+def _ler_csv(arquivo, dtype=None, datas=None):
+    """
+    Lê um CSV com os dtypes informados. Colunas de texto são lidas como texto
+    pelo próprio leitor (zeros à esquerda de CPF, CNPJ e processo preservados).
+    """
+    import pandas as pd
+
+    codificacao, separador = detectar_formato(arquivo)
+    dtype = dtype or {}
+    datas = datas or []
+
+    if importlib.util.find_spec("pyarrow") is None:
+        try:
+            with _abrir_binario(arquivo) as entrada:
+                return pd.read_csv(entrada, sep=separador, encoding=codificacao, dtype=dtype or None,
+                                   parse_dates=datas or False)
+        except UnicodeDecodeError:
+            if codificacao != "utf-8":
+                raise
+            with _abrir_binario(arquivo) as entrada:
+                return pd.read_csv(entrada, sep=separador, encoding="cp1252", dtype=dtype or None,
+                                   parse_dates=datas or False)
+
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    texto = {col for col, tipo in dtype.items() if tipo is str}
+
+    def ler(codificacao):
+        with _abrir_binario(arquivo) as entrada:
+            return pa_csv.read_csv(
+                entrada,
+                read_options=pa_csv.ReadOptions(encoding=codificacao, use_threads=True),
+                parse_options=pa_csv.ParseOptions(delimiter=separador),
+                convert_options=pa_csv.ConvertOptions(column_types={col: pa.string() for col in texto},
+                                                      strings_can_be_null=True),
+            )
+
+    # A amostra pode parecer UTF-8 e haver bytes Windows-1252 mais adiante:
+    # nas colunas de texto fixadas isso é um erro, nas demais o pyarrow
+    # devolve a coluna como binária
+    try:
+        tabela = ler(codificacao)
+        binaria = any(pa.types.is_binary(campo.type) for campo in tabela.schema)
+    except pa.ArrowInvalid as e:
+        if codificacao != "utf-8" or "UTF8" not in str(e):
+            raise
+        binaria = True
+    if binaria and codificacao == "utf-8":
+        tabela = ler("cp1252")
+    # Datas sem hora (date32) viram datetime64, como na leitura do Excel
+    df = tabela.to_pandas(date_as_object=False)
+    del tabela
+
+    outros = {col: tipo for col, tipo in dtype.items() if col not in texto and col in df.columns}
+    if outros:
+        df = df.astype(outros)
+    for col in datas:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+    return df
+
+
+def _ler(arquivo, dtype=None, datas=None):
+    if eh_csv(arquivo):
+        return _ler_csv(arquivo, dtype, datas)
+
+    import pandas as pd
+
+    return pd.read_excel(arquivo, dtype=dtype, parse_dates=datas or False)
+
+
+def ler_planilha(arquivo, registro=None, colunas=None):
+    """
+    Lê uma planilha usando o esquema registrado para o seu cabeçalho.
+
+    Se o cabeçalho já é conhecido, todos os dtypes são passados ao pandas na
+    leitura (sem inferência). Se é novo, o arquivo é lido uma vez com as
+    colunas de identificação como texto, o esquema é aprendido e registrado.
+
+    Se o cabeçalho já foi lido (`ler_cabecalho`), ele pode ser passado em
+    `colunas` para não ser lido de novo.
+
+    Retorna (DataFrame, Esquema).
+    """
+    import pandas as pd
+
+    if colunas is None:
+        colunas = ler_cabecalho(arquivo)
+    esquema = registro.obter(colunas) if registro is not None else None
+
+    if esquema is not None:
+        try:
+            df = _ler(arquivo, esquema.dtypes_leitura(), esquema.datas)
+            return df, esquema
+        except (ValueError, TypeError) as e:
+            print(f"   ⚠️  Esquema registrado não serve para {Path(arquivo).name} ({e}), reaprendendo")
+
+    papeis = Esquema.papeis_iniciais(colunas)
+    dtype = {col: str for col, papel in papeis.items() if papel in PAPEIS_TEXTO_FIXO}
+    df = _ler(arquivo, dtype or None)
+    esquema = Esquema.aprender(df)
+
+    # Colunas de texto com valores mistos só nesta primeira leitura; as
+    # próximas já chegam como texto direto do leitor
+    for col, tipo in esquema.dtypes.items():
+        if tipo == DTYPE_TEXTO and col not in dtype and pd.api.types.infer_dtype(df[col], skipna=True) != "string":
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+
+    if registro is not None:
+        registro.registrar(esquema)
+    return df, esquema
@@ -0,0 +1,128 @@
+import re
+from pathlib import Path
+from datetime import datetime
+
+from planilhas.esquema import PAPEL_PROCESSO, RegistroEsquemas
+from planilhas.leitura import listar_planilhas, ler_planilha, nome_sem_extensao
+
+def aplicar_mascara_processo(numero):
+    """
+    Aplica a máscara de número de processo judicial em um único valor.
+    Formato: 0000000-00.0000.0.00.0000
+    Exemplo: 0082162-14.2016.8.09.0051
+    
+    Para colunas inteiras use `planilhas.normalizacao.mascara_processo`,
+    que é vetorizada e trata números, floats e vazios corretamente.
+    """
+    
+    # Remove qualquer caractere que não seja número
+    numero_limpo = re.sub(r'\D', '', str(numero))
+    
+    # Preenche com zeros à esquerda até completar 20 dígitos
+    numero_padded = numero_limpo.zfill(20)
+    
+    # Aplica a máscara usando regex
+    # Padrão: ^(\d{7})(\d{2})(\d{4})(\d{1})(\d{2})(\d{4})$
+    # Formato: $1-$2.$3.$4.$5.$6
+    match = re.match(r'^(\d{7})(\d{2})(\d{4})(\d{1})(\d{2})(\d{4})$', numero_padded)
+    
+    if match:
+        return f"{match.group(1)}-{match.group(2)}.{match.group(3)}.{match.group(4)}.{match.group(5)}.{match.group(6)}"
+    else:
+        # Se não conseguir aplicar a máscara, retorna o número original
+        return numero
+
+def aplicar_mascara_planilhas(pasta_input="input", pasta_output="output", caminho_esquemas=None):
+    """
+    Aplica máscara de número de processo em planilhas.
+    Lê arquivos da pasta de entrada (padrão 'input') e salva na pasta de
+    saída (padrão 'output'), usando os dtypes do registro de esquemas.
+    """
+    
+    # Define os diretórios
+    pasta_input = Path(pasta_input)
+    pasta_output = Path(pasta_output)
+    
+    # Cria a pasta de output se não existir
+    pasta_output.mkdir(exist_ok=True)
+    
+    print("=" * 70)
+    print("🎭 APLICADOR DE MÁSCARA - NÚMERO DE PROCESSO JUDICIAL")
+    print("=" * 70)
+    print("Formato: 0000000-00.0000.0.00.0000")
+    print("Exemplo: 0082162-14.2016.8.09.0051")
+    print("=" * 70)
+    
+    # Lista todas as planilhas (Excel e CSV) na pasta input
+    arquivos_excel = listar_planilhas(pasta_input)
+    
+    if not arquivos_excel:
+        print(f"\n❌ Nenhuma planilha encontrada na pasta '{pasta_input}'")
+        return
+    
+    # pandas só é importado quando há planilhas para processar
+    import pandas as pd
+    from planilhas.normalizacao import mascara_processo
+    
+    registro = RegistroEsquemas(caminho_esquemas)
+    
+    print(f"\n📂 Encontradas {len(arquivos_excel)} planilha(s) para processar\n")
+    
+    # Processa cada planilha
+    for arquivo in arquivos_excel:
+        try:
+            print(f"📖 Processando: {arquivo.name}")
+            
+            # Lê a planilha com os dtypes do esquema
+            df, esquema = ler_planilha(arquivo, registro)
+            
+            print(f"   ✓ {len(df)} linhas carregadas")
+            print(f"   ✓ {len(df.columns)} colunas encontradas")
+            
+            # Identifica a coluna de número do processo
+            coluna_processo = esquema.coluna_do_papel(PAPEL_PROCESSO)
+            
+            if coluna_processo:
+                print(f"   🔍 Coluna identificada: '{coluna_processo}'")
+                
+                # Mostra exemplo antes da transformação
+                if len(df) > 0 and pd.notna(df[coluna_processo].iloc[0]):
+                    exemplo_antes = str(df[coluna_processo].iloc[0])
+                    print(f"   📝 Exemplo ANTES: {exemplo_antes}")
+                
+                # Aplica a máscara (vetorizada, já contando as aplicadas)
+                print(f"   🎭 Aplicando máscara...")
+                df[coluna_processo], mascaras_aplicadas = mascara_processo(df[coluna_processo])
+                
+                # Mostra exemplo depois da transformação
+                if len(df) > 0:
+                    exemplo_depois = df[coluna_processo].iloc[0]
+                    print(f"   ✅ Exemplo DEPOIS: {exemplo_depois}")
+                
+                print(f"   ✓ Máscaras aplicadas: {mascaras_aplicadas}/{len(df)}")
+                
+            else:
+                print(f"   ⚠️  Nenhuma coluna de processo identificada")
+                print(f"   Colunas disponíveis: {', '.join(df.columns.tolist())}")
+                print(f"   💡 Renomeie a coluna para 'numero_processo' ou similar")
+            
+            # Gera nome do arquivo de saída
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nome_saida = nome_sem_extensao(arquivo) + f"_com_mascara_{timestamp}.xlsx"
+            arquivo_saida = pasta_output / nome_saida
+            
+            # Salva o arquivo processado
+            print(f"   💾 Salvando: {nome_saida}")
+            df.to_excel(arquivo_saida, index=False)
+            
+            print(f"   ✅ Concluído!\n")
+            
+        except Exception as e:
+            print(f"   ❌ Erro ao processar {arquivo.name}: {e}\n")
+    
+    registro.salvar()
+    
+    print("=" * 70)
+    print("✅ Processamento finalizado!")
+    print(f"📊 Arquivo(s) salvo(s) em: {pasta_output.absolute()}")
+    print("=" * 70)
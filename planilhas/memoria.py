@@ -0,0 +1,390 @@
+"""
+Orçamento de memória e chaves de linha para comparação e deduplicação.
+
+Em vez de copiar DataFrames para comparar (subconjuntos com `.copy()`, todas
+as colunas convertidas para texto e um `_id` com a linha inteira concatenada),
+as ferramentas calculam uma chave de 64 bits por linha, uma coluna por vez.
+Na comparação com a base existente, as chaves dos dados novos são calculadas
+primeiro e a base é lida arquivo por arquivo: de cada arquivo só ficam as
+linhas com a chave de alguma linha nova, conferidas valor a valor antes da
+remoção (chaves iguais não bastam, o hash de 64 bits pode colidir).
+
+Com um orçamento (`--max-memory`), o cálculo das chaves é feito em blocos de
+linhas que cabem no espaço livre, e a deduplicação troca o `duplicated` do
+pandas (que fatoriza todas as colunas de uma vez) pela comparação das chaves,
+conferindo de forma exata só as linhas candidatas a duplicata.
+"""
+
+import re
+
+_RE_TAMANHO = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*([kmgt]?)(?:i?b)?\s*$", re.IGNORECASE)
+_UNIDADES = {"": 1024 ** 2, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+# Memória temporária por linha ao calcular as chaves: chave acumulada, hash
+# da coluna e a coluna convertida (com folga para conversões em texto)
+BYTES_POR_LINHA_CHAVE = 128
+
+# Memória extra por linha da chave normalizada do processo (string de 20 dígitos)
+# ou de um CPF/CNPJ (11 ou 14 dígitos)
+BYTES_POR_LINHA_PROCESSO = 80
+
+# Memória por célula do `duplicated` do pandas (códigos + tabela de hash)
+BYTES_POR_CELULA_DEDUP = 16
+
+# Menor bloco usado quando o orçamento já está esgotado pelos dados carregados
+LINHAS_BLOCO_MINIMO = 10_000
+
+# Tipos canônicos de coluna usados no cálculo das chaves
+TIPO_NUMERO = "numero"
+TIPO_DATA = "data"
+TIPO_TEXTO = "texto"
+
+_MULTIPLICADOR = 0x100000001B3
+_SEMENTE = 0xCBF29CE484222325
+
+
+def interpretar_tamanho(texto):
+    """
+    Converte um tamanho como '512MB', '2G' ou '1.5GB' em bytes.
+    Sem unidade, o número é lido em MB.
+    """
+    encontrado = _RE_TAMANHO.match(str(texto))
+    if not encontrado:
+        raise ValueError(f"tamanho inválido: '{texto}' (use, por exemplo, 512MB ou 2GB)")
+    numero, unidade = encontrado.groups()
+    return int(float(numero.replace(",", ".")) * _UNIDADES[unidade.lower()])
+
+
+def formatar_tamanho(quantidade):
+    """
+    Formata uma quantidade de bytes para exibição (ex.: '1.50 GB').
+    """
+    for unidade, fator in (("GB", 1024 ** 3), ("MB", 1024 ** 2), ("KB", 1024)):
+        if quantidade >= fator:
+            return f"{quantidade / fator:.2f} {unidade}"
+    return f"{quantidade} B"
+
+
+def estimar_bytes(df, amostra=1000):
+    """
+    Estima a memória ocupada por um DataFrame. O tamanho das colunas de
+    objeto é medido numa amostra das primeiras linhas e extrapolado.
+    """
+    linhas = len(df)
+    if linhas == 0:
+        return int(df.memory_usage(index=False).sum())
+    if linhas <= amostra:
+        return int(df.memory_usage(index=False, deep=True).sum())
+    por_linha = df.iloc[:amostra].memory_usage(index=False, deep=True).sum() / amostra
+    return int(por_linha * linhas)
+
+
+def linhas_por_bloco(linhas, bytes_por_linha, disponivel=None):
+    """
+    Quantas linhas processar por bloco para caber em `disponivel` bytes.
+    Sem orçamento (None), tudo é processado num único bloco.
+    """
+    if disponivel is None:
+        return max(linhas, 1)
+    return max(min(linhas, int(disponivel // bytes_por_linha)), min(linhas, LINHAS_BLOCO_MINIMO), 1)
+
+
+def tipos_colunas(df, colunas):
+    """
+    Tipo canônico de cada coluna (número, data ou texto). As chaves de duas
+    tabelas só são comparáveis se calculadas com os mesmos tipos.
+    """
+    import pandas as pd
+
+    tipos = {}
+    for col in colunas:
+        serie = df[col]
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            tipos[col] = TIPO_DATA
+        elif pd.api.types.is_numeric_dtype(serie):
+            tipos[col] = TIPO_NUMERO
+        else:
+            tipos[col] = TIPO_TEXTO
+    return tipos
+
+
+def _converter_coluna(serie, tipo):
+    """
+    Converte a coluna para o tipo canônico (o vetor que entra no hash).
+    Retorna (valores, falhas): `falhas` marca valores que existiam mas não
+    puderam ser convertidos para o tipo (essas linhas nunca devem casar).
+    """
+    import numpy as np
+    import pandas as pd
+
+    falhas = None
+    if tipo == TIPO_NUMERO:
+        if not pd.api.types.is_numeric_dtype(serie):
+            convertida = pd.to_numeric(serie, errors="coerce")
+            falhas = (convertida.isna() & serie.notna()).to_numpy()
+            serie = convertida
+        # 1 e 1.0 têm a mesma chave; -0.0 + 0.0 vira 0.0
+        return serie.to_numpy(dtype="float64", na_value=np.nan) + 0.0, falhas
+    if tipo == TIPO_DATA:
+        if not pd.api.types.is_datetime64_any_dtype(serie):
+            convertida = pd.to_datetime(serie, errors="coerce")
+            falhas = (convertida.isna() & serie.notna()).to_numpy()
+            serie = convertida
+        return serie.to_numpy(dtype="datetime64[ns]"), falhas
+    if pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+        valores = serie.to_numpy(dtype=object)
+    else:
+        # Coluna numérica comparada com uma coluna de texto do outro lado
+        valores = serie.astype(str).where(serie.notna()).to_numpy(dtype=object)
+    return valores, falhas
+
+
+def _papeis_documentos(colunas, coluna_processo, documentos):
+    """
+    Colunas de CPF/CNPJ (fora a do processo) e o papel de cada uma.
+    """
+    from planilhas.esquema import identificar_papel
+    from planilhas.normalizacao import LARGURAS_DOCUMENTO
+
+    if not documentos:
+        return {}
+    papeis = {col: identificar_papel(col) for col in colunas if col != coluna_processo}
+    return {col: papel for col, papel in papeis.items() if papel in LARGURAS_DOCUMENTO}
+
+
+def _valores_coluna(serie, col, coluna_processo, papeis, tipos):
+    """
+    Valores de uma coluna na forma usada pela chave: o processo pela chave
+    canônica, CPF/CNPJ pelos dígitos e as demais no tipo de referência.
+    Retorna (valores, falhas), como `_converter_coluna`.
+    """
+    from planilhas.normalizacao import chave_documento, chave_processo
+
+    if col == coluna_processo:
+        return _converter_coluna(chave_processo(serie), TIPO_TEXTO)
+    if col in papeis:
+        return _converter_coluna(chave_documento(serie, papeis[col]), TIPO_TEXTO)
+    return _converter_coluna(serie, tipos.get(col, TIPO_TEXTO))
+
+
+def chaves_linhas(df, colunas, coluna_processo=None, tipos=None, disponivel=None, documentos=True):
+    """
+    Calcula uma chave de 64 bits por linha a partir das colunas informadas,
+    sem copiar o DataFrame. A coluna de processo entra pela chave canônica
+    de 20 dígitos e, com `documentos`, as colunas de CPF/CNPJ pelos 11 ou 14
+    dígitos sem máscara. Colunas ausentes em `df` contam como vazias.
+
+    Com `disponivel` (bytes), as linhas são processadas em blocos que cabem
+    nesse espaço. Retorna (chaves, validas): linhas com algum valor que não
+    pôde ser convertido para o tipo de referência ficam com validas=False.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if tipos is None:
+        tipos = tipos_colunas(df, [c for c in colunas if c in df.columns])
+    papeis = _papeis_documentos(colunas, coluna_processo, documentos)
+
+    linhas = len(df)
+    normalizadas = len(papeis) + (1 if coluna_processo else 0)
+    bytes_por_linha = BYTES_POR_LINHA_CHAVE + BYTES_POR_LINHA_PROCESSO * normalizadas
+    bloco = linhas_por_bloco(linhas, bytes_por_linha, disponivel)
+
+    chaves = np.empty(linhas, dtype=np.uint64)
+    validas = np.ones(linhas, dtype=bool)
+    multiplicador = np.uint64(_MULTIPLICADOR)
+
+    for inicio in range(0, linhas, bloco):
+        fim = min(inicio + bloco, linhas)
+        acumulado = np.full(fim - inicio, _SEMENTE, dtype=np.uint64)
+        for col in colunas:
+            if col in df.columns:
+                valores, falhas = _valores_coluna(df[col].iloc[inicio:fim], col, coluna_processo, papeis, tipos)
+                hashes = pd.util.hash_array(valores, categorize=True)
+                del valores
+                if falhas is not None:
+                    validas[inicio:fim] &= ~falhas
+            else:
+                # Mesmo hash de uma célula vazia do tipo de referência
+                nulo, _ = _converter_coluna(pd.Series([None], dtype=object), tipos.get(col, TIPO_TEXTO))
+                hashes = np.full(fim - inicio, pd.util.hash_array(nulo, categorize=True)[0], dtype=np.uint64)
+            acumulado *= multiplicador
+            acumulado ^= hashes
+        chaves[inicio:fim] = acumulado
+
+    return chaves, validas
+
+
+def analisar_duplicatas(df, limite=None, processos=None):
+    """
+    Marca as linhas duplicadas (mesmo critério de `df.duplicated()`).
+    Retorna (duplicada, em_grupo): `duplicada` é True para toda repetição
+    após a primeira ocorrência e `em_grupo` é True para todas as linhas de
+    um grupo de duplicatas (como `keep=False`).
+
+    Tabelas grandes são deduplicadas em `processos` processos (padrão: os
+    núcleos da máquina), com as linhas particionadas pela impressão digital
+    (ver `planilhas.deduplicacao`). Se o `duplicated` do pandas não couber
+    no orçamento `limite` (bytes), o mesmo particionamento é usado num único
+    processo, em blocos e partições que cabem no orçamento.
+    """
+    import numpy as np
+
+    from planilhas.deduplicacao import LINHAS_PARALELO, analisar_duplicatas_particionado, processos_padrao
+
+    linhas, colunas = df.shape
+    necessario = estimar_bytes(df) + linhas * colunas * BYTES_POR_CELULA_DEDUP
+    cabe = limite is None or necessario <= limite
+
+    if linhas >= LINHAS_PARALELO:
+        processos = processos or processos_padrao()
+        if processos > 1:
+            return analisar_duplicatas_particionado(df, processos, None if cabe else limite)
+
+    if cabe or linhas == 0:
+        em_grupo = df.duplicated(keep=False).to_numpy()
+        duplicada = np.zeros(linhas, dtype=bool)
+        if em_grupo.any():
+            candidatas = np.flatnonzero(em_grupo)
+            duplicada[candidatas] = df.take(candidatas).duplicated().to_numpy()
+        return duplicada, em_grupo
+
+    print(f"   🧠 Deduplicação em blocos (estimado {formatar_tamanho(necessario)} > "
+          f"orçamento {formatar_tamanho(limite)})")
+    return analisar_duplicatas_particionado(df, 1, limite)
+
+
+def valores_linhas(df, colunas, coluna_processo=None, tipos=None, documentos=True):
+    """
+    Valores das colunas na forma exata que entra em `chaves_linhas`, para
+    conferir as linhas cujas chaves coincidem. Colunas ausentes contam como
+    vazias. Retorna ({coluna: valores}, validas).
+    """
+    import numpy as np
+    import pandas as pd
+
+    if tipos is None:
+        tipos = tipos_colunas(df, [c for c in colunas if c in df.columns])
+    papeis = _papeis_documentos(colunas, coluna_processo, documentos)
+
+    valores = {}
+    validas = np.ones(len(df), dtype=bool)
+    for col in colunas:
+        serie = df[col] if col in df.columns else pd.Series([None] * len(df), dtype=object)
+        valores[col], falhas = _valores_coluna(serie, col, coluna_processo, papeis, tipos)
+        if falhas is not None:
+            validas &= ~falhas
+    return valores, validas
+
+
+def valores_iguais(a, b):
+    """
+    Compara dois vetores de `valores_linhas` posição a posição; células
+    vazias são iguais entre si. Textos são comparados como o hash os vê
+    (1 e '1' na mesma coluna de texto são o mesmo valor).
+    """
+    import numpy as np
+    import pandas as pd
+
+    nulos_a = pd.isna(a)
+    nulos_b = pd.isna(b)
+    iguais = nulos_a & nulos_b
+    ambos = ~(nulos_a | nulos_b)
+    a, b = a[ambos], b[ambos]
+    textos = pd.api.types.infer_dtype(a, skipna=False) == pd.api.types.infer_dtype(b, skipna=False) == "string"
+    if (a.dtype == object or b.dtype == object) and not textos:
+        iguais[ambos] = [str(x) == str(y) for x, y in zip(a, b)]
+    else:
+        iguais[ambos] = a == b
+    return np.asarray(iguais, dtype=bool)
+
+
+def chaves_contidas(chaves, ordenadas):
+    """
+    Marca as chaves presentes em `ordenadas` (vetor ordenado).
+    """
+    import numpy as np
+
+    if len(ordenadas) == 0:
+        return np.zeros(len(chaves), dtype=bool)
+    posicoes = np.minimum(np.searchsorted(ordenadas, chaves), len(ordenadas) - 1)
+    return ordenadas[posicoes] == chaves
+
+
+def conferir_existentes(df, chaves, validas, encontradas, colunas, coluna_processo=None, tipos=None):
+    """
+    Confere de forma exata as linhas de `df` cuja chave aparece em
+    `encontradas`, uma lista de (chaves, valores) de linhas da base, com os
+    valores de `valores_linhas`. Uma linha só existe na base se alguma linha
+    com a mesma chave tiver todos os valores iguais; chaves iguais com
+    valores diferentes (colisão do hash) são mantidas e contadas no aviso.
+
+    Retorna `existe` (bool por linha de `df`).
+    """
+    import numpy as np
+    import pandas as pd
+
+    existe = np.zeros(len(df), dtype=bool)
+    if not encontradas:
+        return existe
+    chaves_base = np.concatenate([parte for parte, _ in encontradas])
+    linhas = np.flatnonzero(validas & chaves_contidas(chaves, np.unique(chaves_base)))
+    if len(linhas) == 0:
+        return existe
+
+    valores_base = {col: np.concatenate([valores[col] for _, valores in encontradas]) for col in colunas}
+    valores_novos, _ = valores_linhas(df.take(linhas), colunas, coluna_processo, tipos)
+
+    # Pares (linha nova, linha da base) com a mesma chave
+    pares = pd.DataFrame({"chave": chaves[linhas], "novo": np.arange(len(linhas))}).merge(
+        pd.DataFrame({"chave": chaves_base, "base": np.arange(len(chaves_base))}), on="chave")
+    novo = pares["novo"].to_numpy()
+    base = pares["base"].to_numpy()
+    iguais = np.ones(len(pares), dtype=bool)
+    for col in colunas:
+        iguais &= valores_iguais(valores_novos[col][novo], valores_base[col][base])
+
+    existe[linhas[novo[iguais]]] = True
+    colisoes = len(linhas) - int(existe[linhas].sum())
+    if colisoes:
+        print(f"   ⚠️  {colisoes:,} linha(s) com a mesma chave de uma linha da base, mas com valores "
+              f"diferentes, foram mantidas")
+    return existe
+
+
+def remover_existentes(df, tabelas, colunas, coluna_processo=None, tipos=None, limite=None, em_uso=0):
+    """
+    Remove de `df` as linhas que já existem em alguma das `tabelas` (por
+    exemplo, um gerador que lê uma planilha da base por vez), sem cópias
+    intermediárias. As chaves de `df` são calculadas primeiro; cada tabela é
+    descartada assim que suas chaves são calculadas, e dela só ficam as
+    linhas com a chave de alguma linha nova, para a conferência exata em
+    `conferir_existentes`. Linhas da base com valores que não puderam ser
+    convertidos são ignoradas.
+
+    Retorna (DataFrame sem as linhas existentes, total de linhas das tabelas).
+    """
+    import numpy as np
+
+    if tipos is None:
+        tipos = tipos_colunas(df, [c for c in colunas if c in df.columns])
+    disponivel = limite - em_uso if limite is not None else None
+    chaves, validas = chaves_linhas(df, colunas, coluna_processo, tipos, disponivel)
+    procuradas = np.unique(chaves[validas])
+
+    encontradas = []
+    total_linhas = 0
+    for tabela in tabelas:
+        if limite is not None:
+            disponivel = limite - em_uso - chaves.nbytes - procuradas.nbytes - estimar_bytes(tabela)
+        chaves_tabela, validas_tabela = chaves_linhas(tabela, colunas, coluna_processo, tipos, disponivel)
+        linhas = np.flatnonzero(validas_tabela & chaves_contidas(chaves_tabela, procuradas))
+        if len(linhas):
+            valores, _ = valores_linhas(tabela.take(linhas), colunas, coluna_processo, tipos)
+            encontradas.append((chaves_tabela[linhas], valores))
+        total_linhas += len(tabela)
+        del tabela, chaves_tabela, validas_tabela
+
+    existe = conferir_existentes(df, chaves, validas, encontradas, colunas, coluna_processo, tipos)
+    del chaves, validas, encontradas
+    return df.take(np.flatnonzero(~existe)), total_linhas
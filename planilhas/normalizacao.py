@@ -0,0 +1,435 @@
+"""
+Normalização de números de processo (CNJ) a partir do valor bruto das células.
+
+O número do processo chega como texto com máscara, texto só com dígitos,
+inteiro, float (quando o Excel o guardou como número) ou vazio. Cada tipo
+tem o seu caminho vetorizado, e todos chegam na mesma matriz (n, 20) de
+dígitos (`matriz_numero` serve para qualquer largura). A partir dela saem a
+chave canônica de 20 dígitos, a máscara `0000000-00.0000.0.00.0000` e a
+validação do dígito verificador. Nenhum caminho passa os valores por
+`astype(str)`, então NaN nunca vira "nan" e o texto "82162142016809051.0"
+vira 00082162142016809051. Floats a partir de 2^53 já perderam os últimos
+dígitos na leitura e são tratados como inválidos.
+
+CPF e CNPJ passam pelos mesmos caminhos, com largura 11 e 14: '123.456.789-09',
+'12345678909' e 12345678909.0 chegam nos mesmos dígitos, com os zeros à
+esquerda recompostos. Os dois dígitos verificadores são conferidos sobre a
+matriz inteira (produto pelos pesos, módulo 11).
+O CNPJ alfanumérico (letras nas 12 primeiras posições, valendo o código ASCII
+menos 48) usa o mesmo cálculo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from planilhas.esquema import PAPEL_CNPJ, PAPEL_CPF
+
+LARGURA_PROCESSO = 20
+
+# A partir deste valor um float64 não guarda mais todos os dígitos de um inteiro
+_LIMITE_FLOAT_EXATO = 2.0 ** 53
+
+# Largura de cada documento, pelo papel da coluna
+LARGURAS_DOCUMENTO = {PAPEL_CPF: 11, PAPEL_CNPJ: 14}
+
+# Valores mais longos que isso não são tratados como identificadores
+_LARGURA_MAXIMA_TEXTO = 64
+
+_PONTO = 46
+_ZERO = 48
+
+# Classe de cada caractere ASCII: 0 = fim do texto, 1 = dígito,
+# 2 = separador aceito (espaço, tab, - . / _), 3 = qualquer outro
+_CLASSES = np.full(256, 3, dtype=np.uint8)
+_CLASSES[0] = 0
+_CLASSES[_ZERO:_ZERO + 10] = 1
+_CLASSES[[32, 9, 45, 46, 47, 95]] = 2
+
+# Mesmas classes, com as letras (já em maiúsculas) contando como dígitos
+_CLASSES_ALFANUMERICO = _CLASSES.copy()
+_CLASSES_ALFANUMERICO[65:91] = 1
+
+# Acima disso o agrupamento por desenho de dígitos não compensa
+_MAX_DESENHOS = 256
+
+# Posições da máscara CNJ: NNNNNNN-DD.AAAA.J.TR.OOOO
+_MASCARA_DIGITOS = [0, 1, 2, 3, 4, 5, 6, 8, 9, 11, 12, 13, 14, 16, 18, 19, 21, 22, 23, 24]
+_MASCARA_SEPARADORES = {7: ord("-"), 10: ord("."), 15: ord("."), 17: ord("."), 20: ord(".")}
+
+# Máscaras de CPF (000.000.000-00) e CNPJ (00.000.000/0000-00)
+_MASCARAS_DOCUMENTO = {
+    PAPEL_CPF: (14, [0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13], {3: ord("."), 7: ord("."), 11: ord("-")}),
+    PAPEL_CNPJ: (18, [0, 1, 3, 4, 5, 7, 8, 9, 11, 12, 13, 14, 16, 17],
+                 {2: ord("."), 6: ord("."), 10: ord("/"), 15: ord("-")}),
+}
+
+# Pesos do primeiro e do segundo dígito verificador, um por coluna (o
+# primeiro não usa a posição do segundo)
+_PESOS_DOCUMENTO = {
+    PAPEL_CPF: np.array([list(range(10, 1, -1)) + [0], list(range(11, 1, -1))], dtype=np.float32).T,
+    PAPEL_CNPJ: np.array([[5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2, 0],
+                          [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]], dtype=np.float32).T,
+}
+
+
+def codigos_texto(valores):
+    """
+    Converte um array de textos em uma matriz (n, w) de uint8 com o código
+    ASCII de cada caractere (0 = fim do texto, 255 = caractere fora do ASCII).
+    Textos muito longos viram texto vazio.
+    """
+    try:
+        # Caminho comum: tudo ASCII, um byte por caractere
+        texto = np.asarray(valores, dtype=bytes)
+        largura = texto.dtype.itemsize
+        bytes_por_caractere = 1
+    except UnicodeEncodeError:
+        texto = np.asarray(valores, dtype=str)
+        largura = texto.dtype.itemsize // 4
+        bytes_por_caractere = 4
+    if largura > _LARGURA_MAXIMA_TEXTO:
+        comprimentos = np.char.str_len(texto)
+        texto = np.where(comprimentos > _LARGURA_MAXIMA_TEXTO, texto[:0].dtype.type(), texto)
+        texto = texto.astype(f"{texto.dtype.kind}{_LARGURA_MAXIMA_TEXTO}")
+        largura = _LARGURA_MAXIMA_TEXTO
+    n = len(texto)
+    if largura == 0:
+        return np.zeros((n, 0), dtype=np.uint8)
+    if bytes_por_caractere == 1:
+        return texto.view(np.uint8).reshape(n, largura)
+    return np.minimum(texto.view(np.uint32).reshape(n, largura), 255).astype(np.uint8)
+
+
+def _reduzir_linhas(operacao, matriz):
+    """
+    Equivale a `operacao.reduce(matriz, axis=1)`, acumulando coluna a coluna:
+    com poucas colunas (textos curtos) o reduce do numpy ao longo de cada
+    linha é várias vezes mais lento. As contagens cabem em int16 (w <= 64).
+    """
+    resultado = np.zeros(len(matriz), dtype=np.int16)
+    for j in range(matriz.shape[1]):
+        operacao(resultado, matriz[:, j], out=resultado)
+    return resultado
+
+
+def matriz_digitos(codigos, eh_digito, largura):
+    """
+    Copia os dígitos marcados em `eh_digito` para uma matriz (n, largura) de
+    uint8, alinhados à direita e com zeros à esquerda.
+    """
+    n, w = eh_digito.shape
+    matriz = np.zeros((n, largura), dtype=np.uint8)
+    if n == 0 or w == 0:
+        return matriz
+
+    # Linhas com o mesmo desenho de dígitos (ex.: todas com a máscara CNJ, ou
+    # todas só com 17 dígitos) são copiadas em bloco, com colunas fixas. O
+    # desenho é a máscara de bits das posições com dígito (w <= 64)
+    desenho = np.zeros(n, dtype=np.uint64)
+    for j in range(w):
+        desenho |= eh_digito[:, j].astype(np.uint64) << np.uint64(j)
+    if (desenho == desenho[0]).all():
+        colunas = np.flatnonzero(eh_digito[0])[-largura:]
+        if len(colunas):
+            matriz[:, largura - len(colunas):] = codigos[:, colunas] - _ZERO
+        return matriz
+    # O factorize agrupa por hash; os códigos pequenos são ordenados por
+    # radix sort, bem mais barato que ordenar os próprios desenhos
+    grupo, desenhos = pd.factorize(desenho)
+    if len(desenhos) <= _MAX_DESENHOS:
+        ordem = np.argsort(grupo.astype(np.uint16), kind="stable")
+        fins = np.cumsum(np.bincount(grupo, minlength=len(desenhos)))
+        for inicio, fim in zip(np.append(0, fins[:-1]), fins):
+            linhas = ordem[inicio:fim]
+            colunas = np.flatnonzero(eh_digito[linhas[0]])[-largura:]
+            if len(colunas):
+                matriz[linhas, largura - len(colunas):] = codigos.take(linhas, axis=0)[:, colunas] - _ZERO
+        return matriz
+
+    # Posição de cada dígito contando da direita (1 = último dígito)
+    posicao = np.cumsum(eh_digito[:, ::-1], axis=1)[:, ::-1]
+    linhas, colunas = np.nonzero(eh_digito & (posicao <= largura))
+    matriz[linhas, largura - posicao[linhas, colunas]] = codigos[linhas, colunas] - _ZERO
+    return matriz
+
+
+def numero_da_matriz(matriz, inicio, fim):
+    """
+    Converte as colunas [inicio, fim) da matriz de dígitos em inteiros.
+    """
+    pesos = 10 ** np.arange(fim - inicio - 1, -1, -1, dtype=np.int64)
+    return matriz[:, inicio:fim].astype(np.int64) @ pesos
+
+
+def _matriz_de_inteiros(valores, largura):
+    """
+    Caminho numérico: decompõe inteiros não negativos (uint64) em dígitos.
+    """
+    matriz = np.empty((len(valores), largura), dtype=np.uint8)
+    restante = valores.astype(np.uint64)
+    for i in range(largura - 1, -1, -1):
+        matriz[:, i] = restante % 10
+        restante //= 10
+    return matriz
+
+
+def _digitos_de_textos(valores, largura, alfanumerico=False):
+    """
+    Caminho de texto: aceita dígitos e separadores; qualquer outro caractere
+    (letras, "nan", "None") invalida o valor. Textos de float como
+    "82162142016809051.0" têm a parte decimal zerada descartada. Com
+    `alfanumerico`, letras também são aceitas (em maiúsculas, valendo o
+    código ASCII menos 48, como no CNPJ alfanumérico).
+    """
+    # Caracteres fora do ASCII (255) já caem em "outros"
+    codigos = codigos_texto(valores)
+    if alfanumerico:
+        codigos = np.where((codigos >= 97) & (codigos <= 122), codigos - 32, codigos).astype(np.uint8)
+    classes = (_CLASSES_ALFANUMERICO if alfanumerico else _CLASSES)[codigos]
+    eh_digito = classes == 1
+    permitido = _reduzir_linhas(np.maximum, classes) < 3
+    quantidade = _reduzir_linhas(np.add, eh_digito)
+
+    # "123.0" / "123.000": um único ponto e o resto dígitos; só essas linhas
+    # (normalmente nenhuma) passam pela verificação detalhada
+    comprimento = _reduzir_linhas(np.add, codigos != 0)
+    candidatas = np.flatnonzero((quantidade + 1 == comprimento) & (_reduzir_linhas(np.add, codigos == _PONTO) == 1))
+    if len(candidatas):
+        trecho = codigos[candidatas]
+        posicao_ponto = np.argmax(trecho == _PONTO, axis=1)
+        depois = (np.arange(trecho.shape[1]) > posicao_ponto[:, None]) & (trecho != 0)
+        de_float = (posicao_ponto > 0) & depois.any(axis=1) & ~(depois & (trecho != _ZERO)).any(axis=1)
+        eh_digito[candidatas[de_float]] &= ~depois[de_float]
+        quantidade[candidatas[de_float]] -= depois[de_float].sum(axis=1)
+
+    valido = permitido & (quantidade >= 1) & (quantidade <= largura)
+    return matriz_digitos(codigos, eh_digito, largura), valido
+
+
+def _digitos_de_floats(valores, largura):
+    """
+    Caminho de float: só valores finitos, inteiros e com até `largura` dígitos.
+    A partir de 2^53 o float já perdeu os últimos dígitos (um número de
+    processo de 20 dígitos lido como número), então esses valores são
+    inválidos em vez de virarem dígitos errados.
+    """
+    matriz = np.zeros((len(valores), largura), dtype=np.uint8)
+    with np.errstate(invalid="ignore"):
+        valido = np.isfinite(valores) & (valores >= 0) & (valores == np.floor(valores))
+        valido &= (valores < 10.0 ** largura) & (valores < _LIMITE_FLOAT_EXATO)
+    matriz[valido] = _matriz_de_inteiros(valores[valido].astype(np.uint64), largura)
+    return matriz, valido
+
+
+def _digitos_de_inteiros(valores, largura):
+    """
+    Caminho de inteiros Python (coluna object): exato mesmo acima de int64.
+    """
+    matriz = np.zeros((len(valores), largura), dtype=np.uint8)
+    valido = np.fromiter((0 <= v < 10 ** largura for v in valores), dtype=bool, count=len(valores))
+    cabe = valido & np.fromiter((v < 2 ** 64 for v in valores), dtype=bool, count=len(valores))
+    if cabe.any():
+        matriz[cabe] = _matriz_de_inteiros(np.array(valores[cabe].tolist(), dtype=np.uint64), largura)
+    for i in np.flatnonzero(valido & ~cabe):
+        matriz[i] = np.frombuffer(f"{int(valores[i]):0{largura}d}".encode(), dtype=np.uint8) - _ZERO
+    return matriz, valido
+
+
+def matriz_processo(serie):
+    """
+    Converte uma coluna bruta de números de processo na matriz (n, 20) de
+    dígitos, escolhendo o caminho pelo tipo da coluna.
+    Retorna (matriz, valido); linhas inválidas ou nulas têm valido=False.
+    """
+    return matriz_numero(serie, LARGURA_PROCESSO)
+
+
+def matriz_numero(serie, largura, alfanumerico=False):
+    """
+    Converte uma coluna bruta de identificadores numéricos na matriz
+    (n, largura) de dígitos, alinhados à direita com zeros à esquerda.
+    Retorna (matriz, valido); linhas inválidas ou nulas têm valido=False.
+    """
+    n = len(serie)
+    matriz = np.zeros((n, largura), dtype=np.uint8)
+    valido = np.zeros(n, dtype=bool)
+    if n == 0 or pd.api.types.is_bool_dtype(serie.dtype):
+        return matriz, valido
+
+    if pd.api.types.is_integer_dtype(serie.dtype):
+        nulos = serie.isna().to_numpy()
+        inteiros = serie.to_numpy(dtype=np.int64, na_value=-1) if nulos.any() else serie.to_numpy()
+        valido = ~nulos & (inteiros >= 0)
+        if largura < 19:
+            valido &= inteiros < 10 ** largura
+        matriz[valido] = _matriz_de_inteiros(inteiros[valido], largura)
+        return matriz, valido
+
+    if pd.api.types.is_float_dtype(serie.dtype):
+        return _digitos_de_floats(serie.to_numpy(dtype=np.float64, na_value=np.nan), largura)
+
+    # Só textos e nenhum nulo (o caso comum numa coluna object): dispensa o isna
+    if serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=False) == "string":
+        return _digitos_de_textos(serie.to_numpy(), largura, alfanumerico)
+
+    # Texto (object ou string): separa os tipos presentes na coluna
+    nulos = serie.isna().to_numpy()
+    tipo = pd.api.types.infer_dtype(serie, skipna=True)
+    if tipo in ("string", "empty"):
+        presentes = ~nulos
+        matriz[presentes], valido[presentes] = _digitos_de_textos(serie.to_numpy(dtype=object)[presentes],
+                                                                  largura, alfanumerico)
+        return matriz, valido
+    if tipo == "floating":
+        return _digitos_de_floats(serie.to_numpy(dtype=np.float64, na_value=np.nan), largura)
+
+    # Coluna mista (primeira leitura de um layout): cada tipo no seu caminho
+    valores = serie.to_numpy(dtype=object)
+    eh_texto = np.fromiter((isinstance(v, str) for v in valores), dtype=bool, count=n)
+    eh_inteiro = np.fromiter(
+        (isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) for v in valores),
+        dtype=bool, count=n,
+    )
+    eh_float = np.fromiter((isinstance(v, (float, np.floating)) for v in valores), dtype=bool, count=n) & ~nulos
+    if eh_texto.any():
+        matriz[eh_texto], valido[eh_texto] = _digitos_de_textos(valores[eh_texto], largura, alfanumerico)
+    if eh_inteiro.any():
+        matriz[eh_inteiro], valido[eh_inteiro] = _digitos_de_inteiros(valores[eh_inteiro], largura)
+    if eh_float.any():
+        matriz[eh_float], valido[eh_float] = _digitos_de_floats(valores[eh_float].astype(np.float64), largura)
+    return matriz, valido
+
+
+def _textos_de_bytes(matriz):
+    """
+    Converte uma matriz (n, w) de bytes ASCII em um array de objetos str.
+    """
+    # Cada byte ASCII vira um caractere UCS-4: um cast para uint32 em vez
+    # de converter um array de bytes em str
+    largura = matriz.shape[1]
+    if largura == 0:
+        return np.full(len(matriz), "", dtype=object)
+    return matriz.astype(np.uint32).view(f"U{largura}").ravel().astype(object)
+
+
+def chave_processo(serie):
+    """
+    Chave canônica do número do processo: 20 dígitos com zeros à esquerda;
+    valores que não são números de processo ficam como estavam (não viram
+    iguais entre si).
+    Exemplo: '0082162-14.2016.8.09.0051' → '00821621420168090051'
+    """
+    return normalizar_processo(serie)[0]
+
+
+def normalizar_processo(serie):
+    """
+    Chave canônica de uma coluna inteira de números de processo, contando
+    pela mesma máscara de validade o que foi reconhecido.
+    Retorna (coluna, normalizados, nao_normalizados): `nao_normalizados`
+    conta os valores preenchidos que não são números de processo.
+    """
+    matriz, valido = matriz_processo(serie)
+    chaves = serie.to_numpy(dtype=object, copy=True)
+    nao_normalizados = int(pd.notna(chaves[~valido]).sum())
+    chaves[valido] = _textos_de_bytes(matriz[valido] + _ZERO)
+    return pd.Series(chaves, index=serie.index, name=serie.name), int(valido.sum()), nao_normalizados
+
+
+def mascara_processo(serie):
+    """
+    Aplica a máscara 0000000-00.0000.0.00.0000 a uma coluna inteira.
+    Valores que não são números de processo ficam como estavam.
+    Retorna (coluna mascarada, quantidade de máscaras aplicadas).
+    """
+    matriz, valido = matriz_processo(serie)
+    digitos = matriz[valido] + _ZERO
+    saida = np.empty((len(digitos), 25), dtype=np.uint8)
+    saida[:, _MASCARA_DIGITOS] = digitos
+    for posicao, caractere in _MASCARA_SEPARADORES.items():
+        saida[:, posicao] = caractere
+    resultado = serie.to_numpy(dtype=object, copy=True)
+    resultado[valido] = _textos_de_bytes(saida)
+    return pd.Series(resultado, index=serie.index, name=serie.name), int(valido.sum())
+
+
+def cnj_valido(matriz):
+    """
+    Confere o dígito verificador (módulo 97, Resolução CNJ 65/2008) de cada
+    linha da matriz de dígitos.
+    """
+    # NNNNNNN DD AAAA J TR OOOO → resto calculado em partes para caber em int64
+    resto = numero_da_matriz(matriz, 0, 7) % 97
+    resto = (resto * 10_000 + numero_da_matriz(matriz, 9, 13)) % 97
+    resto = (resto * 1_000 + numero_da_matriz(matriz, 13, 16)) % 97
+    resto = (resto * 10_000 + numero_da_matriz(matriz, 16, 20)) % 97
+    resto = (resto * 100) % 97
+    return (98 - resto) == numero_da_matriz(matriz, 7, 9)
+
+
+def matriz_documento(serie, papel):
+    """
+    Converte uma coluna bruta de CPF ou CNPJ (pelo papel) na matriz de
+    dígitos, com zeros à esquerda até 11 ou 14 posições.
+    Retorna (matriz, reconhecido); valores vazios, longos demais ou com
+    caracteres que não são dígitos nem separadores ficam com reconhecido=False.
+    """
+    return matriz_numero(serie, LARGURAS_DOCUMENTO[papel], alfanumerico=papel == PAPEL_CNPJ)
+
+
+def documento_valido(matriz, papel):
+    """
+    Confere os dois dígitos verificadores (módulo 11) de cada linha da
+    matriz. Sequências de um único dígito repetido (000.000.000-00,
+    111.111.111-11...) passam no cálculo, mas não são documentos válidos.
+    """
+    largura = LARGURAS_DOCUMENTO[papel]
+    # Os dois dígitos num só produto. As somas (no máximo 42 * 9 * 13) são
+    # exatas em float32, e o produto em float usa o BLAS em vez do laço de
+    # inteiros do numpy
+    resto = (matriz[:, :largura - 1].astype(np.float32) @ _PESOS_DOCUMENTO[papel]) % 11
+    digitos = np.where(resto < 2, 0, 11 - resto)
+    valido = (digitos == matriz[:, largura - 2:]).all(axis=1)
+    if papel == PAPEL_CNPJ:
+        # No CNPJ alfanumérico, letras só nas 12 primeiras posições
+        valido &= (matriz[:, largura - 2:] <= 9).all(axis=1)
+    valido &= ~(matriz == matriz[:, :1]).all(axis=1)
+    return valido
+
+
+def chave_documento(serie, papel):
+    """
+    Chave de comparação de CPF/CNPJ: os 11 ou 14 dígitos sem máscara; valores
+    que não são documentos ficam como estavam (não viram iguais entre si).
+    Exemplo: '123.456.789-09' e 12345678909.0 → '12345678909'
+    """
+    matriz, reconhecido = matriz_documento(serie, papel)
+    chaves = serie.to_numpy(dtype=object, copy=True)
+    chaves[reconhecido] = _textos_de_bytes(matriz[reconhecido] + _ZERO)
+    return pd.Series(chaves, index=serie.index, name=serie.name)
+
+
+def normalizar_documento(serie, papel, mascarar=False):
+    """
+    Normaliza uma coluna inteira de CPF ou CNPJ: só os dígitos, com zeros à
+    esquerda, ou com a máscara padrão se `mascarar`. Valores que não são
+    documentos ficam como estavam.
+    Retorna (coluna, normalizados, invalidos): `invalidos` conta os valores
+    preenchidos que não foram reconhecidos ou têm dígito verificador errado.
+    """
+    matriz, reconhecido = matriz_documento(serie, papel)
+    valido = reconhecido & documento_valido(matriz, papel)
+    digitos = matriz[reconhecido] + _ZERO
+    if mascarar:
+        largura, posicoes, separadores = _MASCARAS_DOCUMENTO[papel]
+        saida = np.empty((len(digitos), largura), dtype=np.uint8)
+        saida[:, posicoes] = digitos
+        for posicao, caractere in separadores.items():
+            saida[:, posicao] = caractere
+        digitos = saida
+    resultado = serie.to_numpy(dtype=object, copy=True)
+    # Inválidos: os reconhecidos com dígito errado e os não reconhecidos
+    # preenchidos (só estes precisam do isna)
+    invalidos = int((reconhecido & ~valido).sum()) + int(pd.notna(resultado[~reconhecido]).sum())
+    resultado[reconhecido] = _textos_de_bytes(digitos)
+    return pd.Series(resultado, index=serie.index, name=serie.name), int(reconhecido.sum()), invalidos
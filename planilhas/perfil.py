@@ -0,0 +1,231 @@
+"""
+Perfil de qualidade dos dados, coletado durante as passadas do próprio pipeline.
+
+Cada coluna é observada uma única vez (ou uma vez por bloco) com um único
+`pd.factorize`: a partir dos códigos e dos valores únicos saem as contagens de
+nulos, a estimativa de distintos, os comprimentos mínimo/máximo, os valores
+mais frequentes e as contagens de CPF/CNPJ/CNJ inválidos. Tudo o que depende do
+conteúdo é calculado só sobre os valores únicos, ponderado pelas contagens.
+"""
+
+import html
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from planilhas.esquema import PAPEL_CNPJ, PAPEL_CPF, PAPEL_PROCESSO, identificar_papel
+from planilhas.normalizacao import cnj_valido, documento_valido, matriz_documento, matriz_processo
+
+# Tamanho do esboço KMV (k menores hashes) usado para estimar distintos
+K_DISTINTOS = 1024
+
+# Quantos candidatos a mais frequentes são mantidos por coluna entre blocos
+CANDIDATOS_TOPO = 50
+
+_MAX_HASH = float(2 ** 64)
+
+
+def _invalidos_cnj(valores, contagens):
+    """
+    Conta números de processo inválidos: não normalizáveis para a chave de
+    20 dígitos ou com dígito verificador diferente do informado.
+    """
+    matriz, valido = matriz_processo(pd.Series(valores, dtype=object))
+    validos = valido & cnj_valido(matriz)
+    return int(contagens[~validos].sum())
+
+
+def _invalidos_documento(valores, contagens, papel):
+    """
+    Conta CPF/CNPJ que não são documentos ou têm dígito verificador errado.
+    """
+    matriz, valido = matriz_documento(pd.Series(valores, dtype=object), papel)
+    validos = valido & documento_valido(matriz, papel)
+    return int(contagens[~validos].sum())
+
+
+class PerfilColuna:
+    """
+    Estatísticas acumuladas de uma coluna.
+    """
+
+    def __init__(self, nome, papel):
+        self.nome = nome
+        self.papel = papel
+        self.linhas = 0
+        self.nulos = 0
+        self.invalidos = 0
+        self.comprimento_min = None
+        self.comprimento_max = None
+        self._hashes = None
+        self._unicos_pendentes = None
+        self._distintos_exatos = True
+        self._topo = {}
+
+    def observar(self, serie, fatores=None):
+        if fatores is None:
+            fatores = pd.factorize(serie, use_na_sentinel=True)
+        codigos, unicos = fatores
+        contagens = np.bincount(codigos[codigos >= 0], minlength=len(unicos))
+        self.linhas += len(serie)
+        self.nulos += int((codigos < 0).sum())
+        if len(unicos) == 0:
+            return
+        valores = np.asarray(unicos, dtype=object)
+
+        # Distintos: com um único bloco a contagem é exata (len dos únicos);
+        # a partir do segundo bloco vira um esboço KMV com os k menores hashes
+        if self._unicos_pendentes is None and self._hashes is None:
+            self._unicos_pendentes = valores
+        else:
+            if self._unicos_pendentes is not None:
+                self._hashes = self._menores_hashes(self._unicos_pendentes)
+                self._unicos_pendentes = None
+            hashes = np.union1d(self._hashes, self._menores_hashes(valores))
+            # Se algum bloco foi truncado, a união tem pelo menos k hashes
+            if len(hashes) >= K_DISTINTOS:
+                hashes = hashes[:K_DISTINTOS]
+                self._distintos_exatos = False
+            self._hashes = hashes
+
+        # Comprimentos (em caracteres) só para colunas de texto
+        if pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+            comprimentos = pd.Series(valores, dtype=object).str.len()
+            if comprimentos.notna().any():
+                menor, maior = int(comprimentos.min()), int(comprimentos.max())
+                self.comprimento_min = menor if self.comprimento_min is None else min(self.comprimento_min, menor)
+                self.comprimento_max = maior if self.comprimento_max is None else max(self.comprimento_max, maior)
+
+        # Mais frequentes: candidatos por bloco, somados entre blocos
+        candidatos = np.arange(len(contagens))
+        if len(contagens) > CANDIDATOS_TOPO:
+            candidatos = np.argpartition(-contagens, CANDIDATOS_TOPO)[:CANDIDATOS_TOPO]
+        for i in candidatos:
+            chave = str(valores[i])
+            self._topo[chave] = self._topo.get(chave, 0) + int(contagens[i])
+        if len(self._topo) > CANDIDATOS_TOPO * 2:
+            self._topo = dict(sorted(self._topo.items(), key=lambda kv: -kv[1])[:CANDIDATOS_TOPO])
+
+        if self.papel == PAPEL_PROCESSO:
+            self.invalidos += _invalidos_cnj(valores, contagens)
+        elif self.papel in (PAPEL_CPF, PAPEL_CNPJ):
+            self.invalidos += _invalidos_documento(valores, contagens, self.papel)
+
+    @staticmethod
+    def _menores_hashes(valores):
+        hashes = pd.util.hash_array(valores, categorize=False)
+        if len(hashes) > K_DISTINTOS:
+            hashes = np.partition(hashes, K_DISTINTOS)[:K_DISTINTOS]
+        return np.unique(hashes)
+
+    @property
+    def distintos(self):
+        if self._unicos_pendentes is not None:
+            return len(self._unicos_pendentes)
+        if self._hashes is None:
+            return 0
+        if self._distintos_exatos:
+            return len(self._hashes)
+        return int((K_DISTINTOS - 1) / (float(self._hashes[-1]) / _MAX_HASH))
+
+    def mais_frequentes(self, n):
+        return sorted(self._topo.items(), key=lambda kv: -kv[1])[:n]
+
+    def para_dict(self, n_topo):
+        dados = {
+            "papel": self.papel,
+            "linhas": self.linhas,
+            "nulos": self.nulos,
+            "distintos": self.distintos,
+            "distintos_exatos": self._distintos_exatos,
+            "comprimento_min": self.comprimento_min,
+            "comprimento_max": self.comprimento_max,
+            "mais_frequentes": [{"valor": v, "ocorrencias": c} for v, c in self.mais_frequentes(n_topo)],
+        }
+        if self.papel in (PAPEL_PROCESSO, PAPEL_CPF, PAPEL_CNPJ):
+            dados["invalidos"] = self.invalidos
+        return dados
+
+
+class PerfilQualidade:
+    """
+    Perfil de qualidade de um DataFrame, alimentado coluna a coluna pelo pipeline.
+    """
+
+    def __init__(self, n_topo=5):
+        self.n_topo = n_topo
+        self.colunas = {}
+
+    def observar_coluna(self, nome, serie, papel=None, fatores=None):
+        """
+        Acrescenta uma coluna (ou um bloco dela) ao perfil. `fatores` são os
+        (códigos, únicos) de um `pd.factorize` já feito sobre a coluna, como
+        os devolvidos por `sanitizar_texto`.
+        """
+        if nome not in self.colunas:
+            self.colunas[nome] = PerfilColuna(nome, papel or identificar_papel(nome))
+        self.colunas[nome].observar(serie, fatores)
+
+    def observar(self, df):
+        for coluna in df.columns:
+            self.observar_coluna(coluna, df[coluna])
+
+    @property
+    def total_celulas(self):
+        return sum(p.linhas for p in self.colunas.values())
+
+    @property
+    def celulas_vazias(self):
+        return sum(p.nulos for p in self.colunas.values())
+
+    def para_dict(self):
+        return {
+            "total_celulas": self.total_celulas,
+            "celulas_vazias": self.celulas_vazias,
+            "colunas": {nome: p.para_dict(self.n_topo) for nome, p in self.colunas.items()},
+        }
+
+    def salvar_json(self, caminho):
+        Path(caminho).write_text(json.dumps(self.para_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def salvar_html(self, caminho):
+        linhas = []
+        for nome, p in self.colunas.items():
+            topo = "<br>".join(f"{html.escape(v[:50])} ({c})" for v, c in p.mais_frequentes(self.n_topo))
+            invalidos = p.invalidos if p.papel in (PAPEL_PROCESSO, PAPEL_CPF, PAPEL_CNPJ) else ""
+            distintos = f"{p.distintos:,}" + ("" if p._distintos_exatos else " (estimado)")
+            comprimentos = "" if p.comprimento_min is None else f"{p.comprimento_min}–{p.comprimento_max}"
+            linhas.append(
+                f"<tr><td>{html.escape(str(nome))}</td><td>{p.papel}</td><td>{p.linhas:,}</td>"
+                f"<td>{p.nulos:,}</td><td>{distintos}</td><td>{comprimentos}</td>"
+                f"<td>{invalidos}</td><td>{topo}</td></tr>"
+            )
+        preenchimento = (1 - self.celulas_vazias / self.total_celulas) * 100 if self.total_celulas else 0
+        conteudo = (
+            "<!DOCTYPE html>\n<html lang=\"pt-BR\"><head><meta charset=\"utf-8\">"
+            "<title>Relatório de qualidade</title>"
+            "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+            "td,th{border:1px solid #ccc;padding:4px 8px;vertical-align:top}</style></head><body>"
+            "<h1>Relatório de qualidade</h1>"
+            f"<p>Células: {self.total_celulas:,} · Vazias: {self.celulas_vazias:,} · "
+            f"Preenchimento: {preenchimento:.2f}%</p>"
+            "<table><tr><th>Coluna</th><th>Papel</th><th>Linhas</th><th>Nulos</th><th>Distintos</th>"
+            "<th>Comprimento</th><th>Inválidos</th><th>Mais frequentes</th></tr>"
+            + "".join(linhas)
+            + "</table></body></html>\n"
+        )
+        Path(caminho).write_text(conteudo, encoding="utf-8")
+
+    def salvar(self, pasta, prefixo):
+        """
+        Grava o relatório em JSON e HTML na pasta informada.
+        Retorna os dois caminhos.
+        """
+        pasta = Path(pasta)
+        caminho_json = pasta / f"{prefixo}.json"
+        caminho_html = pasta / f"{prefixo}.html"
+        self.salvar_json(caminho_json)
+        self.salvar_html(caminho_html)
+        return caminho_json, caminho_html
@@ -0,0 +1,92 @@
+from pathlib import Path
+from datetime import datetime
+
+from planilhas.esquema import PAPEL_PROCESSO, RegistroEsquemas
+from planilhas.leitura import listar_planilhas, ler_planilha, nome_sem_extensao
+
+def remover_tracos(pasta_entrada="planilha", pasta_saida="resultado", caminho_esquemas=None):
+    """
+    Remove traços e pontos dos números de processo na coluna '04 - NrProcesso (short text)',
+    gravando a chave canônica de 20 dígitos (com zeros à esquerda).
+    Lê planilhas da pasta de entrada (padrão 'planilha') e salva o resultado
+    na pasta de saída (padrão 'resultado').
+    
+    Os arquivos são lidos com os dtypes do registro de esquemas
+    (`caminho_esquemas`, padrão ~/.planilhas/esquemas.json).
+    """
+    
+    # Define os diretórios
+    pasta_entrada = Path(pasta_entrada)
+    pasta_saida = Path(pasta_saida)
+    
+    # Cria a pasta de resultado se não existir
+    pasta_saida.mkdir(exist_ok=True)
+    
+    # Lista todas as planilhas (Excel e CSV) na pasta planilha
+    arquivos_excel = listar_planilhas(pasta_entrada)
+    
+    if not arquivos_excel:
+        print(f"❌ Nenhuma planilha encontrada na pasta '{pasta_entrada}'")
+        return
+    
+    # Bibliotecas pesadas só são importadas quando há planilhas para processar
+    from planilhas.normalizacao import normalizar_processo
+    
+    registro = RegistroEsquemas(caminho_esquemas)
+    
+    print(f"📂 Encontradas {len(arquivos_excel)} planilha(s) para processar\n")
+    
+    # Processa cada planilha
+    for arquivo in arquivos_excel:
+        try:
+            print(f"📖 Processando: {arquivo.name}")
+            
+            # Lê a planilha com os dtypes do esquema
+            df, esquema = ler_planilha(arquivo, registro)
+            
+            print(f"   ✓ {len(df)} linhas carregadas")
+            print(f"   ✓ {len(df.columns)} colunas encontradas")
+            
+            # Identifica a coluna de número do processo
+            coluna_processo = esquema.coluna_do_papel(PAPEL_PROCESSO)
+            
+            if coluna_processo:
+                print(f"   🔍 Coluna identificada: '{coluna_processo}'")
+                
+                # Remove traços e pontos, mantendo apenas números (chave de 20 dígitos)
+                # Valores que não são números de processo ficam como estavam
+                df[coluna_processo], _, nao_normalizados = normalizar_processo(df[coluna_processo])
+                
+                print(f"   ✓ Traços e pontos removidos")
+                if nao_normalizados:
+                    print(f"   ⚠️  {nao_normalizados} valor(es) não reconhecido(s) como número de processo (mantidos)")
+                
+                # Exemplo de transformação
+                if len(df) > 0:
+                    exemplo_antes = "0082162-14.2016.8.09.0051"
+                    exemplo_depois = df[coluna_processo].iloc[0]
+                    print(f"   📝 Exemplo: {exemplo_antes} → {exemplo_depois}")
+            else:
+                print(f"   ⚠️  Nenhuma coluna de processo identificada")
+                print(f"   Colunas disponíveis: {', '.join(df.columns.tolist())}")
+            
+            # Gera nome do arquivo de saída
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nome_saida = nome_sem_extensao(arquivo) + f"_sem_tracos_{timestamp}.xlsx"
+            arquivo_saida = pasta_saida / nome_saida
+            
+            # Salva o arquivo processado
+            print(f"   💾 Salvando: {nome_saida}")
+            df.to_excel(arquivo_saida, index=False)
+            
+            print(f"   ✅ Concluído!\n")
+            
+        except Exception as e:
+            print(f"   ❌ Erro ao processar {arquivo.name}: {e}\n")
+    
+    registro.salvar()
+    
+    print("=" * 70)
+    print("✅ Processamento finalizado!")
+    print(f"📊 Arquivo(s) salvo(s) em: {pasta_saida.absolute()}")
+    print("=" * 70)
@@ -0,0 +1,122 @@
+"""
+Detecção de arquivos de entrada repetidos antes da leitura.
+
+É comum a mesma exportação ser colocada duas vezes na pasta de entrada
+("relatorio.xlsx" e "relatorio (1).xlsx"). Sem esta verificação, o arquivo
+repetido é lido inteiro e depois todas as suas linhas são removidas como
+duplicatas. Aqui cada arquivo recebe um hash calculado em blocos (bem mais
+barato que interpretar a planilha) e só o primeiro de cada grupo é lido.
+
+Dois níveis de comparação:
+- bytes: arquivos idênticos byte a byte
+- conteúdo: para .xlsx, só as partes que mudam o que é lido (planilhas,
+  textos compartilhados, formatos de número e data em `styles.xml`, e a
+  ordem e os nomes das abas em `workbook.xml`), ignorando metadados como autor
+  e data de gravação (`docProps/`); para CSV compactado, o conteúdo já
+  descompactado. Assim a mesma exportação gerada ou baixada de novo também é
+  reconhecida.
+
+As partes são comparadas byte a byte, não célula a célula: um .xlsx aberto e
+salvo de novo no Excel regrava as abas (célula selecionada, rolagem) e a ordem
+dos textos compartilhados, e não é reconhecido aqui. Comparar os valores das
+células exigiria interpretar a planilha inteira, o custo que esta etapa
+evita; essas linhas continuam sendo removidas na deduplicação.
+"""
+
+import hashlib
+import zipfile
+from pathlib import Path
+
+from planilhas.checkpoint import BLOCO_HASH, hash_arquivo
+from planilhas.leitura import EXTENSOES_COMPRESSAO, _abrir_binario, eh_csv
+
+# Partes de um .xlsx que mudam os dados lidos: valores das células, formatos
+# de número/data e a ordem das abas (a primeira aba é a lida)
+_PARTES_DADOS_XLSX = ("xl/worksheets/", "xl/sharedStrings.xml", "xl/styles.xml", "xl/workbook.xml",
+                      "xl/_rels/workbook.xml.rels")
+
+MOTIVO_BYTES = "idêntico byte a byte"
+MOTIVO_CONTEUDO = "mesmos dados das células"
+
+
+def hash_conteudo(arquivo):
+    """
+    Hash só das partes de dados de um .xlsx (o XML, como está gravado) ou do
+    conteúdo de um CSV compactado. Para os demais formatos retorna None (vale
+    o hash dos bytes).
+    """
+    arquivo = Path(arquivo)
+    sha = hashlib.sha256()
+    if arquivo.suffix.lower() == ".xlsx":
+        try:
+            with zipfile.ZipFile(arquivo) as pacote:
+                partes = sorted(nome for nome in pacote.namelist() if nome.startswith(_PARTES_DADOS_XLSX))
+                if not partes:
+                    return None
+                for nome in partes:
+                    sha.update(nome.encode("utf-8") + b"\0")
+                    with pacote.open(nome) as parte:
+                        for bloco in iter(lambda: parte.read(BLOCO_HASH), b""):
+                            sha.update(bloco)
+        except zipfile.BadZipFile:
+            return None
+        return sha.hexdigest()
+    if eh_csv(arquivo) and arquivo.suffix.lower() in EXTENSOES_COMPRESSAO:
+        with _abrir_binario(arquivo) as entrada:
+            for bloco in iter(lambda: entrada.read(BLOCO_HASH), b""):
+                sha.update(bloco)
+        return sha.hexdigest()
+    return None
+
+
+def separar_repetidos(arquivos, hashes=None):
+    """
+    Separa os arquivos únicos dos repetidos, mantendo a ordem. O primeiro de
+    cada grupo é o que será lido. `hashes` ({arquivo: hash dos bytes}) evita
+    recalcular hashes já conhecidos (por exemplo, os dos checkpoints).
+
+    Retorna (unicos, repetidos), com repetidos = [(arquivo, original, motivo)].
+    """
+    hashes = hashes or {}
+    unicos = []
+    repetidos = []
+    por_bytes = {}
+    por_conteudo = {}
+    for arquivo in arquivos:
+        digest = hashes.get(arquivo) or hash_arquivo(arquivo)
+        if digest in por_bytes:
+            repetidos.append((arquivo, por_bytes[digest], MOTIVO_BYTES))
+            continue
+        por_bytes[digest] = arquivo
+
+        conteudo = hash_conteudo(arquivo)
+        if conteudo is not None:
+            if conteudo in por_conteudo:
+                repetidos.append((arquivo, por_conteudo[conteudo], MOTIVO_CONTEUDO))
+                continue
+            por_conteudo[conteudo] = arquivo
+        unicos.append(arquivo)
+    return unicos, repetidos
+
+
+def imprimir_repetidos(repetidos, recuo="   "):
+    """
+    Lista os arquivos que não serão lidos e o arquivo igual a cada um.
+    """
+    if not repetidos:
+        return
+    print(f"{recuo}🔁 {len(repetidos)} arquivo(s) repetido(s) ignorado(s):")
+    for arquivo, original, motivo in repetidos:
+        print(f"{recuo}   - {Path(arquivo).name} = {Path(original).name} ({motivo})")
+
+
+def estimar_economia(repetidos, lidos, segundos):
+    """
+    Tempo de leitura evitado, estimado pela velocidade (bytes por segundo)
+    da leitura dos arquivos que foram lidos nesta execução.
+    """
+    bytes_lidos = sum(Path(arquivo).stat().st_size for arquivo in lidos)
+    if not repetidos or bytes_lidos == 0:
+        return 0.0
+    bytes_repetidos = sum(Path(arquivo).stat().st_size for arquivo, _, _ in repetidos)
+    return segundos * bytes_repetidos / bytes_lidos
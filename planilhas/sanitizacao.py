@@ -0,0 +1,54 @@
+"""
+Sanitização das colunas de texto (quebras de linha e espaços).
+
+As exportações repetem muito os mesmos textos (comarca, vara, nome da parte),
+então a limpeza é feita só sobre os valores distintos de cada coluna: um
+`pd.factorize`, as expressões regulares sobre os únicos e um `take` para
+remontar a coluna. Os códigos da coluna já limpa são devolvidos para o perfil
+de qualidade, que assim não precisa fatorizar a coluna de novo.
+"""
+
+
+def sanitizar_texto(serie, remover_quebras=True, normalizar_espacos=True):
+    """
+    Troca quebras de linha por espaço, tira espaços das pontas e junta
+    espaços múltiplos; células que ficam vazias viram nulas (pd.NA).
+    Sem `remover_quebras`, só espaços e tabulações são normalizados.
+
+    Retorna (coluna, fatores): `fatores` são os (códigos, únicos) da coluna
+    sanitizada, prontos para `PerfilQualidade.observar_coluna`, ou None para
+    colunas mistas (texto e números), que são convertidas e limpas linha a
+    linha como antes.
+    """
+    import numpy as np
+    import pandas as pd
+
+    padrao_espacos = r"\s+" if remover_quebras else r"[^\S\r\n]+"
+
+    # Colunas mistas: 1 e 1.0 seriam o mesmo único no factorize, mas viram
+    # textos diferentes ("1" e "1.0")
+    misto = pd.api.types.infer_dtype(serie, skipna=True) not in ("string", "empty")
+    if misto:
+        codigos = None
+        valores = serie.fillna("").astype(str)
+    else:
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        valores = pd.Series(unicos, dtype=object)
+
+    if remover_quebras:
+        valores = valores.str.replace(r"[\n\r]+", " ", regex=True)
+    if normalizar_espacos:
+        valores = valores.str.strip()
+        valores = valores.str.replace(padrao_espacos, " ", regex=True)
+    valores = valores.replace("", pd.NA)
+
+    if codigos is None:
+        return valores, None
+
+    # Únicos diferentes podem ter ficado iguais (" Ana" e "Ana") ou vazios
+    novos_codigos, unicos = pd.factorize(valores, use_na_sentinel=True)
+    codigos = np.append(novos_codigos, -1)[codigos]
+    tabela = np.empty(len(unicos) + 1, dtype=object)
+    tabela[:-1] = unicos
+    tabela[-1] = pd.NA
+    return pd.Series(tabela[codigos], index=serie.index, name=serie.name), (codigos, unicos)
@@ -0,0 +1,550 @@
+"""
+Serviço local (HTTP) que mantém a base existente carregada entre execuções.
+
+O Comparador e o pipeline automatizado releem toda a `0_base_existente` a cada
+execução. No modo serviço, a base é lida uma vez e fica na memória junto com o
+índice das chaves das suas linhas; cada requisição só lê e processa as linhas
+novas. Uma thread vigia a pasta da base e relê em segundo plano só os arquivos
+novos ou alterados, trocando a base em uso quando a nova já está pronta.
+
+Rotas:
+    GET  /status     estado da base carregada (JSON)
+    POST /comparar   remove da planilha os registros que já existem na base
+    POST /processar  pipeline completo: CPF/CNPJ, duplicatas internas, base,
+                     sanitização e máscara no número do processo
+
+Nos POST, o corpo pode ser a própria planilha (.xlsx, .xls, CSV, CSV.gz ou
+CSV.zip) —
+a resposta é a planilha processada, com os números nos cabeçalhos
+`X-Planilhas-*` (codificados com %, como numa URL) — ou um JSON
+`{"arquivos": [caminhos]}` — o resultado é gravado na pasta de saída e a
+resposta é um JSON com o caminho. Opções na query string: `quebras=0`,
+`espacos=0`, `mascara=0` e `documentos=0` (só em /processar).
+"""
+
+import io
+import ipaddress
+import json
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlparse
+
+from planilhas import __version__
+from planilhas.esquema import PAPEL_PROCESSO, RegistroEsquemas, coluna_do_papel
+from planilhas.leitura import listar_planilhas, ler_planilha
+
+TIPO_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Assinaturas dos formatos aceitos no corpo; o que não for nenhum deles (nem
+# um .zip, que pode ser .xlsx ou CSV compactado) é lido como CSV
+_ASSINATURA_ZIP = b"PK\x03\x04"
+_ASSINATURAS = ((b"\xd0\xcf\x11\xe0", ".xls"), (b"\x1f\x8b", ".csv.gz"))
+
+
+class BaseResidente:
+    """
+    Base existente mantida na memória, com um índice ordenado das chaves de
+    linha para cada conjunto de colunas comparado. As colunas dos arquivos
+    da base são alinhadas entre si pelo mapa de sinônimos, como na etapa de
+    comparação do pipeline automatizado.
+    """
+
+    def __init__(self, pasta, caminho_esquemas=None, caminho_sinonimos=None):
+        self.pasta = Path(pasta)
+        self.caminho_esquemas = caminho_esquemas
+        self.caminho_sinonimos = caminho_sinonimos
+        self.atualizada_em = None
+        self._arquivos = {}
+        self._indices = {}
+        self._trava = threading.Lock()
+
+    @property
+    def colunas(self):
+        """
+        União das colunas dos arquivos da base, na ordem em que aparecem.
+        """
+        with self._trava:
+            arquivos = self._arquivos
+        return _uniao_colunas(arquivos)
+
+    @property
+    def linhas(self):
+        with self._trava:
+            return sum(len(df) for _, df in self._arquivos.values())
+
+    def status(self):
+        with self._trava:
+            arquivos = self._arquivos
+            indices = len(self._indices)
+        return {
+            "pasta": str(self.pasta.absolute()),
+            "arquivos": sorted(Path(a).name for a in arquivos),
+            "linhas": sum(len(df) for _, df in arquivos.values()),
+            "indices": indices,
+            "atualizada_em": self.atualizada_em.isoformat(timespec="seconds") if self.atualizada_em else None,
+        }
+
+    def atualizar(self):
+        """
+        Relê os arquivos novos ou alterados da pasta e recalcula os índices já
+        usados, sem bloquear as requisições; a troca só acontece no final.
+        Retorna True se a base mudou.
+        """
+        from planilhas.alinhamento import AlinhadorColunas
+
+        estado = {}
+        for arquivo in listar_planilhas(self.pasta):
+            info = arquivo.stat()
+            estado[arquivo] = (info.st_size, info.st_mtime_ns)
+
+        with self._trava:
+            atuais = self._arquivos
+            assinaturas = list(self._indices)
+        if self.atualizada_em is not None and {a: v[0] for a, v in atuais.items()} == estado:
+            return False
+
+        registro = RegistroEsquemas(self.caminho_esquemas)
+        arquivos = {}
+        for arquivo, marca in estado.items():
+            if arquivo in atuais and atuais[arquivo][0] == marca:
+                arquivos[arquivo] = atuais[arquivo]
+                continue
+            try:
+                df, _ = ler_planilha(arquivo, registro)
+            except Exception as e:
+                print(f"   ⚠️  Erro ao ler {arquivo.name}: {e}")
+                continue
+            print(f"   ✓ {arquivo.name}: {len(df):,} linhas")
+            arquivos[arquivo] = (marca, df)
+        registro.salvar()
+
+        # 'Nº Processo' num arquivo e 'processo' no outro viram uma só coluna.
+        # O alinhamento é feito em cópias rasas: as tabelas em uso pelas
+        # requisições não são alteradas
+        arquivos = {arquivo: (marca, df.copy(deep=False)) for arquivo, (marca, df) in arquivos.items()}
+        alinhador = AlinhadorColunas(self.caminho_sinonimos)
+        alinhador.alinhar_tabelas([df for _, df in arquivos.values()], [arquivo.name for arquivo in arquivos])
+        alinhador.imprimir_relatorio(len(arquivos))
+
+        # Na primeira carga, o índice é preparado para o layout da própria base
+        if not assinaturas and arquivos:
+            assinaturas = [_assinatura_padrao(arquivos)]
+        indices = {assinatura: _calcular_indice(arquivos, *assinatura) for assinatura in assinaturas}
+
+        with self._trava:
+            self._arquivos = arquivos
+            self._indices = indices
+            self.atualizada_em = datetime.now()
+        return True
+
+    def indice(self, colunas, coluna_processo, tipos):
+        """
+        Chaves ordenadas das linhas da base para as colunas e tipos
+        informados. Calculadas uma vez e guardadas até a base mudar.
+        Retorna (chaves, origem, tabelas): `origem` é a posição de cada chave
+        nas tabelas da base, concatenadas na ordem de `tabelas`.
+        """
+        assinatura = (tuple(colunas), coluna_processo, tuple(sorted(tipos.items())))
+        with self._trava:
+            arquivos = self._arquivos
+            pronto = self._indices.get(assinatura)
+        if pronto is not None:
+            return pronto
+        indice = _calcular_indice(arquivos, *assinatura)
+        with self._trava:
+            if self._arquivos is arquivos:
+                self._indices[assinatura] = indice
+        return indice
+
+    def remover_existentes(self, df):
+        """
+        Remove de `df` as linhas que já existem na base, comparando pelas
+        colunas em comum. As linhas cuja chave está no índice são conferidas
+        valor a valor com as linhas da base de mesma chave antes de sair.
+        Retorna o novo DataFrame.
+        """
+        import numpy as np
+
+        from planilhas.memoria import chaves_contidas, chaves_linhas, conferir_existentes, tipos_colunas
+
+        colunas_base = set(self.colunas)
+        colunas_comuns = [col for col in df.columns if col in colunas_base]
+        if not colunas_comuns or len(df) == 0:
+            return df
+
+        col = coluna_do_papel(colunas_comuns, PAPEL_PROCESSO)
+        tipos = tipos_colunas(df, colunas_comuns)
+        indice, origem, tabelas = self.indice(colunas_comuns, col, tipos)
+        if len(indice) == 0:
+            return df
+
+        chaves, validas = chaves_linhas(df, colunas_comuns, col, tipos)
+        procuradas = np.unique(chaves[validas & chaves_contidas(chaves, indice)])
+        posicoes = np.flatnonzero(chaves_contidas(indice, procuradas))
+        encontradas = _linhas_base(tabelas, indice[posicoes], origem[posicoes], colunas_comuns, col, tipos)
+        existe = conferir_existentes(df, chaves, validas, encontradas, colunas_comuns, col, tipos)
+        return df.take(np.flatnonzero(~existe))
+
+    def vigiar(self, intervalo):
+        """
+        Inicia a thread que verifica a pasta da base a cada `intervalo` segundos.
+        """
+        def laco():
+            while True:
+                time.sleep(intervalo)
+                try:
+                    if self.atualizar():
+                        print(f"🔄 Base existente atualizada: {self.linhas:,} linhas")
+                except Exception as e:
+                    print(f"⚠️  Erro ao atualizar a base existente: {e}")
+
+        threading.Thread(target=laco, name="vigia-base", daemon=True).start()
+
+
+def _uniao_colunas(arquivos):
+    colunas = {}
+    for _, df in arquivos.values():
+        colunas.update(dict.fromkeys(df.columns))
+    return list(colunas)
+
+
+def _assinatura_padrao(arquivos):
+    """
+    Assinatura do índice para uma planilha com o mesmo layout da base.
+    """
+    from planilhas.memoria import tipos_colunas
+
+    colunas = _uniao_colunas(arquivos)
+    tipos = {}
+    for _, df in arquivos.values():
+        tipos.update({col: tipo for col, tipo in tipos_colunas(df, df.columns).items() if col not in tipos})
+    return tuple(colunas), coluna_do_papel(colunas, PAPEL_PROCESSO), tuple(sorted(tipos.items()))
+
+
+def _calcular_indice(arquivos, colunas, coluna_processo, tipos):
+    import numpy as np
+
+    from planilhas.memoria import chaves_linhas
+
+    tipos = dict(tipos)
+    tabelas = [df for _, df in arquivos.values()]
+    partes = []
+    origens = []
+    deslocamento = 0
+    for df in tabelas:
+        chaves, validas = chaves_linhas(df, list(colunas), coluna_processo, tipos)
+        linhas = np.flatnonzero(validas)
+        partes.append(chaves[linhas])
+        origens.append(linhas + deslocamento)
+        deslocamento += len(df)
+    if not partes:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64), tabelas
+    chaves = np.concatenate(partes)
+    ordem = np.argsort(chaves, kind="stable")
+    return chaves[ordem], np.concatenate(origens)[ordem], tabelas
+
+
+def _linhas_base(tabelas, chaves, origem, colunas, coluna_processo, tipos):
+    """
+    Valores das linhas da base nas posições `origem` (as de `_calcular_indice`),
+    no formato de `conferir_existentes`: uma lista de (chaves, valores).
+    """
+    import numpy as np
+
+    from planilhas.memoria import valores_linhas
+
+    fins = np.cumsum([len(df) for df in tabelas])
+    tabela_da_linha = np.searchsorted(fins, origem, side="right")
+    encontradas = []
+    for i in np.unique(tabela_da_linha):
+        selecionadas = tabela_da_linha == i
+        linhas = origem[selecionadas] - (fins[i] - len(tabelas[i]))
+        valores, _ = valores_linhas(tabelas[i].take(linhas), list(colunas), coluna_processo, tipos)
+        encontradas.append((chaves[selecionadas], valores))
+    return encontradas
+
+
+class ServicoPlanilhas:
+    """
+    Executa o Comparador e o pipeline automatizado contra a base residente.
+    As requisições são processadas uma por vez.
+    """
+
+    def __init__(self, pasta_base, pasta_saida, caminho_esquemas=None, caminho_sinonimos=None,
+                 pasta_entrada=None):
+        self.base = BaseResidente(pasta_base, caminho_esquemas, caminho_sinonimos)
+        self.pasta_saida = Path(pasta_saida)
+        self.pasta_entrada = Path(pasta_entrada) if pasta_entrada else None
+        self.caminho_esquemas = caminho_esquemas
+        self.caminho_sinonimos = caminho_sinonimos
+        self._trava = threading.Lock()
+
+    def processar(self, arquivos, completo=True, remover_quebras=True,
+                  normalizar_espacos=True, aplicar_mascara=True, normalizar_documentos=True):
+        """
+        Lê as planilhas e remove o que já existe na base. Com `completo`,
+        também normaliza CPF/CNPJ, remove as duplicatas internas, sanitiza e
+        aplica a máscara (mesmas etapas do pipeline automatizado).
+        Retorna (df, estatisticas).
+        """
+        import numpy as np
+        import pandas as pd
+
+        from planilhas.alinhamento import AlinhadorColunas
+        from planilhas.automatizado import _etapa_documentos, _etapa_mascara, _etapa_sanitizacao
+        from planilhas.memoria import analisar_duplicatas
+        from planilhas.perfil import PerfilQualidade
+
+        with self._trava:
+            inicio = time.perf_counter()
+            registro = RegistroEsquemas(self.caminho_esquemas)
+            dataframes = [ler_planilha(arquivo, registro)[0] for arquivo in arquivos]
+            registro.salvar()
+            # As colunas recebem os nomes das colunas da base
+            alinhador = AlinhadorColunas(self.caminho_sinonimos)
+            alinhador.mapear(self.base.colunas)
+            alinhador.alinhar_tabelas(dataframes, [Path(arquivo).name for arquivo in arquivos])
+            df = pd.concat(dataframes, ignore_index=True)
+            del dataframes
+            estatisticas = {"linhas_entrada": len(df), "colunas_renomeadas": len(alinhador.renomeadas),
+                            "colunas_nao_alinhadas": [str(col) for col in alinhador.nao_alinhadas]}
+
+            if completo:
+                df, extras = _etapa_documentos(df, normalizar_documentos)
+                estatisticas["documentos_invalidos"] = extras["documentos_invalidos"]
+                # Sem processos extras: o fork não é seguro com as threads do servidor
+                duplicada, _ = analisar_duplicatas(df, processos=1)
+                df = df.take(np.flatnonzero(~duplicada))
+                estatisticas["duplicatas_internas"] = int(duplicada.sum())
+
+            linhas = len(df)
+            df = self.base.remover_existentes(df)
+            estatisticas["duplicatas_base"] = linhas - len(df)
+
+            if completo:
+                perfil = PerfilQualidade()
+                coluna_processo = coluna_do_papel(df.columns, PAPEL_PROCESSO)
+                df, _ = _etapa_sanitizacao(df, perfil, coluna_processo, remover_quebras, normalizar_espacos)
+                df, extras = _etapa_mascara(df, perfil, coluna_processo, aplicar_mascara)
+                estatisticas["mascaras_aplicadas"] = extras["mascaras_aplicadas"]
+
+            estatisticas["linhas_saida"] = len(df)
+            estatisticas["segundos"] = round(time.perf_counter() - inicio, 3)
+            return df, estatisticas
+
+    def salvar(self, df, prefixo):
+        self.pasta_saida.mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        arquivo_saida = self.pasta_saida / f"{prefixo}_{timestamp}.xlsx"
+        df.to_excel(arquivo_saida, index=False)
+        return arquivo_saida
+
+
+def _valor_cabecalho(valor):
+    """
+    Valor de um cabeçalho `X-Planilhas-*`: listas viram texto separado por
+    vírgulas e tudo fora do ASCII é codificado em UTF-8 com % (nomes de
+    coluna como 'Nº Processo' não cabem em latin-1).
+    """
+    if isinstance(valor, (list, tuple)):
+        valor = ", ".join(str(item) for item in valor)
+    return quote(str(valor), safe=" ,.:;/()[]")
+
+
+def _sufixo_do_corpo(corpo):
+    """
+    Extensão com que o corpo de um POST é gravado para a leitura. Um .zip
+    pode ser uma planilha .xlsx ou um CSV compactado: decide pelos arquivos
+    dentro do pacote.
+    """
+    if corpo.startswith(_ASSINATURA_ZIP):
+        try:
+            with zipfile.ZipFile(io.BytesIO(corpo)) as pacote:
+                membros = [m for m in pacote.namelist() if not m.endswith("/")]
+        except zipfile.BadZipFile:
+            return ".xlsx"
+        if "[Content_Types].xml" in membros or any(m.startswith("xl/") for m in membros):
+            return ".xlsx"
+        return ".tsv.zip" if membros and membros[0].lower().endswith(".tsv") else ".csv.zip"
+    return next((sufixo for assinatura, sufixo in _ASSINATURAS if corpo.startswith(assinatura)), ".csv")
+
+
+def _endereco_local(host):
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def _caminhos_permitidos(arquivos, pasta_entrada, host):
+    """
+    Confere os caminhos pedidos num JSON `{"arquivos": [...]}`. Com
+    `pasta_entrada`, caminhos relativos partem dela e nenhum pode sair dela;
+    sem ela, o modo só é aceito com o serviço num endereço local, para que
+    ninguém na rede leia arquivos da máquina.
+    Retorna (arquivos, erro); `erro` é None quando os caminhos são aceitos.
+    """
+    if pasta_entrada is None:
+        if not _endereco_local(host):
+            return arquivos, ("caminhos de arquivo só são aceitos com o serviço em 127.0.0.1 ou com "
+                              "--entrada; envie a planilha no corpo da requisição")
+        return arquivos, None
+    raiz = pasta_entrada.resolve()
+    resolvidos = [(pasta_entrada / arquivo).resolve() for arquivo in arquivos]
+    for pedido, caminho in zip(arquivos, resolvidos):
+        try:
+            caminho.relative_to(raiz)
+        except ValueError:
+            return arquivos, f"'{pedido}' está fora da pasta de entrada '{pasta_entrada}'"
+    return resolvidos, None
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    server_version = f"planilhas/{__version__}"
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/status":
+            self._responder_json(404, {"erro": "rota não encontrada"})
+            return
+        self._responder_json(200, self.server.servico.base.status())
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path not in ("/comparar", "/processar"):
+            self._responder_json(404, {"erro": "rota não encontrada"})
+            return
+        opcoes = parse_qs(url.query)
+
+        def opcao(nome):
+            return opcoes.get(nome, ["1"])[-1].lower() not in ("0", "false", "nao", "não")
+
+        corpo = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        temporario = None
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                try:
+                    arquivos = [Path(a) for a in json.loads(corpo or b"{}").get("arquivos", [])]
+                except (ValueError, AttributeError) as e:
+                    self._responder_json(400, {"erro": f"JSON inválido: {e}"})
+                    return
+                arquivos, erro = _caminhos_permitidos(arquivos, self.server.servico.pasta_entrada,
+                                                      self.server.server_address[0])
+                if erro:
+                    self._responder_json(403, {"erro": erro})
+                    return
+                faltando = [str(a) for a in arquivos if not a.is_file()]
+                if not arquivos or faltando:
+                    self._responder_json(400, {"erro": "informe arquivos existentes", "nao_encontrados": faltando})
+                    return
+            else:
+                if not corpo:
+                    self._responder_json(400, {"erro": "envie a planilha no corpo ou um JSON com 'arquivos'"})
+                    return
+                with tempfile.NamedTemporaryFile(suffix=_sufixo_do_corpo(corpo), delete=False) as arquivo:
+                    arquivo.write(corpo)
+                temporario = Path(arquivo.name)
+                arquivos = [temporario]
+
+            completo = url.path == "/processar"
+            df, estatisticas = self.server.servico.processar(
+                arquivos, completo=completo, remover_quebras=opcao("quebras"),
+                normalizar_espacos=opcao("espacos"), aplicar_mascara=opcao("mascara"),
+                normalizar_documentos=opcao("documentos"))
+
+            if temporario is None:
+                prefixo = "planilha_processada" if completo else "dados_unicos"
+                arquivo_saida = self.server.servico.salvar(df, prefixo)
+                self._responder_json(200, {"arquivo": str(arquivo_saida.absolute()), **estatisticas})
+            else:
+                saida = io.BytesIO()
+                df.to_excel(saida, index=False)
+                cabecalhos = {f"X-Planilhas-{nome.replace('_', '-')}": _valor_cabecalho(valor)
+                              for nome, valor in estatisticas.items()}
+                self._responder(200, saida.getvalue(), TIPO_XLSX, cabecalhos)
+        except ValueError as e:
+            # Corpo que não é uma planilha legível
+            self._responder_json(400, {"erro": str(e)})
+        except Exception as e:
+            self._responder_json(500, {"erro": str(e)})
+        finally:
+            if temporario is not None:
+                temporario.unlink(missing_ok=True)
+
+    def _responder_json(self, codigo, dados):
+        conteudo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self._responder(codigo, conteudo, "application/json; charset=utf-8")
+
+    def _responder(self, codigo, conteudo, tipo, cabecalhos=None):
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(conteudo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, str(valor))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):
+        print(f"🌐 {self.log_date_time_string()} {formato % args}")
+
+
+def iniciar_servico(pasta_base_existente="0_base_existente",
+                    pasta_saida="3_resultado_final",
+                    host="127.0.0.1",
+                    porta=8765,
+                    intervalo=5,
+                    caminho_esquemas=None,
+                    caminho_sinonimos=None,
+                    pasta_entrada=None):
+    """
+    Carrega a base existente, começa a vigiar a pasta e atende as requisições
+    até ser interrompido (Ctrl+C). Os pedidos por caminho de arquivo só
+    podem ler arquivos de `pasta_entrada`; sem ela, só são aceitos com o
+    serviço num endereço local.
+    """
+    print("=" * 70)
+    print("🛰️  SERVIÇO DE PLANILHAS")
+    print("=" * 70)
+
+    # O pandas é carregado uma única vez, antes da primeira requisição
+    import pandas  # noqa: F401
+
+    servico = ServicoPlanilhas(pasta_base_existente, pasta_saida, caminho_esquemas, caminho_sinonimos,
+                               pasta_entrada)
+
+    print(f"\n📂 Carregando a base existente de '{pasta_base_existente}'...")
+    inicio = time.perf_counter()
+    servico.base.atualizar()
+    status = servico.base.status()
+    if status["arquivos"]:
+        print(f"✓ {len(status['arquivos'])} arquivo(s), {status['linhas']:,} linhas "
+              f"({time.perf_counter() - inicio:.2f} s)")
+    else:
+        print(f"ℹ️  Nenhuma planilha em '{pasta_base_existente}' - nada será removido até a pasta ter arquivos")
+
+    servico.base.vigiar(intervalo)
+    print(f"👀 Vigiando '{pasta_base_existente}' a cada {intervalo} s")
+
+    servidor = ThreadingHTTPServer((host, porta), _Manipulador)
+    servidor.servico = servico
+    print(f"\n✅ Atendendo em http://{host}:{porta}")
+    if pasta_entrada:
+        print(f"   📂 Pedidos por caminho limitados a '{pasta_entrada}'")
+    elif not _endereco_local(servidor.server_address[0]):
+        print("   🔒 Pedidos por caminho desativados fora de 127.0.0.1 (use --entrada para liberar uma pasta)")
+    print("   GET  /status     estado da base")
+    print("   POST /comparar   remove o que já existe na base")
+    print("   POST /processar  pipeline completo")
+    print("   (Ctrl+C para encerrar)")
+    print("=" * 70)
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Serviço encerrado")
+    finally:
+        servidor.server_close()
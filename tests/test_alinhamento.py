@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from planilhas.alinhamento import AlinhadorColunas, chave_coluna
+
+
+def test_chave_coluna():
+    assert chave_coluna("04 - NrProcesso (short text)") == chave_coluna("Nr_Processo") == "nrprocesso"
+    assert chave_coluna("CPF do Réu") == chave_coluna("cpf_do_reu")
+
+
+def test_sinonimos_padrao(tmp_path):
+    alinhador = AlinhadorColunas(tmp_path / "sinonimos.json")
+    tabelas = [
+        pd.DataFrame({"04 - NrProcesso (short text)": ["1"], "CPF do Réu": ["2"]}),
+        pd.DataFrame({"numero_processo": ["3"], "cpf": ["4"]}),
+        pd.DataFrame({"Nr_Processo": ["5"], "Número do CPF": ["6"]}),
+    ]
+    alinhador.alinhar_tabelas(tabelas, ["a.csv", "b.csv", "c.csv"])
+    # O primeiro arquivo define os nomes de saída
+    for df in tabelas:
+        assert df.columns.tolist() == ["04 - NrProcesso (short text)", "CPF do Réu"]
+    assert ("b.csv", "cpf", "CPF do Réu") in alinhador.renomeadas
+    assert ("c.csv", "Nr_Processo", "04 - NrProcesso (short text)") in alinhador.renomeadas
+    assert alinhador.nao_alinhadas == {}
+
+
+def test_sinonimos_do_usuario(tmp_path, capsys):
+    caminho = tmp_path / "sinonimos.json"
+    caminho.write_text(json.dumps({"Processo Judicial": ["Nr Processo", "autos"], "Réu": ["parte re"]}),
+                       encoding="utf-8")
+    alinhador = AlinhadorColunas(caminho)
+    tabelas = [pd.DataFrame({"Nr_Processo": ["1"], "Parte Ré": ["Ana"]}),
+               pd.DataFrame({"Autos": ["2"], "reu": ["Bia"]})]
+    alinhador.alinhar_tabelas(tabelas, ["a.csv", "b.csv"])
+    # O nome fixado no arquivo vale mesmo sem aparecer em nenhuma planilha, e
+    # tira 'Nr Processo' do grupo padrão; os nomes não listados continuam nele
+    for df in tabelas:
+        assert df.columns.tolist() == ["Processo Judicial", "Réu"]
+    assert alinhador.mapear(["numero_processo"]) == {}
+    assert alinhador.mapear(["n_processo"]) == {"n_processo": "numero_processo"}
+
+    caminho.write_text("[1, 2", encoding="utf-8")
+    alinhador = AlinhadorColunas(caminho)
+    assert "Arquivo de sinônimos inválido" in capsys.readouterr().out
+    assert alinhador.mapear(["cpf", "CPF do Réu"]) == {}
+
+
+def test_relatorio_das_colunas_nao_alinhadas(tmp_path, capsys):
+    alinhador = AlinhadorColunas(tmp_path / "sinonimos.json")
+    tabelas = [pd.DataFrame({"processo": ["1"], "cpf": ["2"], "CPF do Réu": ["3"], "comarca": ["X"]}),
+               pd.DataFrame({"processo": ["4"], "Vara": ["1ª"]})]
+    alinhador.alinhar_tabelas(tabelas, ["a.csv", "b.csv"])
+    # Duas colunas de CPF no mesmo arquivo: a segunda não é renomeada
+    assert alinhador.conflitos == [("a.csv", "CPF do Réu", "cpf")]
+    assert alinhador.nao_alinhadas == {"cpf": 1, "CPF do Réu": 1, "comarca": 1, "Vara": 1}
+
+    alinhador.imprimir_relatorio(len(tabelas))
+    saida = capsys.readouterr().out
+    assert "a.csv: 'CPF do Réu' não foi renomeada ('cpf' já existe no arquivo)" in saida
+    assert "4 coluna(s) não mapeada(s)" in saida
+    assert "'Vara' (1 de 2 arquivo(s))" in saida
+
+
+def test_data_em_um_arquivo_e_texto_no_outro(tmp_path):
+    alinhador = AlinhadorColunas(tmp_path / "sinonimos.json")
+    tabelas = [pd.DataFrame({"distribuicao": pd.to_datetime(["2020-01-31"])}),
+               pd.DataFrame({"distribuicao": ["28/02/2021", None]})]
+    alinhador.alinhar_tabelas(tabelas, ["a.xlsx", "b.csv"])
+    assert alinhador.convertidas == {"distribuicao": "data"}
+    juntas = pd.concat(tabelas, ignore_index=True)["distribuicao"]
+    assert pd.api.types.is_datetime64_any_dtype(juntas)
+    assert juntas.tolist()[:2] == [pd.Timestamp("2020-01-31"), pd.Timestamp("2021-02-28")]
+
+    # Um texto que não é data: todos viram texto
+    tabelas = [pd.DataFrame({"distribuicao": pd.to_datetime(["2020-01-31"])}),
+               pd.DataFrame({"distribuicao": ["28/02/2021", "a definir"]})]
+    alinhador.alinhar_tabelas(tabelas, ["a.xlsx", "b.csv"])
+    assert alinhador.convertidas == {"distribuicao": "texto"}
+    assert tabelas[0]["distribuicao"].tolist() == ["2020-01-31"]
+    assert tabelas[1]["distribuicao"].tolist() == ["28/02/2021", "a definir"]
+
+
+def test_documento_numerico_vira_texto_sem_decimal(tmp_path):
+    alinhador = AlinhadorColunas(tmp_path / "sinonimos.json")
+    tabelas = [pd.DataFrame({"cpf": [52998224725.0, np.nan]}), pd.DataFrame({"CPF do Réu": ["01234567890"]})]
+    alinhador.alinhar_tabelas(tabelas, ["a.xlsx", "b.csv"])
+    assert alinhador.convertidas == {"cpf": "texto"}
+    assert tabelas[0]["cpf"][0] == "52998224725"
+    assert pd.isna(tabelas[0]["cpf"][1])
+    assert tabelas[1].columns.tolist() == ["cpf"]
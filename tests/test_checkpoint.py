@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from planilhas.automatizado import processar_planilhas_automatizado
+from planilhas.checkpoint import PASTA_CHECKPOINTS, Checkpoints, chave_etapa
+
+
+def _eh_nan(valor):
+    return isinstance(valor, float) and np.isnan(valor)
+
+
+def test_chave_etapa_encadeada():
+    leitura = chave_etapa(None, "leitura", {"arquivos": [["a.csv", "1"]]})
+    base = chave_etapa(leitura, "base", [])
+    assert base == chave_etapa(leitura, "base", [])
+    # A chave muda com a etapa anterior, com o nome e com os parâmetros
+    assert base != chave_etapa(chave_etapa(None, "leitura", {"arquivos": [["a.csv", "2"]]}), "base", [])
+    assert base != chave_etapa(leitura, "sanitizacao", [])
+    assert chave_etapa(base, "mascara", {"a": 1, "b": 2}) == chave_etapa(base, "mascara", {"b": 2, "a": 1})
+    assert chave_etapa(base, "mascara", {"a": 1}) != chave_etapa(base, "mascara", {"a": 0})
+
+
+def test_parquet_devolve_nan_nas_colunas_de_texto(tmp_path):
+    checkpoints = Checkpoints(tmp_path)
+    df = pd.DataFrame({"nome": ["Ana", np.nan, None], "valor": [1.0, np.nan, 3.0]})
+    checkpoints.gravar("leitura", "k1", df, {"linhas": 3})
+    assert (tmp_path / PASTA_CHECKPOINTS / "leitura.parquet").exists()
+
+    carregado, extras = Checkpoints(tmp_path).carregar("leitura", "k1")
+    assert extras == {"linhas": 3}
+    # O Parquet devolve None; o pipeline espera NaN como antes de gravar
+    assert carregado["nome"][0] == "Ana"
+    assert _eh_nan(carregado["nome"][1]) and _eh_nan(carregado["nome"][2])
+    assert carregado["valor"].isna().tolist() == [False, True, False]
+    assert Checkpoints(tmp_path).carregar("leitura", "outra") is None
+
+
+def test_coluna_mista_cai_no_pickle(tmp_path):
+    checkpoints = Checkpoints(tmp_path)
+    checkpoints.gravar("base", "k1", pd.DataFrame({"a": [1, "1", None]}))
+    assert (tmp_path / PASTA_CHECKPOINTS / "base.pkl").exists()
+    carregado, _ = Checkpoints(tmp_path).carregar("base", "k1")
+    assert carregado["a"].tolist() == [1, "1", None]
+
+    # Voltando ao Parquet, o pickle antigo é apagado
+    checkpoints.gravar("base", "k2", pd.DataFrame({"a": ["x"]}))
+    assert not (tmp_path / PASTA_CHECKPOINTS / "base.pkl").exists()
+
+
+def test_sem_pyarrow_grava_pickle(tmp_path, monkeypatch):
+    def sem_pyarrow(*args, **kwargs):
+        raise ImportError("pyarrow")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", sem_pyarrow)
+    checkpoints = Checkpoints(tmp_path)
+    checkpoints.gravar("leitura", "k1", pd.DataFrame({"nome": ["Ana", np.nan]}))
+    assert sorted(p.name for p in (tmp_path / PASTA_CHECKPOINTS).iterdir()) == ["leitura.pkl"]
+    carregado, _ = Checkpoints(tmp_path).carregar("leitura", "k1")
+    assert _eh_nan(carregado["nome"][1])
+
+
+@pytest.fixture
+def pastas(tmp_path):
+    (tmp_path / "base").mkdir()
+    (tmp_path / "entrada").mkdir()
+    pd.DataFrame({"numero_processo": ["00000010020208090001"], "nome": ["Bia"]}).to_csv(
+        tmp_path / "base" / "base.csv", index=False)
+    pd.DataFrame({
+        "numero_processo": ["00821621420168090051", "0000001-00.2020.8.09.0001", "00821621420168090051"],
+        "nome": [" Ana\nMaria ", "Bia", " Ana\nMaria "],
+    }).to_csv(tmp_path / "entrada" / "novos.csv", index=False)
+    return tmp_path
+
+
+def _executar(pastas, capsys, **opcoes):
+    processar_planilhas_automatizado(pastas / "base", pastas / "entrada", pastas / "processamento",
+                                     pastas / "saida", caminho_esquemas=pastas / "esquemas.json",
+                                     caminho_sinonimos=pastas / "sinonimos.json", processos=1, **opcoes)
+    saida = capsys.readouterr().out
+    arquivo = max((pastas / "saida").glob("planilha_processada_*.xlsx"), key=lambda p: p.stat().st_mtime_ns)
+    return saida, pd.read_excel(arquivo, dtype=str)
+
+
+def test_segunda_execucao_reaproveita_as_etapas(pastas, capsys):
+    saida, primeiro = _executar(pastas, capsys)
+    assert "Nenhum checkpoint válido" in saida
+    assert primeiro["numero_processo"].tolist() == ["0082162-14.2016.8.09.0051"]
+    assert primeiro["nome"].tolist() == ["Ana Maria"]
+
+    # Nada mudou: nenhuma etapa é executada
+    saida, segundo = _executar(pastas, capsys)
+    assert "Resultado já atualizado" in saida
+    assert "REMOVENDO DUPLICATAS INTERNAS" not in saida
+    pd.testing.assert_frame_equal(primeiro, segundo)
+
+    # Sem o arquivo final, só a exportação é refeita
+    for arquivo in (pastas / "saida").glob("planilha_processada_*.xlsx"):
+        arquivo.unlink()
+    saida, terceiro = _executar(pastas, capsys)
+    assert "Retomando do checkpoint 'mascara'" in saida
+    assert "Etapas reaproveitadas: leitura, base, sanitizacao, mascara" in saida
+    pd.testing.assert_frame_equal(primeiro, terceiro)
+
+
+def test_parametro_alterado_refaz_so_as_etapas_seguintes(pastas, capsys):
+    _executar(pastas, capsys)
+    saida, df = _executar(pastas, capsys, aplicar_mascara=False)
+    assert "Retomando do checkpoint 'sanitizacao'" in saida
+    assert "Etapas reaproveitadas: leitura, base, sanitizacao" in saida
+    assert df["numero_processo"].tolist() == ["00821621420168090051"]
+
+    saida, df = _executar(pastas, capsys, aplicar_mascara=False, remover_quebras=False)
+    assert "Retomando do checkpoint 'base'" in saida
+    assert df["nome"].tolist() == ["Ana\nMaria"]
+
+
+def test_entrada_alterada_invalida_os_checkpoints(pastas, capsys):
+    _executar(pastas, capsys)
+    pd.DataFrame({"numero_processo": ["5001234-56.2020.8.09.0001"], "nome": ["Caio"]}).to_csv(
+        pastas / "entrada" / "novos.csv", index=False)
+    saida, df = _executar(pastas, capsys)
+    assert "Nenhum checkpoint válido" in saida
+    assert df["nome"].tolist() == ["Caio"]
+
+    # Uma base diferente só invalida da comparação com a base em diante
+    pd.DataFrame({"numero_processo": ["5001234-56.2020.8.09.0001"], "nome": ["Caio"]}).to_csv(
+        pastas / "base" / "base.csv", index=False)
+    saida, df = _executar(pastas, capsys)
+    assert "Retomando do checkpoint 'leitura'" in saida
+    assert len(df) == 0
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from planilhas import memoria
+from planilhas.comparador import comparar_diferencas
+
+
+def _comparar(tmp_path, novos, existentes):
+    for pasta, df in (("novos", novos), ("existentes", existentes)):
+        (tmp_path / pasta).mkdir()
+        df.to_csv(tmp_path / pasta / "dados.csv", index=False)
+    comparar_diferencas(["processo"], tmp_path / "novos", tmp_path / "existentes", tmp_path / "resultado",
+                        caminho_esquemas=tmp_path / "esquemas.json", caminho_sinonimos=tmp_path / "sinonimos.json")
+    arquivo, = (tmp_path / "resultado").glob("diferencas_*.xlsx")
+    return pd.read_excel(arquivo, sheet_name=None, dtype=str)
+
+
+def test_chaves_vazias_e_nao_normalizadas_ficam_fora_da_juncao(tmp_path):
+    novos = pd.DataFrame({"numero_processo": ["0082162-14.2016.8.09.0051", None, "ABC", "0000001-00.2020.8.09.0001"],
+                          "valor": ["1", "2", "3", "4"]})
+    existentes = pd.DataFrame({"numero_processo": ["00821621420168090051", None, "ABC", "00000020020208090001"],
+                               "valor": ["1", "9", "3", "5"]})
+    abas = _comparar(tmp_path, novos, existentes)
+
+    assert abas["Adicionadas"]["numero_processo"].tolist() == ["0000001-00.2020.8.09.0001"]
+    assert abas["Removidas"]["numero_processo"].tolist() == ["00000020020208090001"]
+    assert len(abas["Alteradas"]) == 0
+    assert "Chaves repetidas" not in abas
+    invalidas = abas["Chaves inválidas"]
+    assert invalidas["origem"].tolist() == ["Planilha 1", "Planilha 1", "Planilha 2", "Planilha 2"]
+    assert invalidas["numero_processo"].fillna("").tolist() == ["", "ABC", "", "ABC"]
+
+
+def test_colisao_de_chave_nao_forma_par(tmp_path, monkeypatch):
+    # Todas as chaves iguais: só a conferência dos valores separa os processos
+    def chaves_iguais(df, *args, **kwargs):
+        return np.zeros(len(df), dtype=np.uint64), np.ones(len(df), dtype=bool)
+
+    monkeypatch.setattr(memoria, "chaves_linhas", chaves_iguais)
+    abas = _comparar(tmp_path,
+                     pd.DataFrame({"numero_processo": ["0082162-14.2016.8.09.0051"], "valor": ["1"]}),
+                     pd.DataFrame({"numero_processo": ["0000001-00.2020.8.09.0001"], "valor": ["1"]}))
+    assert len(abas["Adicionadas"]) == 1
+    assert len(abas["Removidas"]) == 1
+    assert len(abas["Alteradas"]) == 0
+
+
+def test_alteracao_pelos_valores(tmp_path):
+    abas = _comparar(tmp_path,
+                     pd.DataFrame({"numero_processo": ["0082162-14.2016.8.09.0051", "0000001-00.2020.8.09.0001"],
+                                   "valor": [1.0, 2.0], "nome": ["Ana", "Bia"]}),
+                     pd.DataFrame({"numero_processo": ["00821621420168090051", "00000010020208090001"],
+                                   "valor": [1, 3], "nome": ["Ana", "Bia"]}))
+    alteradas = abas["Alteradas"]
+    assert alteradas["numero_processo"].tolist() == ["0000001-00.2020.8.09.0001"]
+    assert alteradas["colunas alteradas"].tolist() == ["valor"]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from planilhas import deduplicacao
+from planilhas.deduplicacao import analisar_duplicatas_particionado
+from planilhas.memoria import analisar_duplicatas
+
+
+def _tabela(linhas=3000):
+    rng = np.random.default_rng(0)
+    escolha = lambda valores: [valores[i] for i in rng.integers(0, len(valores), linhas)]
+    return pd.DataFrame({
+        "misto": pd.Series(escolha([1, "1", 1.0, None, np.nan, "a", True]), dtype=object),
+        "texto": pd.Series(escolha(["Ana", "Bia", None, np.nan, "", "1"]), dtype=object),
+        "valor": escolha([0.0, -0.0, 1.5, np.nan]),
+        "data": pd.to_datetime(escolha(["2020-01-01", "2021-05-02", None])),
+        "inteiro": pd.array(escolha([1, 2, None]), dtype="Int64"),
+    })
+
+
+def _conferir(df, resultado):
+    duplicada, em_grupo = resultado
+    assert np.array_equal(duplicada, df.duplicated().to_numpy())
+    assert np.array_equal(em_grupo, df.duplicated(keep=False).to_numpy())
+    assert np.array_equal(df.take(np.flatnonzero(~duplicada)).index, df.drop_duplicates(keep="first").index)
+
+
+@pytest.fixture
+def blocos_pequenos(monkeypatch):
+    # Com orçamento, blocos de 200 linhas: várias tarefas de chaves e partições
+    monkeypatch.setattr(deduplicacao, "LINHAS_BLOCO_MINIMO", 200)
+
+
+@pytest.mark.parametrize("processos", [1, 2])
+@pytest.mark.parametrize("limite", [None, 1])
+def test_particionado_igual_ao_duplicated(blocos_pequenos, capsys, processos, limite):
+    df = _tabela()
+    _conferir(df, analisar_duplicatas_particionado(df, processos, limite))
+    if limite is not None:
+        assert "partição(ões)" in capsys.readouterr().out
+
+
+def test_particionado_sem_fork(monkeypatch):
+    # Processos criados com spawn recebem cópias dos blocos e das partições
+    monkeypatch.setattr(deduplicacao, "herda_memoria", lambda: False)
+    df = _tabela(500)
+    _conferir(df, analisar_duplicatas_particionado(df, 2))
+
+
+def test_pd_na_em_coluna_de_objeto():
+    df = pd.DataFrame({"a": pd.Series([pd.NA, None, "x", pd.NA, "x"], dtype=object), "b": [1, 1, 2, 1, 2]})
+    _conferir(df, analisar_duplicatas_particionado(df, 1))
+
+
+@pytest.mark.parametrize("processos, limite", [(2, None), (1, 1), (2, 1)])
+def test_analisar_duplicatas_nos_dois_caminhos(blocos_pequenos, monkeypatch, processos, limite):
+    monkeypatch.setattr(deduplicacao, "LINHAS_PARALELO", 0)
+    df = _tabela()
+    _conferir(df, analisar_duplicatas(df, limite, processos))
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from planilhas.documentos import normalizar_documentos_planilhas
+from planilhas.esquema import PAPEL_CNPJ, PAPEL_CPF
+from planilhas.normalizacao import chave_documento, documento_valido, matriz_documento, normalizar_documento
+
+
+def _validos(valores, papel):
+    matriz, reconhecido = matriz_documento(pd.Series(valores, dtype=object), papel)
+    return (reconhecido & documento_valido(matriz, papel)).tolist()
+
+
+def test_digitos_verificadores_do_cpf():
+    assert _validos(["529.982.247-25", "529.982.247-24", "529.982.247-15", "52998224725"], PAPEL_CPF) == \
+        [True, False, False, True]
+
+
+def test_digitos_verificadores_do_cnpj():
+    assert _validos(["11.222.333/0001-81", "11.222.333/0001-82", "11.222.333/0001-71", "11222333000181"],
+                    PAPEL_CNPJ) == [True, False, False, True]
+
+
+def test_cpf_com_digitos_repetidos_e_invalido():
+    valores = ["000.000.000-00", "111.111.111-11", "99999999999"]
+    assert _validos(valores, PAPEL_CPF) == [False, False, False]
+    # São reconhecidos (normalizados), mas contados como inválidos
+    _, normalizados, invalidos = normalizar_documento(pd.Series(valores), PAPEL_CPF)
+    assert (normalizados, invalidos) == (3, 3)
+
+
+def test_numeros_que_perderam_os_zeros():
+    # 012.345.678-90 e 000.123.456-01 lidos como número pelo Excel
+    serie = pd.Series([1234567890, 12345601.0, "1234567890", np.nan], dtype=object)
+    coluna, normalizados, invalidos = normalizar_documento(serie, PAPEL_CPF)
+    assert coluna[:3].tolist() == ["01234567890", "00012345601", "01234567890"]
+    assert pd.isna(coluna[3])
+    assert (normalizados, invalidos) == (3, 0)
+    assert chave_documento(pd.Series([1234567890.0]), PAPEL_CPF)[0] == "01234567890"
+
+
+def test_cnpj_alfanumerico():
+    assert _validos(["12.ABC.345/01DE-35", "12abc34501de35", "12.ABC.345/01DE-36", "12.ABC.345/01DE-3A"],
+                    PAPEL_CNPJ) == [True, True, False, False]
+    # Letras só valem no CNPJ
+    assert _validos(["529.982.24A-25"], PAPEL_CPF) == [False]
+    coluna, _, invalidos = normalizar_documento(pd.Series(["12.abc.345/01de-35"]), PAPEL_CNPJ)
+    assert coluna.tolist() == ["12ABC34501DE35"]
+    assert invalidos == 0
+
+
+def test_mascara_e_valores_que_nao_sao_documentos():
+    serie = pd.Series(["52998224725", 52998224725.0, "abc", None, "529.982.247-24"], dtype=object)
+    coluna, normalizados, invalidos = normalizar_documento(serie, PAPEL_CPF, mascarar=True)
+    assert coluna[:2].tolist() == ["529.982.247-25"] * 2
+    assert coluna[2] == "abc"
+    assert coluna[3] is None
+    # O dígito errado continua normalizado, só é contado como inválido
+    assert coluna[4] == "529.982.247-24"
+    assert (normalizados, invalidos) == (3, 2)
+
+    cnpj, _, _ = normalizar_documento(pd.Series([11222333000181]), PAPEL_CNPJ, mascarar=True)
+    assert cnpj.tolist() == ["11.222.333/0001-81"]
+
+
+def test_normalizar_documentos_planilhas(tmp_path, capsys):
+    entrada = tmp_path / "entrada"
+    entrada.mkdir()
+    pd.DataFrame({
+        "CPF do Réu": ["529.982.247-25", "1234567890", "529.982.247-24"],
+        "cnpj": ["11222333000181", "11.222.333/0001-82", None],
+        "nome": ["Ana", "Bia", "Caio"],
+    }).to_csv(entrada / "partes.csv", index=False)
+
+    normalizar_documentos_planilhas(entrada, tmp_path / "saida", tmp_path / "esquemas.json", mascarar=True)
+
+    arquivo, = (tmp_path / "saida").glob("partes_documentos_*.xlsx")
+    df = pd.read_excel(arquivo, dtype=str)
+    assert df["CPF do Réu"].tolist() == ["529.982.247-25", "012.345.678-90", "529.982.247-24"]
+    assert df["cnpj"].fillna("").tolist() == ["11.222.333/0001-81", "11.222.333/0001-82", ""]
+    assert df["nome"].tolist() == ["Ana", "Bia", "Caio"]
+    saida = capsys.readouterr().out
+    assert "'CPF do Réu' (CPF): 3 normalizado(s), 1 inválido(s)" in saida
+    assert "'cnpj' (CNPJ): 2 normalizado(s), 1 inválido(s)" in saida
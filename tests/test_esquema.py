@@ -0,0 +1,43 @@
+import pytest
+
+from planilhas.esquema import PAPEL_CPF, PAPEL_DATA, PAPEL_OUTRO, PAPEL_PROCESSO, identificar_papel
+
+
+@pytest.mark.parametrize("coluna", [
+    "processo",
+    "numero_processo",
+    "NrProcesso",
+    "Nr_Processo",
+    "04 - NrProcesso (short text)",
+    "Número do Processo",
+    "Nr. do Processo",
+    "Num. Processo",
+    "Processo Judicial",
+    "processo_numero",
+    "Processo Nº",
+])
+def test_nomes_de_numero_do_processo(coluna):
+    assert identificar_papel(coluna) == PAPEL_PROCESSO
+
+
+@pytest.mark.parametrize("coluna, papel", [
+    ("tipo_processo", PAPEL_OUTRO),
+    ("Tipo de Processo", PAPEL_OUTRO),
+    ("Classe do Processo", PAPEL_OUTRO),
+    ("Assunto do Processo", PAPEL_OUTRO),
+    ("qtd_processos", PAPEL_OUTRO),
+    ("Data do Processo", PAPEL_DATA),
+    ("CPF do Réu", PAPEL_CPF),
+])
+def test_nomes_que_nao_sao_numero_do_processo(coluna, papel):
+    assert identificar_papel(coluna) == papel
+
+
+def test_esquema_com_papel_antigo_e_reaprendido(tmp_path):
+    from planilhas.esquema import Esquema, RegistroEsquemas
+
+    colunas = ["Número do Processo", "Nome"]
+    registro = RegistroEsquemas(tmp_path / "esquemas.json")
+    registro.registrar(Esquema(colunas, {"Número do Processo": PAPEL_OUTRO, "Nome": "texto"},
+                               {"Número do Processo": "Int64", "Nome": "str"}, []))
+    assert registro.obter(colunas) is None
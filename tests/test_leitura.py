@@ -0,0 +1,60 @@
+import gzip
+import zipfile
+
+import pytest
+
+from planilhas.esquema import RegistroEsquemas
+from planilhas.leitura import detectar_formato, ler_cabecalho, ler_planilha, nome_sem_extensao
+
+
+def _ler(tmp_path, arquivo):
+    df, _ = ler_planilha(arquivo, RegistroEsquemas(tmp_path / "esquemas.json"))
+    return df
+
+
+def test_cp1252_com_ponto_e_virgula(tmp_path):
+    arquivo = tmp_path / "partes.csv"
+    arquivo.write_bytes("Réu;Ação;Valor\nJoão;Despejo;10,50\nConceição;Cobrança;7\n".encode("cp1252"))
+    assert detectar_formato(arquivo) == ("cp1252", ";")
+    df = _ler(tmp_path, arquivo)
+    assert df.columns.tolist() == ["Réu", "Ação", "Valor"]
+    assert df["Réu"].tolist() == ["João", "Conceição"]
+
+
+def test_separador_conferido_nas_linhas_de_dados(tmp_path):
+    # O cabeçalho tem mais vírgulas que ponto e vírgulas; os dados decidem
+    arquivo = tmp_path / "valores.csv"
+    arquivo.write_text("Réu (nome, CPF);Valor (R$, centavos)\nAna;10,5\n\"Silva; Bia\";7,25\n", encoding="utf-8")
+    assert detectar_formato(arquivo) == ("utf-8", ";")
+    assert ler_cabecalho(arquivo) == ["Réu (nome, CPF)", "Valor (R$, centavos)"]
+    assert _ler(tmp_path, arquivo)["Réu (nome, CPF)"].tolist() == ["Ana", "Silva; Bia"]
+
+
+def test_tsv(tmp_path):
+    arquivo = tmp_path / "dados.tsv"
+    arquivo.write_text("processo\tnome\n00821621420168090051\tAna, Maria\n", encoding="utf-8")
+    assert detectar_formato(arquivo) == ("utf-8", "\t")
+    assert _ler(tmp_path, arquivo)["nome"].tolist() == ["Ana, Maria"]
+
+    # Uma coluna só: sem separador na amostra, vale a extensão
+    coluna = tmp_path / "coluna.tsv"
+    coluna.write_text("processo\n00821621420168090051\n", encoding="utf-8")
+    assert detectar_formato(coluna)[1] == "\t"
+
+
+@pytest.mark.parametrize("nome", ["dados.csv.gz", "dados.csv.zip"])
+def test_csv_compactado(tmp_path, nome):
+    conteudo = "processo;nome\n00821621420168090051;Conceição\n".encode("cp1252")
+    arquivo = tmp_path / nome
+    if nome.endswith(".gz"):
+        with gzip.open(arquivo, "wb") as saida:
+            saida.write(conteudo)
+    else:
+        with zipfile.ZipFile(arquivo, "w") as pacote:
+            pacote.writestr("dados.csv", conteudo)
+
+    assert nome_sem_extensao(arquivo) == "dados"
+    assert detectar_formato(arquivo) == ("cp1252", ";")
+    df = _ler(tmp_path, arquivo)
+    assert df["processo"].tolist() == ["00821621420168090051"]
+    assert df["nome"].tolist() == ["Conceição"]
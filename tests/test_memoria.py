@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from planilhas import memoria
+from planilhas.memoria import remover_existentes
+
+
+def _tabelas():
+    novos = pd.DataFrame({
+        "Número do Processo": ["0082162-14.2016.8.09.0051", "0000001-00.2020.8.09.0001", "ABC-1", None],
+        "valor": [10.0, 20.0, 30.0, np.nan],
+    })
+    base = pd.DataFrame({
+        "Número do Processo": ["00821621420168090051", "0000001-00.2020.8.09.0001", "XYZ-9", None],
+        "valor": [10, 21, 30, np.nan],
+    })
+    return novos, base
+
+
+def test_remove_so_as_linhas_iguais():
+    novos, base = _tabelas()
+    colunas = list(novos.columns)
+    restante, total = remover_existentes(novos, iter([base]), colunas, "Número do Processo")
+    assert total == 4
+    assert restante.index.tolist() == [1, 2]
+
+
+def test_colisao_de_chave_nao_remove_linha(monkeypatch, capsys):
+    # Todas as linhas com a mesma chave: só a conferência exata decide
+    def chaves_iguais(df, *args, **kwargs):
+        return np.zeros(len(df), dtype=np.uint64), np.ones(len(df), dtype=bool)
+
+    monkeypatch.setattr(memoria, "chaves_linhas", chaves_iguais)
+    novos, base = _tabelas()
+    restante, _ = remover_existentes(novos, iter([base]), list(novos.columns), "Número do Processo")
+    assert restante.index.tolist() == [1, 2]
+    assert "2 linha(s) com a mesma chave" in capsys.readouterr().out
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from planilhas.normalizacao import chave_processo, mascara_processo, matriz_processo, normalizar_processo
+
+
+def test_float_de_20_digitos_e_invalido():
+    # 00821621420168090051 lido como número: o float já perdeu os últimos dígitos
+    serie = pd.Series([821621420168090051.0, 82162142016809051.0, 12345.0])
+    _, valido = matriz_processo(serie)
+    assert valido.tolist() == [False, False, True]
+
+
+def test_float_de_20_digitos_fica_como_estava():
+    serie = pd.Series([821621420168090051.0, np.nan, 12345.0])
+    chaves = chave_processo(serie)
+    assert chaves[0] == 821621420168090051.0
+    assert pd.isna(chaves[1])
+    assert chaves[2] == "00000000000000012345"
+    mascarada, aplicadas = mascara_processo(serie)
+    assert mascarada[0] == 821621420168090051.0
+    assert aplicadas == 1
+
+
+def test_texto_e_inteiro_de_20_digitos_continuam_exatos():
+    serie = pd.Series(["0082162-14.2016.8.09.0051", "821621420168090051.0", 821621420168090051], dtype=object)
+    assert chave_processo(serie).tolist() == ["00821621420168090051"] * 3
+
+
+def test_normalizar_processo_conta_pela_validade():
+    serie = pd.Series(["0082162-14.2016.8.09.0051", 12345.0, "ABC", None, np.nan, "", 821621420168090051.0],
+                      dtype=object)
+    coluna, normalizados, nao_normalizados = normalizar_processo(serie)
+    assert coluna[:2].tolist() == ["00821621420168090051", "00000000000000012345"]
+    assert coluna[2] == "ABC"
+    # Vazios não contam; texto vazio e float acima de 2^53 contam
+    assert (normalizados, nao_normalizados) == (2, 3)
@@ -0,0 +1,83 @@
+import re
+import time
+import zipfile
+
+import pandas as pd
+
+from planilhas.repetidos import hash_conteudo
+
+
+def _salvar(caminho, abas):
+    with pd.ExcelWriter(caminho) as escritor:
+        for nome, df in abas.items():
+            df.to_excel(escritor, sheet_name=nome, index=False)
+
+
+def test_mesma_planilha_salva_de_novo_tem_o_mesmo_hash(tmp_path):
+    df = pd.DataFrame({"processo": ["0082162-14.2016.8.09.0051"], "valor": [1.5]})
+    _salvar(tmp_path / "a.xlsx", {"dados": df})
+    time.sleep(1.1)
+    _salvar(tmp_path / "b.xlsx", {"dados": df})
+    assert hash_conteudo(tmp_path / "a.xlsx") == hash_conteudo(tmp_path / "b.xlsx")
+
+
+def test_ordem_das_abas_muda_o_hash(tmp_path):
+    _salvar(tmp_path / "a.xlsx", {"um": pd.DataFrame({"processo": ["1"]}),
+                                  "dois": pd.DataFrame({"processo": ["2"]})})
+    # Mesmas planilhas internas, só a ordem das abas no workbook.xml trocada
+    with zipfile.ZipFile(tmp_path / "a.xlsx") as origem, zipfile.ZipFile(tmp_path / "b.xlsx", "w") as destino:
+        for nome in origem.namelist():
+            dados = origem.read(nome)
+            if nome == "xl/workbook.xml":
+                texto = dados.decode("utf-8")
+                abas = re.findall(r"<sheet [^>]*/>", texto)
+                texto = texto.replace(abas[0] + abas[1], abas[1] + abas[0])
+                dados = texto.encode("utf-8")
+            destino.writestr(nome, dados)
+    assert pd.read_excel(tmp_path / "a.xlsx").iloc[0, 0] != pd.read_excel(tmp_path / "b.xlsx").iloc[0, 0]
+    assert hash_conteudo(tmp_path / "a.xlsx") != hash_conteudo(tmp_path / "b.xlsx")
+
+
+def test_formato_de_numero_muda_o_hash(tmp_path):
+    from openpyxl import load_workbook
+
+    _salvar(tmp_path / "base.xlsx", {"dados": pd.DataFrame({"data": [45000]})})
+    livro = load_workbook(tmp_path / "base.xlsx")
+    livro["dados"]["A2"].number_format = "dd/mm/yyyy"
+    livro.save(tmp_path / "a.xlsx")
+    # Mesmas células, só o formato em styles.xml trocado de data para número
+    with zipfile.ZipFile(tmp_path / "a.xlsx") as origem, zipfile.ZipFile(tmp_path / "b.xlsx", "w") as destino:
+        for nome in origem.namelist():
+            dados = origem.read(nome)
+            if nome == "xl/styles.xml":
+                dados = dados.replace(b'formatCode="dd/mm/yyyy"', b'formatCode="0.00"')
+            destino.writestr(nome, dados)
+    assert pd.read_excel(tmp_path / "a.xlsx").dtypes.iloc[0] != pd.read_excel(tmp_path / "b.xlsx").dtypes.iloc[0]
+    assert hash_conteudo(tmp_path / "a.xlsx") != hash_conteudo(tmp_path / "b.xlsx")
+
+
+def _regravar(origem, destino, parte, trocar):
+    with zipfile.ZipFile(origem) as entrada, zipfile.ZipFile(destino, "w") as saida:
+        for nome in entrada.namelist():
+            dados = entrada.read(nome)
+            saida.writestr(nome, trocar(dados) if nome == parte else dados)
+
+
+def test_metadados_nao_mudam_o_hash(tmp_path):
+    _salvar(tmp_path / "a.xlsx", {"dados": pd.DataFrame({"processo": ["1"]})})
+    _regravar(tmp_path / "a.xlsx", tmp_path / "b.xlsx", "docProps/core.xml",
+              lambda dados: dados.replace(b"</cp:coreProperties>",
+                                          b"<dc:creator>Outra pessoa</dc:creator></cp:coreProperties>"))
+    assert hash_conteudo(tmp_path / "a.xlsx") == hash_conteudo(tmp_path / "b.xlsx")
+
+
+def test_xml_das_abas_e_comparado_como_gravado(tmp_path):
+    # Só a célula selecionada mudou (como num Excel salvo de novo): as células
+    # são as mesmas, mas o XML da aba não, e o arquivo não é dado como repetido
+    _salvar(tmp_path / "a.xlsx", {"dados": pd.DataFrame({"processo": ["1"]})})
+    with zipfile.ZipFile(tmp_path / "a.xlsx") as pacote:
+        assert b"<sheetView " in pacote.read("xl/worksheets/sheet1.xml")
+    _regravar(tmp_path / "a.xlsx", tmp_path / "b.xlsx", "xl/worksheets/sheet1.xml",
+              lambda dados: dados.replace(b"<sheetView ", b'<sheetView topLeftCell="A2" ', 1))
+    pd.testing.assert_frame_equal(pd.read_excel(tmp_path / "a.xlsx"), pd.read_excel(tmp_path / "b.xlsx"))
+    assert hash_conteudo(tmp_path / "a.xlsx") != hash_conteudo(tmp_path / "b.xlsx")
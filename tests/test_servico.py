@@ -0,0 +1,155 @@
+import io
+import json
+import threading
+import zipfile
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import unquote
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+
+from planilhas import memoria
+from planilhas.servico import (BaseResidente, ServicoPlanilhas, _caminhos_permitidos, _Manipulador,
+                               _sufixo_do_corpo, _valor_cabecalho)
+
+
+def test_valor_de_cabecalho_fora_do_latin1():
+    valor = _valor_cabecalho(["Nº Processo ✓", "備考"])
+    valor.encode("latin-1")
+    assert unquote(valor) == "Nº Processo ✓, 備考"
+    assert _valor_cabecalho(12) == "12"
+
+
+def test_planilha_com_nomes_fora_do_latin1(tmp_path):
+    base = tmp_path / "base"
+    base.mkdir()
+    pd.DataFrame({"numero_processo": ["0082162-14.2016.8.09.0051"]}).to_csv(base / "base.csv", index=False)
+
+    servico = ServicoPlanilhas(base, tmp_path / "saida", caminho_esquemas=tmp_path / "esquemas.json",
+                               caminho_sinonimos=tmp_path / "sinonimos.json")
+    servico.base.atualizar()
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Manipulador)
+    servidor.servico = servico
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        corpo = "numero_processo,Nº Processo ✓,備考\n1,a,b\n".encode("utf-8")
+        requisicao = Request(f"http://127.0.0.1:{servidor.server_port}/comparar", data=corpo, method="POST")
+        with urlopen(requisicao) as resposta:
+            assert resposta.status == 200
+            assert resposta.headers["X-Planilhas-linhas-saida"] == "1"
+    finally:
+        servidor.shutdown()
+
+
+def test_base_residente_confere_colisoes(tmp_path, monkeypatch):
+    base = tmp_path / "base"
+    base.mkdir()
+    pd.DataFrame({"processo": ["0082162-14.2016.8.09.0051"], "valor": [1.0]}).to_csv(base / "a.csv", index=False)
+    pd.DataFrame({"processo": ["0000001-00.2020.8.09.0001"], "valor": [2.0]}).to_csv(base / "b.csv", index=False)
+
+    # Todas as linhas com a mesma chave: só a conferência exata decide
+    def chaves_iguais(df, *args, **kwargs):
+        return np.zeros(len(df), dtype=np.uint64), np.ones(len(df), dtype=bool)
+
+    monkeypatch.setattr(memoria, "chaves_linhas", chaves_iguais)
+    residente = BaseResidente(base, tmp_path / "esquemas.json")
+    residente.atualizar()
+    novos = pd.DataFrame({"processo": ["00000010020208090001", "0082162-14.2016.8.09.0051", "ABC"],
+                          "valor": [2.0, 3.0, 1.0]})
+    assert residente.remover_existentes(novos).index.tolist() == [1, 2]
+
+
+def _servidor(servico, host="127.0.0.1"):
+    servidor = ThreadingHTTPServer((host, 0), _Manipulador)
+    servidor.servico = servico
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def _post(servidor, corpo, json_=False):
+    cabecalhos = {"Content-Type": "application/json"} if json_ else {}
+    requisicao = Request(f"http://127.0.0.1:{servidor.server_port}/comparar", data=corpo, headers=cabecalhos,
+                         method="POST")
+    try:
+        with urlopen(requisicao) as resposta:
+            return resposta.status, resposta.headers, resposta.read()
+    except HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_base_com_colunas_de_nomes_diferentes(tmp_path):
+    base = tmp_path / "base"
+    base.mkdir()
+    pd.DataFrame({"Nº Processo": ["0082162-14.2016.8.09.0051"], "valor": [1.0]}).to_csv(base / "a.csv", index=False)
+    pd.DataFrame({"numero_processo": ["0000001-00.2020.8.09.0001"], "valor": [2.0]}).to_csv(base / "b.csv", index=False)
+
+    servico = ServicoPlanilhas(base, tmp_path / "saida", caminho_esquemas=tmp_path / "esquemas.json",
+                               caminho_sinonimos=tmp_path / "sinonimos.json")
+    servico.base.atualizar()
+    assert servico.base.colunas == ["Nº Processo", "valor"]
+    nova = tmp_path / "nova.csv"
+    pd.DataFrame({"processo": ["00000010020208090001", "00821621420168090051", "ABC"],
+                  "valor": [2.0, 1.0, 1.0]}).to_csv(nova, index=False)
+    df, estatisticas = servico.processar([nova], completo=False)
+    assert estatisticas["duplicatas_base"] == 2
+    assert df["Nº Processo"].tolist() == ["ABC"]
+
+
+def test_csv_compactado_em_zip_no_corpo(tmp_path):
+    base = tmp_path / "base"
+    base.mkdir()
+    pd.DataFrame({"numero_processo": ["0082162-14.2016.8.09.0051"]}).to_csv(base / "base.csv", index=False)
+    servico = ServicoPlanilhas(base, tmp_path / "saida", caminho_esquemas=tmp_path / "esquemas.json",
+                               caminho_sinonimos=tmp_path / "sinonimos.json")
+    servico.base.atualizar()
+
+    pacote = io.BytesIO()
+    with zipfile.ZipFile(pacote, "w") as zip_:
+        zip_.writestr("nova.csv", "numero_processo;nome\n0082162-14.2016.8.09.0051;Ana\n0000001-00.2020.8.09.0001;Bia\n")
+    assert _sufixo_do_corpo(pacote.getvalue()) == ".csv.zip"
+
+    planilha = io.BytesIO()
+    pd.DataFrame({"a": [1]}).to_excel(planilha, index=False)
+    assert _sufixo_do_corpo(planilha.getvalue()) == ".xlsx"
+
+    servidor = _servidor(servico)
+    try:
+        status, cabecalhos, _ = _post(servidor, pacote.getvalue())
+        assert status == 200
+        assert cabecalhos["X-Planilhas-linhas-saida"] == "1"
+    finally:
+        servidor.shutdown()
+
+
+def test_caminhos_limitados_a_pasta_de_entrada(tmp_path):
+    base = tmp_path / "base"
+    entrada = tmp_path / "entrada"
+    base.mkdir()
+    entrada.mkdir()
+    pd.DataFrame({"numero_processo": ["0082162-14.2016.8.09.0051"]}).to_csv(base / "base.csv", index=False)
+    pd.DataFrame({"numero_processo": ["0000001-00.2020.8.09.0001"]}).to_csv(entrada / "nova.csv", index=False)
+    servico = ServicoPlanilhas(base, tmp_path / "saida", caminho_esquemas=tmp_path / "esquemas.json",
+                               caminho_sinonimos=tmp_path / "sinonimos.json", pasta_entrada=entrada)
+    servico.base.atualizar()
+
+    servidor = _servidor(servico)
+    try:
+        for caminho in (str(base / "base.csv"), "../base/base.csv"):
+            status, _, corpo = _post(servidor, json.dumps({"arquivos": [caminho]}).encode(), json_=True)
+            assert status == 403
+            assert "fora da pasta de entrada" in json.loads(corpo)["erro"]
+        status, _, corpo = _post(servidor, json.dumps({"arquivos": ["nova.csv"]}).encode(), json_=True)
+        assert status == 200
+        assert json.loads(corpo)["linhas_saida"] == 1
+    finally:
+        servidor.shutdown()
+
+
+def test_caminhos_sem_entrada_so_em_endereco_local(tmp_path):
+    arquivos = [tmp_path / "nova.csv"]
+    assert _caminhos_permitidos(arquivos, None, "127.0.0.1") == (arquivos, None)
+    assert _caminhos_permitidos(arquivos, None, "::1")[1] is None
+    assert "127.0.0.1" in _caminhos_permitidos(arquivos, None, "0.0.0.0")[1]
+    assert _caminhos_permitidos(arquivos, None, "192.168.0.10")[1] is not None